@@ -8,6 +8,7 @@ and important operations.
 
 import json
 import logging
+import re
 from typing import Any
 
 from statemachine_engine.database.models import get_machine_event_model
@@ -16,6 +17,10 @@ from ..base import BaseAction
 
 logger = logging.getLogger(__name__)
 
+# Placeholders filled after the standard ones, each in a single pass
+_PAYLOAD_PLACEHOLDER = re.compile(r"\{event_data\.payload\.(\w+)\}")
+_CONTEXT_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
 
 class LogAction(BaseAction):
     """
@@ -95,24 +100,20 @@ class LogAction(BaseAction):
             if placeholder in message:
                 message = message.replace(placeholder, str(value))
 
-        # Handle event_data.payload.* substitutions
+        # Handle event_data.payload.* substitutions. One re.sub pass builds
+        # the message once, where a replace() per match copied all of it.
         if "{event_data.payload." in message:
-            import re
-
-            pattern = r"\{event_data\.payload\.(\w+)\}"
-            matches = re.findall(pattern, message)
-            for key in matches:
-                value = event_payload.get(key, f"{{event_data.payload.{key}}}")
-                message = message.replace(f"{{event_data.payload.{key}}}", str(value))
+            message = _PAYLOAD_PLACEHOLDER.sub(
+                lambda m: str(event_payload.get(m.group(1), m.group(0))), message
+            )
 
         # Handle any remaining generic context variables
         if "{" in message:
-            import re
-
-            pattern = r"\{(\w+)\}"
-            matches = re.findall(pattern, message)
-            for key in matches:
-                if key in context:
-                    message = message.replace(f"{{{key}}}", str(context[key]))
+            message = _CONTEXT_PLACEHOLDER.sub(
+                lambda m: (
+                    str(context[m.group(1)]) if m.group(1) in context else m.group(0)
+                ),
+                message,
+            )
 
         return message
@@ -63,6 +63,7 @@ class ActionLoader:
 
         self._action_map: dict[str, str] = {}  # action_type -> module_path or file_path
         self._class_cache: dict[str, type] = {}  # action_type -> loaded class
+        self._missing: set[str] = set()  # undiscovered types, already warned
 
         # Action type aliases (legacy names)
         self._aliases: dict[str, str] = {
@@ -185,6 +186,7 @@ class ActionLoader:
         Load action class by action type.
 
         First checks cache, then tries to import from discovered modules or files.
+        Each class is imported once per loader; later calls are a dict lookup.
         If action not found in discovery, attempts generic fallback loading.
 
         Args:
@@ -193,18 +195,22 @@ class ActionLoader:
         Returns:
             Action class or None if not found
         """
-        # Check for aliases first
-        resolved_action_type = self._aliases.get(action_type, action_type)
+        # Check cache (aliases are cached under the name they were asked by)
+        action_class = self._class_cache.get(action_type)
+        if action_class is not None:
+            return action_class
 
-        # Check cache
+        resolved_action_type = self._aliases.get(action_type, action_type)
         if resolved_action_type in self._class_cache:
             return self._class_cache[resolved_action_type]
 
-        # Check if action was discovered
+        # Check if action was discovered (warn once per type, not per call)
         if resolved_action_type not in self._action_map:
-            logger.warning(
-                f"Action type '{action_type}' not discovered. Available: {list(self._action_map.keys())}"
-            )
+            if action_type not in self._missing:
+                self._missing.add(action_type)
+                logger.warning(
+                    f"Action type '{action_type}' not discovered. Available: {list(self._action_map.keys())}"
+                )
             return None
 
         path_or_module = self._action_map[resolved_action_type]
@@ -264,6 +270,7 @@ class ActionLoader:
     def clear_cache(self) -> None:
         """Clear the class cache (useful for testing/reloading)."""
         self._class_cache.clear()
+        self._missing.clear()
 
     def rediscover(self) -> None:
         """Re-scan the actions directory for new modules."""
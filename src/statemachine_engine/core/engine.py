@@ -19,6 +19,7 @@ KEY FILES:
 
 KEY FUNCTIONS:
 - load_config(yaml_path) - Load and validate YAML state machine configuration
+- load_config_dict(config, config_name) - Same, from an already-parsed config
 - execute_state_machine(context) - Run async event loop with state transitions
 - process_event(event, context) - Handle event and trigger state transition
 - _execute_action(action_config) - Execute action defined in YAML configuration
@@ -32,17 +33,78 @@ import json
 import logging
 import re
 import socket
+import sys
 import time
 from pathlib import Path
 from typing import Any
 
-import yaml
-
-from ..utils.interpolation import interpolate_config, interpolate_value
+from ..utils import yaml_loader
+from ..utils.interpolation import (
+    has_placeholders,
+    interpolate_config,
+    interpolate_value,
+)
 
 logger = logging.getLogger(__name__)
 
 
+def _intern_strings(node: Any) -> Any:
+    """Recursively intern dict keys and string leaves of a loaded config.
+
+    State names, event names and action types repeat across transitions,
+    actions and every loaded machine; interning keeps one copy of each and
+    lets equality checks short-circuit on identity.
+    """
+    if isinstance(node, str):
+        return sys.intern(node)
+    if isinstance(node, dict):
+        return {
+            (sys.intern(k) if isinstance(k, str) else k): _intern_strings(v)
+            for k, v in node.items()
+        }
+    if isinstance(node, list):
+        return [_intern_strings(item) for item in node]
+    return node
+
+
+def _copy_containers(node: dict | list) -> dict | list:
+    """Copy the dicts and lists of a config tree, sharing its other values.
+
+    Gives an action a config it may mutate without that reaching the
+    engine's copy, for configs that need no interpolation.
+    """
+    copied = node.copy()
+    items = node.items() if isinstance(node, dict) else enumerate(node)
+    for key, value in items:
+        if isinstance(value, (dict, list)):
+            copied[key] = _copy_containers(value)
+    return copied
+
+
+# Parsed configs by resolved path: (st_mtime_ns, st_size, interned tree)
+_config_cache: dict[str, tuple[int, int, Any]] = {}
+
+
+def _load_yaml_config(config_path: Path) -> Any:
+    """Parse a YAML config, reusing the last parse while the file is unchanged.
+
+    Engines in one process often load the same file. The cache entry is
+    replaced when the file's mtime or size changes, so an edited file is
+    parsed again. Each call returns its own containers (rebuilt from the
+    cached tree by _intern_strings, far cheaper than parsing), so an engine
+    or action that mutates its config cannot affect another.
+    """
+    stat = config_path.stat()
+    key = str(config_path.resolve())
+    cached = _config_cache.get(key)
+    if cached is None or cached[:2] != (stat.st_mtime_ns, stat.st_size):
+        with open(config_path) as f:
+            tree = _intern_strings(yaml_loader.load_yaml(f))
+        cached = (stat.st_mtime_ns, stat.st_size, tree)
+        _config_cache[key] = cached
+    return _intern_strings(cached[2])
+
+
 class EventSocketManager:
     """Manages Unix socket connection for real-time event emission"""
 
@@ -113,8 +175,36 @@ class StateMachineEngine:
     Core state machine engine that loads YAML configuration and executes
     state-based workflows with event processing
 
+    Hot attributes live in __slots__; __dict__ is kept so tests and plugins
+    can still override methods or attach attributes per instance.
     """
 
+    __slots__ = (
+        "config",
+        "current_state",
+        "context",
+        "actions",
+        "machine_name",
+        "config_name",
+        "actions_root",
+        "control_socket_prefix",
+        "event_socket",
+        "control_socket",
+        "is_running",
+        "propagation_count",
+        "timeout_tasks",
+        "_context_map_index",
+        "_state_entry_gen",
+        "_completed_action_indices",
+        "_static_actions",
+        "_last_activity_time",
+        "_transition_count",
+        "_log_count",
+        "_sleep_count",
+        "__dict__",
+        "__weakref__",
+    )
+
     def __init__(
         self,
         machine_name: str = None,
@@ -151,6 +241,8 @@ class StateMachineEngine:
         self._completed_action_indices: set[int] = (
             set()
         )  # Reset on different-state transitions
+        # id(action config) -> (that config, whether it has no placeholders)
+        self._static_actions: dict[int, tuple[dict[str, Any], bool]] = {}
 
     async def load_config(self, yaml_path: str) -> None:
         """Load state machine configuration from YAML file"""
@@ -158,15 +250,29 @@ class StateMachineEngine:
         if not config_path.exists():
             raise FileNotFoundError(f"Configuration file not found: {yaml_path}")
 
-        with open(config_path) as f:
-            self.config = yaml.safe_load(f)
-
         # Extract config name from file path for diagram mapping
         # This MUST match the diagram directory name (e.g., "controller.yaml" -> "controller")
         # The YAML 'name' field is just a human-readable label, not the config identifier
-        self.config_name = (
-            config_path.stem
-        )  # e.g., "patient-records.yaml" -> "patient-records"
+        await self._apply_config(
+            _load_yaml_config(config_path),
+            config_path.stem,  # e.g., "patient-records.yaml" -> "patient-records"
+        )
+
+    async def load_config_dict(self, config: dict[str, Any], config_name: str) -> None:
+        """Load state machine configuration that is already parsed
+
+        For callers that parse a config once and start several engines
+        from it. The engine works on its own copy; config is not modified.
+        config_name plays the part of the YAML file's stem in load_config
+        (the diagram directory name).
+        """
+        await self._apply_config(_intern_strings(config), config_name)
+
+    async def _apply_config(self, config: dict[str, Any], config_name: str) -> None:
+        """Install a parsed config this engine owns and set up from it"""
+        self.config = config
+        self.config_name = config_name
+        self._static_actions = {}
 
         # Set initial state
         self.current_state = self.config.get("initial_state", "waiting")
@@ -278,6 +384,37 @@ class StateMachineEngine:
             logger.error(f"[{self.machine_name}] Failed to create control socket: {e}")
             self.control_socket = None
 
+    def _normalize_event_payload(self, event_type: str, event: dict) -> Any:
+        """Decode a JSON string payload in place and return the payload.
+
+        Dict (and null) payloads pass through untouched. Blank strings become
+        an empty dict without going through the JSON decoder; invalid JSON is
+        logged and replaced with an empty dict. Nested JSON strings inside
+        the decoded payload are not parsed recursively.
+        """
+        event_payload = event.get("payload", {})
+        if not isinstance(event_payload, str):
+            return event_payload
+
+        if not event_payload.strip():
+            event["payload"] = {}
+            return event["payload"]
+
+        try:
+            event_payload = json.loads(event_payload)
+            logger.debug(
+                f"[{self.machine_name}] 📦 Parsed JSON payload: "
+                f"{len(event_payload)} fields"
+            )
+        except json.JSONDecodeError as e:
+            logger.warning(
+                f"[{self.machine_name}] ⚠️  Invalid JSON payload for {event_type}: {e}. "
+                f"Using empty dict. Raw: {str(event_payload)[:100]}..."
+            )
+            event_payload = {}
+        event["payload"] = event_payload
+        return event_payload
+
     async def _check_control_socket(self) -> None:
         """Check for control events on Unix socket (non-blocking)"""
         if not self.control_socket:
@@ -287,26 +424,11 @@ class StateMachineEngine:
             # Non-blocking receive
             data, addr = self.control_socket.recvfrom(4096)
             if data:
-                event = json.loads(data.decode("utf-8"))
+                event = json.loads(data)  # json accepts UTF-8 bytes directly
                 event_type = event.get("type", "unknown")
-                event_payload = event.get("payload", {})
-
-                # Auto-parse JSON string payloads to dicts
-                if isinstance(event_payload, str):
-                    try:
-                        event_payload = json.loads(event_payload)
-                        event["payload"] = event_payload  # Update the event dict
-                        logger.debug(
-                            f"[{self.machine_name}] 📦 Parsed JSON payload: "
-                            f"{len(event_payload)} fields"
-                        )
-                    except json.JSONDecodeError as e:
-                        logger.warning(
-                            f"[{self.machine_name}] ⚠️  Invalid JSON payload for {event_type}: {e}. "
-                            f"Using empty dict. Raw: {str(event_payload)[:100]}..."
-                        )
-                        event_payload = {}
-                        event["payload"] = {}
+                if isinstance(event_type, str):
+                    event_type = sys.intern(event_type)
+                event_payload = self._normalize_event_payload(event_type, event)
 
                 # Log received message
                 logger.info(f"[{self.machine_name}] 📥 Received event: {event_type}")
@@ -395,9 +517,9 @@ class StateMachineEngine:
             )
 
             if is_idle:
-                await asyncio.sleep(0.5)  # 500ms when idle (reduces CPU usage)
+                await self._wait_for_control_event(0.5)  # 500ms when idle
             else:
-                await asyncio.sleep(0.05)  # 50ms when active (responsive)
+                await self._wait_for_control_event(0.05)  # 50ms when active
 
         # Cleanup on exit
         self._cleanup_sockets()
@@ -405,6 +527,34 @@ class StateMachineEngine:
         # Remove machine from database when terminating
         self._delete_machine_state()
 
+    async def _wait_for_control_event(self, timeout: float) -> None:
+        """Sleep until the control socket becomes readable or timeout elapses.
+
+        The socket fd is registered with the event loop only for the duration
+        of the wait, so incoming events wake the main loop immediately while
+        pending datagrams never spin the loop during long-running actions.
+        Falls back to a plain sleep when the socket cannot be watched.
+        """
+        if not self.control_socket:
+            await asyncio.sleep(timeout)
+            return
+
+        loop = asyncio.get_running_loop()
+        readable = asyncio.Event()
+        try:
+            fd = self.control_socket.fileno()
+            loop.add_reader(fd, readable.set)
+        except (NotImplementedError, TypeError, ValueError, OSError):
+            await asyncio.sleep(timeout)
+            return
+
+        try:
+            await asyncio.wait_for(readable.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            loop.remove_reader(fd)
+
     async def process_event(self, event: str, context: dict[str, Any] = None) -> bool:
         """Process an event and potentially transition to a new state"""
         if context:
@@ -558,34 +708,44 @@ class StateMachineEngine:
             try:
                 import os
 
+                now = time.time()
+                pid = os.getpid()
                 with job_model.db._get_connection() as conn:
-                    # Check if this is a new machine (for machine_registered event)
-                    existing = conn.execute(
-                        "SELECT COUNT(*) FROM machine_state WHERE machine_name = ?",
-                        (self.machine_name,),
-                    ).fetchone()[0]
-
-                    is_new = existing == 0
-
-                    conn.execute(
+                    # Every transition after the first only updates the row,
+                    # so try that first: one statement instead of an
+                    # existence check plus an upsert. No row updated means
+                    # a new machine (for the machine_registered event).
+                    updated = conn.execute(
                         """
-                        INSERT INTO machine_state (machine_name, current_state, last_activity, pid, metadata, config_type)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                        ON CONFLICT(machine_name) DO UPDATE SET
-                            current_state = excluded.current_state,
-                            last_activity = excluded.last_activity,
-                            pid = excluded.pid,
-                            config_type = excluded.config_type
+                        UPDATE machine_state
+                        SET current_state = ?, last_activity = ?, pid = ?, config_type = ?
+                        WHERE machine_name = ?
                     """,
-                        (
-                            self.machine_name,
-                            current_state,
-                            time.time(),
-                            os.getpid(),
-                            None,
-                            self.config_name,
-                        ),
-                    )
+                        (current_state, now, pid, self.config_name, self.machine_name),
+                    ).rowcount
+
+                    is_new = updated == 0
+
+                    if is_new:
+                        conn.execute(
+                            """
+                            INSERT INTO machine_state (machine_name, current_state, last_activity, pid, metadata, config_type)
+                            VALUES (?, ?, ?, ?, ?, ?)
+                            ON CONFLICT(machine_name) DO UPDATE SET
+                                current_state = excluded.current_state,
+                                last_activity = excluded.last_activity,
+                                pid = excluded.pid,
+                                config_type = excluded.config_type
+                        """,
+                            (
+                                self.machine_name,
+                                current_state,
+                                now,
+                                pid,
+                                None,
+                                self.config_name,
+                            ),
+                        )
                     conn.commit()
 
                 # Emit machine_registered event for new machines
@@ -925,8 +1085,18 @@ class StateMachineEngine:
     async def _execute_action(self, action_config: dict[str, Any]) -> None:
         """Execute a single action"""
         # Interpolate variables BEFORE processing action
-        # This ensures all {variable} placeholders are resolved at engine level
-        interpolated_config = self._interpolate_config(action_config, self.context)
+        # This ensures all {variable} placeholders are resolved at engine level.
+        # Actions without placeholders (known after their first run) skip
+        # the string walk but still get their own containers; the config is
+        # kept alongside its id so a reused id cannot match.
+        entry = self._static_actions.get(id(action_config))
+        if entry is None or entry[0] is not action_config:
+            entry = (action_config, not has_placeholders(action_config))
+            self._static_actions[id(action_config)] = entry
+        if entry[1]:
+            interpolated_config = _copy_containers(action_config)
+        else:
+            interpolated_config = self._interpolate_config(action_config, self.context)
 
         action_type = interpolated_config.get("type")
 
@@ -8,10 +8,14 @@ Provides database management and querying capabilities
 """
 
 import argparse
+import atexit
+import itertools
 import json
 import logging
+import os
 import socket
 import sys
+import time
 from pathlib import Path
 
 from tabulate import tabulate
@@ -23,24 +27,40 @@ from statemachine_engine.database.models import (
     get_machine_state_model,
     get_realtime_event_model,
 )
+from statemachine_engine.utils import json_codec
 
 logger = logging.getLogger(__name__)
 
+# Unix socket endpoints: the WebSocket server's event socket and each
+# machine's control socket
+WEBSOCKET_SOCKET_PATH = "/tmp/statemachine-events.sock"
+CONTROL_SOCKET_PATH = "/tmp/statemachine-control-{machine}.sock"
+
+# Unbound DGRAM socket shared by every sendto() in this process
+_dgram_sock: socket.socket | None = None
+
+
+def _get_dgram_sock() -> socket.socket:
+    """Return the process-wide Unix DGRAM socket, creating it on first use."""
+    global _dgram_sock
+    if _dgram_sock is None:
+        _dgram_sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        atexit.register(_dgram_sock.close)
+    return _dgram_sock
+
 
 def _send_wake_up_socket(target_machine: str) -> bool:
     """Send wake-up signal via Unix socket. Returns True if successful."""
     try:
-        socket_path = f"/tmp/statemachine-control-{target_machine}.sock"
+        socket_path = CONTROL_SOCKET_PATH.format(machine=target_machine)
 
         # Check if socket exists
-        if not Path(socket_path).exists():
+        if not os.path.exists(socket_path):
             return False
 
         # Send wake-up message
         wake_up_msg = json.dumps({"type": "wake_up"})
-        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
-        sock.sendto(wake_up_msg.encode("utf-8"), socket_path)
-        sock.close()
+        _get_dgram_sock().sendto(wake_up_msg.encode("utf-8"), socket_path)
 
         return True
 
@@ -126,16 +146,20 @@ def cmd_cleanup(args):
             return
 
         # Clean up specific status (except processing)
-        jobs = job_model.list_jobs(status=args.status, limit=1000)
-        if jobs:
-            with job_model.db._get_connection() as conn:
-                job_ids = [job["job_id"] for job in jobs]
-                placeholders = ",".join(["?" for _ in job_ids])
-                conn.execute(
-                    f"DELETE FROM jobs WHERE job_id IN ({placeholders})", job_ids
+        # Delete in SQL; the same 1000 most recent jobs list_jobs would return
+        with job_model.db._get_connection() as conn:
+            deleted = conn.execute(
+                """
+                DELETE FROM jobs WHERE id IN (
+                    SELECT id FROM jobs WHERE status = ?
+                    ORDER BY created_at DESC LIMIT 1000
                 )
-                conn.commit()
-            print(f"Cleaned up {len(jobs)} jobs with status '{args.status}'")
+            """,
+                (args.status,),
+            ).rowcount
+            conn.commit()
+        if deleted:
+            print(f"Cleaned up {deleted} jobs with status '{args.status}'")
         else:
             print(f"No jobs found with status '{args.status}'")
     else:
@@ -271,8 +295,7 @@ def cmd_complete_job(args):
     job_model = get_job_model()
 
     # Check if job exists
-    job = job_model.get_job(args.job_id)
-    if not job:
+    if not job_model.job_exists(args.job_id):
         print(f"Job {args.job_id} not found")
         return 1
 
@@ -290,8 +313,7 @@ def cmd_fail_job(args):
     job_model = get_job_model()
 
     # Check if job exists
-    job = job_model.get_job(args.job_id)
-    if not job:
+    if not job_model.job_exists(args.job_id):
         print(f"Job {args.job_id} not found")
         return 1
 
@@ -310,8 +332,7 @@ def cmd_remove_job(args):
     job_model = get_job_model()
 
     # Check if job exists
-    job = job_model.get_job(args.job_id)
-    if not job:
+    if not job_model.job_exists(args.job_id):
         print(f"Job {args.job_id} not found")
         return 1
 
@@ -367,6 +388,54 @@ def cmd_recreate_database(args):
         return 1
 
 
+def _deliver_event(
+    target: str, event_type: str, source: str, job_id: str, payload: dict
+):
+    """Push an event envelope to the WebSocket server and the target's control socket
+
+    Delivery is best effort: a missing or unavailable socket only prints a
+    notice, since the database row already carries the event.
+    """
+    # Each socket gets the keys its reader expects: the WebSocket server
+    # relays machine_name/type/payload to UI clients (matches engine.py
+    # format), while the target machine reads type/payload/job_id. Sharing
+    # one envelope would leak job_id to UI clients and machine_name to the
+    # control socket, where it could be mistaken for the target's own name.
+    ws_event_msg = json_codec.dumps_bytes(
+        {
+            "machine_name": source or "cli",
+            "type": event_type,  # Use 'type' for client compatibility (not 'event_type')
+            "payload": payload,
+        }
+    )
+
+    # Send to WebSocket server's Unix socket for real-time UI updates.
+    # A socket that is not there fails the sendto itself, so there is no
+    # separate stat of the path per event
+    try:
+        _get_dgram_sock().sendto(ws_event_msg, WEBSOCKET_SOCKET_PATH)
+        print("📡 Sent to WebSocket server for real-time UI update")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"⚠️  WebSocket socket unavailable: {e}")
+
+    # Send to target state machine via control socket (if not UI)
+    if target != "ui":
+        socket_path = CONTROL_SOCKET_PATH.format(machine=target)
+        event_msg = json_codec.dumps_bytes(
+            {"type": event_type, "payload": payload, "job_id": job_id}
+        )
+        try:
+            _get_dgram_sock().sendto(event_msg, socket_path)
+            print(f"📡 Sent to {target} control socket")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            # Socket error - machine will fall back to polling
+            print(f"⚠️  Control socket unavailable: {e}")
+
+
 def cmd_send_event(args):
     """Send an event to a target state machine"""
     event_model = get_machine_event_model()
@@ -391,46 +460,7 @@ def cmd_send_event(args):
             except json.JSONDecodeError:
                 parsed_payload = {}
 
-        # Send to WebSocket server's Unix socket for real-time UI updates
-        websocket_socket_path = "/tmp/statemachine-events.sock"
-        if Path(websocket_socket_path).exists():
-            try:
-                # Format event for WebSocket server (matches engine.py format)
-                ws_event_msg = json.dumps(
-                    {
-                        "machine_name": args.source or "cli",
-                        "type": args.type,  # Use 'type' for client compatibility (not 'event_type')
-                        "payload": parsed_payload,
-                    }
-                )
-                sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
-                sock.sendto(ws_event_msg.encode("utf-8"), websocket_socket_path)
-                sock.close()
-                print("📡 Sent to WebSocket server for real-time UI update")
-            except Exception as e:
-                print(f"⚠️  WebSocket socket unavailable: {e}")
-
-        # Send to target state machine via control socket (if not UI)
-        if args.target != "ui":
-            socket_path = f"/tmp/statemachine-control-{args.target}.sock"
-
-            if Path(socket_path).exists():
-                try:
-                    # Send the actual event with payload
-                    event_msg = json.dumps(
-                        {
-                            "type": args.type,
-                            "payload": parsed_payload,
-                            "job_id": args.job_id,
-                        }
-                    )
-                    sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
-                    sock.sendto(event_msg.encode("utf-8"), socket_path)
-                    sock.close()
-                    print(f"📡 Sent to {args.target} control socket")
-                except Exception as e:
-                    # Socket error - machine will fall back to polling
-                    print(f"⚠️  Control socket unavailable: {e}")
+        _deliver_event(args.target, args.type, args.source, args.job_id, parsed_payload)
 
         print("✅ Event sent successfully!")
         print(f"   Event ID: {event_id}")
@@ -447,6 +477,71 @@ def cmd_send_event(args):
         return 1
 
 
+def cmd_send_events_batch(args):
+    """Send a JSON array of events in one transaction (send-event --batch)
+
+    Each element is an object with "target" and "type" and optional
+    "source", "job_id" and "payload" (object or JSON string). All rows are
+    inserted in a single transaction before any socket delivery, so either
+    every event is stored or none is.
+    """
+    event_model = get_machine_event_model()
+
+    try:
+        if args.batch == "-":
+            events = json.load(sys.stdin)
+        else:
+            with open(args.batch, encoding="utf-8") as f:
+                events = json.load(f)
+        if not isinstance(events, list) or not all(
+            isinstance(event, dict) and event.get("target") and event.get("type")
+            for event in events
+        ):
+            print('❌ Batch must be a JSON array of objects with "target" and "type"')
+            return 1
+
+        rows = []
+        for event in events:
+            payload = event.get("payload")
+            if isinstance(payload, str):
+                try:
+                    parsed_payload = json.loads(payload)
+                except json.JSONDecodeError:
+                    parsed_payload = {}
+            else:
+                parsed_payload = payload or {}
+                payload = json.dumps(payload) if payload else None
+            rows.append((event, payload, parsed_payload))
+
+        with event_model.db.transaction() as conn:
+            event_ids = [
+                event_model.send_event(
+                    target_machine=event["target"],
+                    event_type=event["type"],
+                    job_id=event.get("job_id"),
+                    payload=payload,
+                    conn=conn,
+                )
+                for event, payload, _ in rows
+            ]
+
+        for event_id, (event, _, parsed_payload) in zip(event_ids, rows, strict=True):
+            _deliver_event(
+                event["target"],
+                event["type"],
+                event.get("source"),
+                event.get("job_id"),
+                parsed_payload,
+            )
+            print(f"   Event ID: {event_id} → {event['target']} ({event['type']})")
+
+        print(f"✅ {len(event_ids)} events sent successfully!")
+        return 0
+    except Exception as e:
+        print(f"❌ Error sending events: {e}")
+        return 1
+
+
 def cmd_list_events(args):
     """List machine events"""
     event_model = get_machine_event_model()
@@ -608,7 +703,6 @@ def cmd_machine_status(args):
 def cmd_machine_health(args):
     """Check concurrent machine health"""
     from datetime import datetime, timedelta
-    from pathlib import Path
 
     print("=== Concurrent Machine Health Check ===")
     print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -647,7 +741,7 @@ def cmd_machine_health(args):
 
         # Count jobs by status
         total_jobs = sum(
-            len(job_model.list_jobs(status=status))
+            job_model.count_jobs(status=status)
             for status in ["pending", "processing", "completed", "failed"]
         )
         print(f"  Total jobs: {total_jobs} ✅")
@@ -727,6 +821,77 @@ def cmd_machine_state(args):
         print(tabulate(table_data, headers=headers, tablefmt="grid"))
 
 
+def _hot_fields(row, names: tuple[str, ...], from_payload: bool = False) -> dict:
+    """Read hot payload fields from typed realtime_events columns.
+
+    Rows logged before the typed columns existed have them all NULL; those
+    fall back to parsing the JSON payload. Missing values are omitted so
+    callers can apply their own defaults with dict.get().
+
+    The columns hold text, so numbers and booleans keep their type (and
+    null stays distinct from missing) only in the payload. JSON output
+    passes from_payload=True to report the values exactly as logged.
+    """
+    if from_payload or all(row[name] is None for name in names):
+        payload = json.loads(row["payload"])
+        return {name: payload[name] for name in names if name in payload}
+    return {name: row[name] for name in names if row[name] is not None}
+
+
+# Rows fetched per round trip when streaming history results
+HISTORY_FETCH_SIZE = 256
+
+
+def _iter_rows(cursor):
+    """Yield cursor rows in fetchmany() batches instead of one fetchall() list"""
+    while batch := cursor.fetchmany(HISTORY_FETCH_SIZE):
+        yield from batch
+
+
+def _print_json_array(items) -> None:
+    """Print items as a JSON array as they arrive (same layout as indent=2)"""
+    opener = "[\n  "
+    for item in items:
+        sys.stdout.write(opener + json.dumps(item, indent=2).replace("\n", "\n  "))
+        opener = ",\n  "
+    print("[]" if opener == "[\n  " else "\n]")
+
+
+def _transition_records(rows, from_payload: bool = False):
+    """Format state_change rows for output, skipping unparseable ones"""
+    for row in rows:
+        try:
+            fields = _hot_fields(
+                row, ("from_state", "to_state", "event_trigger"), from_payload
+            )
+            yield {
+                "id": row["id"],
+                "machine": row["machine_name"],
+                "from_state": fields.get("from_state", "unknown"),
+                "to_state": fields.get("to_state", "unknown"),
+                "event": fields.get("event_trigger", "unknown"),
+                "timestamp": row["timestamp"],
+            }
+        except (json.JSONDecodeError, KeyError) as e:
+            logger.warning(f"Failed to parse transition {row['id']}: {e}")
+
+
+def _error_records(rows, from_payload: bool = False):
+    """Format error rows for output, skipping unparseable ones"""
+    for row in rows:
+        try:
+            fields = _hot_fields(row, ("error_message", "job_id"), from_payload)
+            yield {
+                "id": row["id"],
+                "machine": row["machine_name"],
+                "error_message": fields.get("error_message", "unknown"),
+                "job_id": fields.get("job_id", "N/A"),
+                "timestamp": row["timestamp"],
+            }
+        except (json.JSONDecodeError, KeyError) as e:
+            logger.warning(f"Failed to parse error {row['id']}: {e}")
+
+
 def cmd_transition_history(args):
     """Show state transition history from realtime_events"""
     realtime_model = get_realtime_event_model()
@@ -738,6 +903,9 @@ def cmd_transition_history(args):
                 SELECT
                     id,
                     machine_name,
+                    from_state,
+                    to_state,
+                    event_trigger,
                     payload,
                     datetime(created_at, 'unixepoch', 'localtime') as timestamp
                 FROM realtime_events
@@ -752,53 +920,46 @@ def cmd_transition_history(args):
 
             # Add time range filter if provided
             if args.hours:
-                query += " AND created_at > strftime('%s', datetime('now', '-' || ? || ' hours'))"
-                params.append(args.hours)
+                query += " AND created_at > ?"
+                params.append(int(time.time()) - args.hours * 3600)
 
             query += " ORDER BY created_at DESC LIMIT ?"
             params.append(args.limit)
 
-            rows = conn.execute(query, params).fetchall()
+            rows = _iter_rows(conn.execute(query, params))
+            first = next(rows, None)
+            if first is None:
+                print("No state transitions found")
+                return
 
-        if not rows:
-            print("No state transitions found")
-            return
-
-        # Parse and format results
-        transitions = []
-        for row in rows:
-            try:
-                payload = json.loads(row["payload"])
-                transitions.append(
-                    {
-                        "id": row["id"],
-                        "machine": row["machine_name"],
-                        "from_state": payload.get("from_state", "unknown"),
-                        "to_state": payload.get("to_state", "unknown"),
-                        "event": payload.get("event_trigger", "unknown"),
-                        "timestamp": row["timestamp"],
-                    }
-                )
-            except (json.JSONDecodeError, KeyError) as e:
-                logger.warning(f"Failed to parse transition {row['id']}: {e}")
-                continue
-
-        if args.format == "json":
-            print(json.dumps(transitions, indent=2))
-        else:
-            headers = ["ID", "Machine", "From State", "To State", "Event", "Timestamp"]
-            table_data = [
-                [
-                    t["id"],
-                    t["machine"],
-                    t["from_state"],
-                    t["to_state"],
-                    t["event"],
-                    t["timestamp"],
+            # Stream rows through formatting; JSON output is written as
+            # SQLite returns them, the table needs them all for column widths
+            transitions = _transition_records(
+                itertools.chain([first], rows), from_payload=args.format == "json"
+            )
+            if args.format == "json":
+                _print_json_array(transitions)
+            else:
+                headers = [
+                    "ID",
+                    "Machine",
+                    "From State",
+                    "To State",
+                    "Event",
+                    "Timestamp",
                 ]
-                for t in transitions
-            ]
-            print(tabulate(table_data, headers=headers, tablefmt="grid"))
+                table_data = [
+                    [
+                        t["id"],
+                        t["machine"],
+                        t["from_state"],
+                        t["to_state"],
+                        t["event"],
+                        t["timestamp"],
+                    ]
+                    for t in transitions
+                ]
+                print(tabulate(table_data, headers=headers, tablefmt="grid"))
 
     except Exception as e:
         print(f"Error querying transition history: {e}")
@@ -816,6 +977,8 @@ def cmd_error_history(args):
                 SELECT
                     id,
                     machine_name,
+                    error_message,
+                    job_id,
                     payload,
                     datetime(created_at, 'unixepoch', 'localtime') as timestamp
                 FROM realtime_events
@@ -830,51 +993,36 @@ def cmd_error_history(args):
 
             # Add time range filter if provided
             if args.hours:
-                query += " AND created_at > strftime('%s', datetime('now', '-' || ? || ' hours'))"
-                params.append(args.hours)
+                query += " AND created_at > ?"
+                params.append(int(time.time()) - args.hours * 3600)
 
             query += " ORDER BY created_at DESC LIMIT ?"
             params.append(args.limit)
 
-            rows = conn.execute(query, params).fetchall()
+            rows = _iter_rows(conn.execute(query, params))
+            first = next(rows, None)
+            if first is None:
+                print("No errors found")
+                return
 
-        if not rows:
-            print("No errors found")
-            return
-
-        # Parse and format results
-        errors = []
-        for row in rows:
-            try:
-                payload = json.loads(row["payload"])
-                errors.append(
-                    {
-                        "id": row["id"],
-                        "machine": row["machine_name"],
-                        "error_message": payload.get("error_message", "unknown"),
-                        "job_id": payload.get("job_id", "N/A"),
-                        "timestamp": row["timestamp"],
-                    }
-                )
-            except (json.JSONDecodeError, KeyError) as e:
-                logger.warning(f"Failed to parse error {row['id']}: {e}")
-                continue
-
-        if args.format == "json":
-            print(json.dumps(errors, indent=2))
-        else:
-            headers = ["ID", "Machine", "Error Message", "Job ID", "Timestamp"]
-            table_data = [
-                [
-                    e["id"],
-                    e["machine"],
-                    e["error_message"][:60],
-                    e["job_id"],
-                    e["timestamp"],
+            errors = _error_records(
+                itertools.chain([first], rows), from_payload=args.format == "json"
+            )
+            if args.format == "json":
+                _print_json_array(errors)
+            else:
+                headers = ["ID", "Machine", "Error Message", "Job ID", "Timestamp"]
+                table_data = [
+                    [
+                        e["id"],
+                        e["machine"],
+                        e["error_message"][:60],
+                        "N/A" if e["job_id"] is None else e["job_id"],
+                        e["timestamp"],
+                    ]
+                    for e in errors
                 ]
-                for e in errors
-            ]
-            print(tabulate(table_data, headers=headers, tablefmt="grid"))
+                print(tabulate(table_data, headers=headers, tablefmt="grid"))
 
     except Exception as e:
         print(f"Error querying error history: {e}")
@@ -1094,7 +1242,12 @@ def cmd_list_errors(args):
         traceback.print_exc()
 
 
-def main():
+def main(argv: list[str] | None = None):
+    """Run the CLI with argv (defaults to sys.argv[1:])
+
+    Callers such as scripts can pass argv to run commands in-process
+    instead of spawning a new interpreter per command.
+    """
     parser = argparse.ArgumentParser(
         description="Database CLI for state machine engine"
     )
@@ -1199,12 +1352,10 @@ def main():
     )
     send_event_parser.add_argument(
         "--target",
-        required=True,
         help="Target machine name (sdxl_generator, face_processor, ui, or all)",
     )
     send_event_parser.add_argument(
         "--type",
-        required=True,
         help="Event type (stop, sdxl_job_done, face_job_done, activity_log, etc.)",
     )
     send_event_parser.add_argument(
@@ -1216,6 +1367,13 @@ def main():
     send_event_parser.add_argument(
         "--payload", help="JSON payload for the event (optional)"
     )
+    send_event_parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="Send a JSON array of events from FILE ('-' for stdin) in one "
+        "transaction; each event carries its own target, type, source, job_id "
+        "and payload, so the single-event options are rejected",
+    )
 
     # List events command
     list_events_parser = subparsers.add_parser(
@@ -1317,7 +1475,25 @@ def main():
         help="Output format (default: table)",
     )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+
+    if args.command == "send-event":
+        if args.batch:
+            # Batch events carry their own fields; don't drop flags silently
+            single_event_flags = {
+                "--target": args.target,
+                "--type": args.type,
+                "--source": args.source,
+                "--job-id": args.job_id,
+                "--payload": args.payload,
+            }
+            conflicting = [flag for flag, value in single_event_flags.items() if value]
+            if conflicting:
+                send_event_parser.error(
+                    f"--batch cannot be combined with {', '.join(conflicting)}"
+                )
+        elif not (args.target and args.type):
+            send_event_parser.error("--target and --type are required without --batch")
 
     if not args.command:
         parser.print_help()
@@ -1347,6 +1523,8 @@ def main():
         elif args.command == "recreate-database":
             return cmd_recreate_database(args)
         elif args.command == "send-event":
+            if args.batch:
+                return cmd_send_events_batch(args)
             return cmd_send_event(args)
         elif args.command == "list-events":
             return cmd_list_events(args)
@@ -32,21 +32,37 @@ def get_database() -> Database:
     return _db_instance
 
 
+# Model instances bound to the singleton database. Models hold no
+# connection themselves: each query asks the Database, which caches one
+# connection per thread keyed on (db_path, pid) and opens a fresh one in a
+# forked child, so sharing models across threads and forks is safe.
+_model_instances: dict[type, object] = {}
+
+
+def _get_model(model_cls):
+    """Get the cached model_cls instance for the current database"""
+    db = get_database()
+    model = _model_instances.get(model_cls)
+    if model is None or model.db is not db:
+        model = _model_instances[model_cls] = model_cls(db)
+    return model
+
+
 def get_job_model() -> JobModel:
     """Get job model instance"""
-    return JobModel(get_database())
+    return _get_model(JobModel)
 
 
 def get_machine_event_model() -> MachineEventModel:
     """Get machine event model instance"""
-    return MachineEventModel(get_database())
+    return _get_model(MachineEventModel)
 
 
 def get_realtime_event_model() -> RealtimeEventModel:
     """Get realtime event model instance"""
-    return RealtimeEventModel(get_database())
+    return _get_model(RealtimeEventModel)
 
 
 def get_machine_state_model() -> MachineStateModel:
     """Get machine state model instance"""
-    return MachineStateModel(get_database())
+    return _get_model(MachineStateModel)
@@ -8,56 +8,235 @@ IMPORTANT: Changes via Change Management, see CLAUDE.md
 """
 
 import logging
+import os
 import sqlite3
+import threading
+import zlib
 from contextlib import contextmanager
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
 
+# Per-connection tuning applied on every open. synchronous=NORMAL is durable
+# under WAL (only the last commits may roll back on power loss) and skips the
+# per-commit journal fsync that dominates short write transactions. The WAL
+# is checkpointed back into the database every 1000 pages (~4 MB) so it stays
+# bounded while readers keep working from their snapshots.
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA wal_autocheckpoint=1000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+# Throwaway databases (test fixtures, scratch files) skip fsync entirely; a
+# crash may corrupt them, which is acceptable only for data nobody keeps
+EPHEMERAL_PRAGMAS = (
+    "PRAGMA synchronous=OFF",
+    "PRAGMA temp_store=MEMORY",
+)
+
+# Seconds a connection waits on a locked database before raising "database
+# is locked". Under WAL only writers contend (for the single write lock),
+# and the engine's write transactions are short.
+BUSY_TIMEOUT = 5.0
+
+# Prepared statements kept per connection (sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 256
+
+# Oldest SQLite library the queries support: job claiming uses
+# UPDATE ... RETURNING, added in SQLite 3.35.0
+MIN_SQLITE_VERSION = (3, 35, 0)
+
+# Columns added to tables after their CREATE TABLE first shipped. Databases
+# created earlier get them via ALTER TABLE before the schema files run (the
+# schema files may index these columns).
+ADDED_COLUMNS: dict[str, tuple[tuple[str, str], ...]] = {
+    "realtime_events": (
+        ("from_state", "TEXT"),
+        ("to_state", "TEXT"),
+        ("event_trigger", "TEXT"),
+        ("error_message", "TEXT"),
+        ("job_id", "TEXT"),
+    ),
+}
+
+# Connections inherited from a parent process (see Database._get_connection)
+_inherited_connections: list[sqlite3.Connection] = []
+
+
 class Database:
     """SQLite database manager for state machine engine"""
 
-    def __init__(self, db_path: str = "data/pipeline.db"):
+    # Database files whose file-level settings were applied in this process
+    _configured_files: set[Path] = set()
+
+    # Schema scripts and version stamp per schema directory
+    _schemas: dict[Path, tuple[tuple[tuple[str, str], ...], int]] = {}
+
+    def __init__(self, db_path: str = "data/pipeline.db", ephemeral: bool = False):
+        if sqlite3.sqlite_version_info < MIN_SQLITE_VERSION:
+            required = ".".join(map(str, MIN_SQLITE_VERSION))
+            raise RuntimeError(
+                f"SQLite {required} or newer is required (job claiming uses "
+                f"UPDATE ... RETURNING); Python is linked against SQLite "
+                f"{sqlite3.sqlite_version}"
+            )
         self.db_path = Path(db_path)
+        self.pragmas = EPHEMERAL_PRAGMAS if ephemeral else CONNECTION_PRAGMAS
+        self._local = threading.local()
         self.db_path.parent.mkdir(exist_ok=True)
         self.schema_dir = Path(__file__).parent.parent / "schema"
+        self._configure_file()
         self._ensure_tables()
 
+    def _configure_file(self):
+        """Apply persistent file-level settings (once per file per process)
+
+        auto_vacuum=INCREMENTAL only takes effect on a file that has no tables
+        yet, so it is set before the schema runs. Freed pages from event
+        cleanup can then be returned to the OS without a full VACUUM.
+        WAL journaling persists in the file once switched on.
+        """
+        resolved = self.db_path.resolve()
+        if resolved in Database._configured_files:
+            return
+        with self._get_connection() as conn:
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+        if mode.lower() == "wal":
+            Database._configured_files.add(resolved)
+        else:
+            logger.debug(f"WAL not available for {self.db_path}, using {mode}")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open and tune a new connection to db_path"""
+        conn = sqlite3.connect(
+            self.db_path, timeout=BUSY_TIMEOUT, cached_statements=STATEMENT_CACHE_SIZE
+        )
+        conn.row_factory = sqlite3.Row
+        try:
+            for pragma in self.pragmas:
+                conn.execute(pragma)
+        except BaseException:
+            conn.close()
+            raise
+        return conn
+
     @contextmanager
     def _get_connection(self):
-        """Get database connection with row factory and ensure proper cleanup
+        """Get this thread's cached connection (opened and tuned on first use)
 
-        CRITICAL: SQLite connections used as context managers do NOT close the connection!
-        They only commit/rollback. We must explicitly close to prevent connection leaks.
-
-        See: https://docs.python.org/3/library/sqlite3.html#using-the-connection-as-a-context-manager
+        Reusing one connection per thread skips the connect + pragma setup
+        and the WAL checkpoint SQLite runs whenever the last connection to a
+        file closes. Each outermost use still ends like a fresh connection
+        would: work the caller did not commit is rolled back. The connection
+        is reopened when db_path changes, and a forked child never reuses
+        (or closes) one inherited from its parent.
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        local = self._local
+        key = (self.db_path, os.getpid())
+        if getattr(local, "key", None) != key:
+            if getattr(local, "pid", None) == key[1]:
+                local.conn.close()  # db_path changed
+            elif getattr(local, "conn", None) is not None:
+                # Inherited across fork: closing it here could checkpoint
+                # the parent's WAL, so keep it referenced and never use it
+                _inherited_connections.append(local.conn)
+            local.conn, local.key, local.pid = None, None, None
+            local.conn = self._connect()
+            local.key, local.pid, local.depth = key, key[1], 0
+
+        conn = local.conn
+        local.depth += 1
         try:
             yield conn
         finally:
-            conn.close()  # CRITICAL: Explicitly close to prevent connection leak
+            local.depth -= 1
+            if local.depth == 0 and conn.in_transaction:
+                conn.rollback()
 
-    def _execute_schema_file(self, schema_file: Path):
-        """Execute SQL from schema file"""
-        logger.debug(f"Loading schema from {schema_file.name}")
+    def close(self):
+        """Close the calling thread's cached connection (reopened on next use)"""
+        local = self._local
+        if getattr(local, "pid", None) == os.getpid() and local.conn is not None:
+            local.conn.close()
+        local.conn, local.key, local.pid = None, None, None
+
+    @contextmanager
+    def transaction(self):
+        """Run several writes on one connection as a single committed transaction
+
+        BEGIN IMMEDIATE takes the write lock up front, so the batch commits
+        (one sync) or rolls back as a unit. Pass the yielded connection to
+        model methods that accept conn= so they join instead of committing.
+        WAL makes each commit cheaper but not free, so batching still pays.
+        """
         with self._get_connection() as conn:
-            sql = schema_file.read_text()
-            conn.executescript(sql)
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
             conn.commit()
 
+    def _load_schema(self) -> tuple[tuple[tuple[str, str], ...], int]:
+        """Read schema scripts and their version stamp (cached per schema_dir)
+
+        The version is a CRC of every script plus ADDED_COLUMNS, so editing
+        any schema file yields a new stamp and the schema is re-applied.
+        """
+        cached = Database._schemas.get(self.schema_dir)
+        if cached is None:
+            scripts = []
+            # Generic tables (engine-ready), then domain-specific (face-changer)
+            for subdir in ("generic", "domain"):
+                schema_subdir = self.schema_dir / subdir
+                if schema_subdir.exists():
+                    for schema_file in sorted(schema_subdir.glob("*.sql")):
+                        scripts.append((schema_file.name, schema_file.read_text()))
+
+            digest = zlib.crc32(repr(ADDED_COLUMNS).encode())
+            for name, sql in scripts:
+                digest = zlib.crc32(f"{name}\n{sql}".encode(), digest)
+            # user_version is a signed 32-bit int and 0 means "never stamped"
+            version = (digest & 0x7FFFFFFF) or 1
+            cached = Database._schemas[self.schema_dir] = (tuple(scripts), version)
+        return cached
+
+    def _add_missing_columns(self, conn: sqlite3.Connection):
+        """Add ADDED_COLUMNS to tables that predate them (no-op on new databases)"""
+        for table, columns in ADDED_COLUMNS.items():
+            existing = {
+                row["name"] for row in conn.execute(f"PRAGMA table_info({table})")
+            }
+            if not existing:
+                continue  # Table not created yet - schema file will create it
+            for name, declaration in columns:
+                if name not in existing:
+                    logger.info(f"Adding column {table}.{name}")
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {declaration}")
+        conn.commit()
+
     def _ensure_tables(self):
-        """Create database tables by loading schema files"""
-        # Load generic tables (engine-ready)
-        generic_dir = self.schema_dir / "generic"
-        if generic_dir.exists():
-            for schema_file in sorted(generic_dir.glob("*.sql")):
-                self._execute_schema_file(schema_file)
-
-        # Load domain-specific tables (face-changer)
-        domain_dir = self.schema_dir / "domain"
-        if domain_dir.exists():
-            for schema_file in sorted(domain_dir.glob("*.sql")):
-                self._execute_schema_file(schema_file)
+        """Create database tables by loading schema files
+
+        Migration and every schema file run on one connection rather than
+        opening (and configuring) a connection per file. The applied schema
+        version is stamped in PRAGMA user_version; files already at the
+        current version skip the DDL entirely.
+        """
+        scripts, version = self._load_schema()
+
+        with self._get_connection() as conn:
+            if conn.execute("PRAGMA user_version").fetchone()[0] == version:
+                return
+            self._add_missing_columns(conn)
+            for name, sql in scripts:
+                logger.debug(f"Loading schema from {name}")
+                conn.executescript(sql)
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
@@ -9,14 +9,111 @@ IMPORTANT: Changes via Change Management, see CLAUDE.md
 
 import json
 import logging
-from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional
 
+from ...utils import json_codec
 from .base import Database
 
 logger = logging.getLogger(__name__)
 
+# JSON-encoded TEXT columns decoded when jobs are returned as dicts
+_JSON_FIELDS = ("data", "result", "metadata")
+
+
+def _parse_json_fields(job: dict[str, Any]) -> dict[str, Any]:
+    """Decode a job row's JSON columns in place (invalid JSON becomes {})"""
+    for field in _JSON_FIELDS:
+        if job.get(field):
+            try:
+                job[field] = json_codec.loads(job[field])
+            except (json.JSONDecodeError, TypeError):
+                logger.warning(f"Failed to parse job {field} JSON for {job['job_id']}")
+                job[field] = {}
+    return job
+
+
+# Pending-queue filters, keyed by (job_type given, machine_type given); the
+# queue is ordered by priority (1=highest), then creation time.
+# Every query shape is built once here, so callers only pick a string and
+# the statement text stays stable for sqlite3's statement cache.
+_PENDING_FILTERS = {
+    (False, False): "",
+    (True, False): " AND job_type = ?",
+    (False, True): " AND machine_type = ?",
+    (True, True): " AND job_type = ? AND machine_type = ?",
+}
+
+_SELECT_PENDING_SQL = {
+    shape: "SELECT * FROM jobs WHERE status = 'pending'"
+    + where
+    + " ORDER BY priority ASC, created_at ASC"
+    for shape, where in _PENDING_FILTERS.items()
+}
+
+_SELECT_PENDING_LIMIT_SQL = {
+    shape: sql + " LIMIT ?" for shape, sql in _SELECT_PENDING_SQL.items()
+}
+
+_CLAIM_PENDING_SQL = {
+    shape: """
+    UPDATE jobs
+    SET status = 'processing', started_at = CURRENT_TIMESTAMP
+    WHERE status = 'pending' AND id IN (
+        SELECT id FROM jobs WHERE status = 'pending'"""
+    + where
+    + """
+        ORDER BY priority ASC, created_at ASC, id ASC LIMIT ?
+    )
+    RETURNING *
+"""
+    for shape, where in _PENDING_FILTERS.items()
+}
+
+
+def _pending_filter(
+    job_type: Optional[str], machine_type: Optional[str]
+) -> tuple[tuple[bool, bool], list[Any]]:
+    """Pick the _PENDING_FILTERS shape and its parameters
+
+    An empty job_type means "any type"; machine_type=None means "any
+    machine", while "" matches only jobs stored with an empty machine_type.
+    """
+    params = []
+    if job_type:
+        params.append(job_type)
+    if machine_type is not None:
+        params.append(machine_type)
+    return (bool(job_type), machine_type is not None), params
+
+
+_INSERT_JOB_SQL = """
+    INSERT INTO jobs (job_id, job_type, machine_type, source_job_id,
+                     priority, data, metadata, status)
+    VALUES (?, ?, ?, ?, ?, ?, ?, 'pending')
+"""
+
+
+def _job_row(
+    job_id: str,
+    job_type: str,
+    machine_type: str = None,
+    source_job_id: str = None,
+    priority: int = 5,
+    data: dict[str, Any] = None,
+    metadata: dict[str, Any] = None,
+) -> tuple[Any, ...]:
+    """Build _INSERT_JOB_SQL parameters (data/metadata stored as JSON)"""
+    return (
+        job_id,
+        job_type,
+        machine_type,
+        source_job_id,
+        priority,
+        json_codec.dumps(data) if data else None,
+        json_codec.dumps(metadata) if metadata else None,
+    )
+
 
 class JobModel:
     """Model for job management"""
@@ -54,24 +151,41 @@ class JobModel:
         """
         with self.db._get_connection() as conn:
             cursor = conn.execute(
-                """
-                INSERT INTO jobs (job_id, job_type, machine_type, source_job_id,
-                                 priority, data, metadata, status)
-                VALUES (?, ?, ?, ?, ?, ?, ?, 'pending')
-            """,
-                (
+                _INSERT_JOB_SQL,
+                _job_row(
                     job_id,
                     job_type,
                     machine_type,
                     source_job_id,
                     priority,
-                    json.dumps(data) if data else None,
-                    json.dumps(metadata) if metadata else None,
+                    data,
+                    metadata,
                 ),
             )
             conn.commit()
             return cursor.lastrowid
 
+    def create_jobs(self, jobs: list[dict[str, Any]]) -> int:
+        """
+        Create many pending jobs with one executemany() and a single commit.
+
+        Args:
+            jobs: Dicts of create_job keyword arguments (job_id and job_type
+                  required). Inserted in list order, so equal-priority jobs
+                  queue in that order.
+
+        Returns:
+            Number of jobs created
+        """
+        if not jobs:
+            return 0
+
+        rows = [_job_row(**job) for job in jobs]
+        with self.db._get_connection() as conn:
+            conn.executemany(_INSERT_JOB_SQL, rows)
+            conn.commit()
+        return len(rows)
+
     def get_next_job(
         self, job_type: str = None, machine_type: str = None
     ) -> Optional[dict[str, Any]]:
@@ -87,70 +201,12 @@ class JobModel:
         Returns:
             Job dict with parsed JSON fields, or None if no jobs found
         """
-        with self.db._get_connection() as conn:
-            query = "SELECT * FROM jobs WHERE status = 'pending'"
-            params = []
-
-            if job_type:
-                query += " AND job_type = ?"
-                params.append(job_type)
-
-            # Only filter by machine_type if explicitly provided (not None)
-            if machine_type is not None:
-                query += " AND machine_type = ?"
-                params.append(machine_type)
-
-            # Order by priority first (1=highest), then creation time
-            query += " ORDER BY priority ASC, created_at ASC LIMIT 1"
-
-            row = conn.execute(query, params).fetchone()
-
-            if row:
-                # Mark as processing
-                conn.execute(
-                    """
-                    UPDATE jobs
-                    SET status = 'processing', started_at = CURRENT_TIMESTAMP
-                    WHERE job_id = ?
-                """,
-                    (row["job_id"],),
-                )
-                conn.commit()
-
-                # Convert to dict and parse JSON fields
-                job = dict(row)
-                # Update status in dict to reflect the database change
-                job["status"] = "processing"
-                job["started_at"] = datetime.now().isoformat()
-                if job.get("data"):
-                    try:
-                        job["data"] = json.loads(job["data"])
-                    except (json.JSONDecodeError, TypeError):
-                        logger.warning(
-                            f"Failed to parse job data JSON for {job['job_id']}"
-                        )
-                        job["data"] = {}
-
-                if job.get("result"):
-                    try:
-                        job["result"] = json.loads(job["result"])
-                    except (json.JSONDecodeError, TypeError):
-                        logger.warning(
-                            f"Failed to parse job result JSON for {job['job_id']}"
-                        )
-                        job["result"] = {}
-
-                if job.get("metadata"):
-                    try:
-                        job["metadata"] = json.loads(job["metadata"])
-                    except (json.JSONDecodeError, TypeError):
-                        logger.warning(
-                            f"Failed to parse job metadata JSON for {job['job_id']}"
-                        )
-                        job["metadata"] = {}
-
-                return job
-            return None
+        # Select and mark as processing in one conditional UPDATE, so two
+        # pollers can never both receive the same job
+        jobs = self.claim_jobs_batch(
+            job_type=job_type, limit=1, machine_type=machine_type
+        )
+        return jobs[0] if jobs else None
 
     def get_pending_jobs(
         self, job_type: str = None, machine_type: str = None, limit: int = None
@@ -166,61 +222,16 @@ class JobModel:
         Returns:
             List of job dicts with parsed JSON fields
         """
-        with self.db._get_connection() as conn:
-            query = "SELECT * FROM jobs WHERE status = 'pending'"
-            params = []
-
-            if job_type:
-                query += " AND job_type = ?"
-                params.append(job_type)
-
-            if machine_type is not None:
-                query += " AND machine_type = ?"
-                params.append(machine_type)
-
-            # Order by priority first (1=highest), then creation time
-            query += " ORDER BY priority ASC, created_at ASC"
-
-            if limit:
-                query += " LIMIT ?"
-                params.append(limit)
+        shape, params = _pending_filter(job_type, machine_type)
+        if limit:
+            query = _SELECT_PENDING_LIMIT_SQL[shape]
+            params.append(limit)
+        else:
+            query = _SELECT_PENDING_SQL[shape]
 
+        with self.db._get_connection() as conn:
             rows = conn.execute(query, params).fetchall()
-
-            jobs = []
-            for row in rows:
-                job = dict(row)
-                # Parse JSON fields
-                if job.get("data"):
-                    try:
-                        job["data"] = json.loads(job["data"])
-                    except (json.JSONDecodeError, TypeError):
-                        logger.warning(
-                            f"Failed to parse job data JSON for {job['job_id']}"
-                        )
-                        job["data"] = {}
-
-                if job.get("result"):
-                    try:
-                        job["result"] = json.loads(job["result"])
-                    except (json.JSONDecodeError, TypeError):
-                        logger.warning(
-                            f"Failed to parse job result JSON for {job['job_id']}"
-                        )
-                        job["result"] = {}
-
-                if job.get("metadata"):
-                    try:
-                        job["metadata"] = json.loads(job["metadata"])
-                    except (json.JSONDecodeError, TypeError):
-                        logger.warning(
-                            f"Failed to parse job metadata JSON for {job['job_id']}"
-                        )
-                        job["metadata"] = {}
-
-                jobs.append(job)
-
-            return jobs
+            return [_parse_json_fields(dict(row)) for row in rows]
 
     def get_latest_job_by_type(self, job_type: str) -> Optional[dict[str, Any]]:
         """Get the most recent job of given type (for event validation)"""
@@ -259,6 +270,37 @@ class JobModel:
             conn.commit()
             return result.rowcount > 0
 
+    def claim_jobs_batch(
+        self, job_type: str = None, limit: int = 1, machine_type: str = None
+    ) -> list[dict[str, Any]]:
+        """
+        Claim up to limit pending jobs in one statement (UPDATE ... RETURNING).
+
+        Selection matches get_pending_jobs (priority, then creation order) and
+        the status = 'pending' guard keeps concurrent claimers from taking the
+        same job, as with claim_job.
+
+        Args:
+            job_type: Filter by job type (optional)
+            limit: Maximum number of jobs to claim
+            machine_type: Filter by assigned machine (optional)
+
+        Returns:
+            Claimed job dicts (status 'processing') with parsed JSON fields,
+            in queue order
+        """
+        shape, params = _pending_filter(job_type, machine_type)
+        params.append(limit)
+
+        with self.db._get_connection() as conn:
+            rows = conn.execute(_CLAIM_PENDING_SQL[shape], params).fetchall()
+            conn.commit()
+
+        # RETURNING order is unspecified - restore queue order
+        jobs = [_parse_json_fields(dict(row)) for row in rows]
+        jobs.sort(key=lambda job: (job["priority"], job["created_at"], job["id"]))
+        return jobs
+
     def complete_job(self, job_id: str):
         """Mark job as completed"""
         with self.db._get_connection() as conn:
@@ -292,34 +334,17 @@ class JobModel:
                 "SELECT * FROM jobs WHERE job_id = ?", (job_id,)
             ).fetchone()
             if row:
-                job = dict(row)
-                # Parse JSON fields
-                if job.get("data"):
-                    try:
-                        job["data"] = json.loads(job["data"])
-                    except (json.JSONDecodeError, TypeError):
-                        logger.warning(f"Failed to parse job data JSON for {job_id}")
-                        job["data"] = {}
-
-                if job.get("result"):
-                    try:
-                        job["result"] = json.loads(job["result"])
-                    except (json.JSONDecodeError, TypeError):
-                        logger.warning(f"Failed to parse job result JSON for {job_id}")
-                        job["result"] = {}
-
-                if job.get("metadata"):
-                    try:
-                        job["metadata"] = json.loads(job["metadata"])
-                    except (json.JSONDecodeError, TypeError):
-                        logger.warning(
-                            f"Failed to parse job metadata JSON for {job_id}"
-                        )
-                        job["metadata"] = {}
-
-                return job
+                return _parse_json_fields(dict(row))
             return None
 
+    def job_exists(self, job_id: str) -> bool:
+        """Check whether a job exists (no row fetch or JSON parsing)"""
+        with self.db._get_connection() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+            return row is not None
+
     def list_jobs(
         self,
         status: Optional[str] = None,
@@ -348,39 +373,7 @@ class JobModel:
             params.append(limit)
 
             rows = conn.execute(query, params).fetchall()
-            jobs = []
-            for row in rows:
-                job = dict(row)
-                # Parse JSON fields
-                if job.get("data"):
-                    try:
-                        job["data"] = json.loads(job["data"])
-                    except (json.JSONDecodeError, TypeError):
-                        logger.warning(
-                            f"Failed to parse job data JSON for {job.get('job_id')}"
-                        )
-                        job["data"] = {}
-
-                if job.get("result"):
-                    try:
-                        job["result"] = json.loads(job["result"])
-                    except (json.JSONDecodeError, TypeError):
-                        logger.warning(
-                            f"Failed to parse job result JSON for {job.get('job_id')}"
-                        )
-                        job["result"] = {}
-
-                if job.get("metadata"):
-                    try:
-                        job["metadata"] = json.loads(job["metadata"])
-                    except (json.JSONDecodeError, TypeError):
-                        logger.warning(
-                            f"Failed to parse job metadata JSON for {job.get('job_id')}"
-                        )
-                        job["metadata"] = {}
-
-                jobs.append(job)
-            return jobs
+            return [_parse_json_fields(dict(row)) for row in rows]
 
     def count_jobs(
         self,
@@ -443,7 +436,7 @@ class JobModel:
                 # Parse JSON data field
                 if job_dict.get("data"):
                     try:
-                        data = json.loads(job_dict["data"])
+                        data = json_codec.loads(job_dict["data"])
                         input_path_str = data.get("input_image_path")
                         if input_path_str:
                             input_path = Path(input_path_str)
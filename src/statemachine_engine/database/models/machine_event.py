@@ -8,12 +8,18 @@ IMPORTANT: Changes via Change Management, see CLAUDE.md
 """
 
 import logging
-from typing import Any
+import sqlite3
+from typing import Any, Optional
 
 from .base import Database
 
 logger = logging.getLogger(__name__)
 
+_INSERT_EVENT_SQL = """
+    INSERT INTO machine_events (source_machine, target_machine, event_type, job_id, payload)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
 
 class MachineEventModel:
     """Model for machine event coordination"""
@@ -28,16 +34,19 @@ class MachineEventModel:
         job_id: str = None,
         payload: str = None,
         source_machine: str = None,
+        conn: Optional[sqlite3.Connection] = None,
     ) -> int:
-        """Send an event to a target machine"""
+        """Send an event to a target machine
+
+        Args:
+            conn: Connection from Database.transaction() to join; the caller
+                commits. By default the insert is committed on its own.
+        """
+        row = (source_machine, target_machine, event_type, job_id, payload)
+        if conn is not None:
+            return conn.execute(_INSERT_EVENT_SQL, row).lastrowid
         with self.db._get_connection() as conn:
-            cursor = conn.execute(
-                """
-                INSERT INTO machine_events (source_machine, target_machine, event_type, job_id, payload)
-                VALUES (?, ?, ?, ?, ?)
-            """,
-                (source_machine, target_machine, event_type, job_id, payload),
-            )
+            cursor = conn.execute(_INSERT_EVENT_SQL, row)
             conn.commit()
             return cursor.lastrowid
 
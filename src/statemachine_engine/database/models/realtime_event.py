@@ -9,12 +9,102 @@ IMPORTANT: Changes via Change Management, see CLAUDE.md
 
 import json
 import logging
+import sqlite3
+import time
 from typing import Any, Optional
 
+from ...utils import json_codec
 from .base import Database
 
 logger = logging.getLogger(__name__)
 
+# SQL text is kept constant (no f-strings) so sqlite3's per-connection
+# statement cache can reuse the prepared statements across calls.
+# created_at is written explicitly as integer unix epoch so databases whose
+# table predates the INTEGER default also get epoch values for new rows
+_INSERT_EVENT_SQL = """
+    INSERT INTO realtime_events (
+        machine_name, event_type, payload,
+        from_state, to_state, event_trigger, error_message, job_id, created_at
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, CAST(strftime('%s', 'now') AS INTEGER))
+"""
+
+# Payload keys mirrored into typed realtime_events columns (same order as SQL)
+HOT_PAYLOAD_FIELDS = (
+    "from_state",
+    "to_state",
+    "event_trigger",
+    "error_message",
+    "job_id",
+)
+
+
+def _encode_payload(payload: dict[str, Any]) -> str:
+    """Serialize a payload as compact UTF-8 JSON (no padding, no \\u escapes)"""
+    return json_codec.dumps(payload)
+
+
+def _event_row(
+    machine_name: str, event_type: str, payload: dict[str, Any]
+) -> tuple[Any, ...]:
+    """Build insert parameters: full JSON payload plus typed hot-field columns"""
+    hot_values = []
+    for field in HOT_PAYLOAD_FIELDS:
+        value = payload.get(field) if isinstance(payload, dict) else None
+        hot_values.append(value if isinstance(value, (str, int, float)) else None)
+    return (machine_name, event_type, _encode_payload(payload), *hot_values)
+
+
+# Keyset (cursor) pagination: each page is a range scan starting after
+# since_id, never an OFFSET that scans and discards earlier rows. The partial
+# index covers only unconsumed rows and is already in id order; INDEXED BY
+# pins it, since the planner otherwise prefers idx_realtime_pending and sorts.
+# Malformed payloads are rejected by json_valid in SQLite, before rows are
+# handed to Python, and do not count toward the page limit. json_codec only
+# writes strict JSON (NaN/Infinity as null), so that skips nothing this
+# model stored; only rows written by other means can be malformed.
+_SELECT_UNCONSUMED_SQL = """
+    SELECT id, machine_name, event_type, payload, created_at
+    FROM realtime_events INDEXED BY idx_realtime_unconsumed
+    WHERE id > ? AND consumed = 0 AND json_valid(payload)
+    ORDER BY id
+    LIMIT ?
+"""
+
+# Ad-hoc payload filters run in SQLite's JSON1 functions rather than loading
+# and decoding every row in Python. json_extract raises on malformed JSON, so
+# json_valid guards it; a missing key extracts as NULL and never matches.
+_SELECT_BY_PAYLOAD_FIELD_SQL = """
+    SELECT id, machine_name, event_type, payload, created_at
+    FROM realtime_events
+    WHERE event_type = ?
+    AND CASE WHEN json_valid(payload) THEN json_extract(payload, ?) END = ?
+    ORDER BY id DESC
+    LIMIT ?
+"""
+
+# Ids are bound as one JSON array, so the statement text is the same for any
+# batch size: one prepared statement in the cache (a placeholder per id would
+# cache a distinct statement per batch length, evicting the hot ones) and no
+# host parameter limit. The consumed = 0 guard keeps the first consumed_at;
+# NOT INDEXED keeps the planner on rowid lookups per id instead of scanning
+# every unconsumed row via idx_realtime_pending (consumed, created_at).
+_MARK_CONSUMED_SQL = """
+    UPDATE realtime_events NOT INDEXED
+    SET consumed = 1, consumed_at = CAST(strftime('%s', 'now') AS INTEGER)
+    WHERE id IN (SELECT value FROM json_each(?)) AND consumed = 0
+"""
+
+# Pinned to the partial consumed_at index so cleanup is a range scan over the
+# expired consumed rows, not every consumed row via idx_realtime_pending.
+# consumed_at is epoch seconds, compared against a cutoff bound by the caller
+_CLEANUP_CONSUMED_SQL = """
+    DELETE FROM realtime_events INDEXED BY idx_realtime_consumed_at
+    WHERE consumed = 1
+    AND consumed_at < ?
+"""
+
 
 class RealtimeEventModel:
     """Model for real-time event logging and consumption"""
@@ -23,22 +113,27 @@ class RealtimeEventModel:
         self.db = db
 
     def log_event(
-        self, machine_name: str, event_type: str, payload: dict[str, Any]
+        self,
+        machine_name: str,
+        event_type: str,
+        payload: dict[str, Any],
+        conn: Optional[sqlite3.Connection] = None,
     ) -> Optional[int]:
         """Log a real-time event to the database
 
+        Args:
+            conn: Connection from Database.transaction() to join; the caller
+                commits. By default a new connection is opened and committed.
+
         Returns:
             Event ID if successful, None if failed
         """
         try:
+            row = _event_row(machine_name, event_type, payload)
+            if conn is not None:
+                return conn.execute(_INSERT_EVENT_SQL, row).lastrowid
             with self.db._get_connection() as conn:
-                cursor = conn.execute(
-                    """
-                    INSERT INTO realtime_events (machine_name, event_type, payload)
-                    VALUES (?, ?, ?)
-                """,
-                    (machine_name, event_type, json.dumps(payload)),
-                )
+                cursor = conn.execute(_INSERT_EVENT_SQL, row)
                 conn.commit()
                 return cursor.lastrowid
         except json.JSONDecodeError as e:
@@ -50,6 +145,31 @@ class RealtimeEventModel:
             )
             return None
 
+    def log_events_bulk(self, events: list[tuple[str, str, dict[str, Any]]]) -> int:
+        """Log many real-time events in a single transaction
+
+        Args:
+            events: (machine_name, event_type, payload) tuples
+
+        Returns:
+            Number of events inserted, or -1 if error
+        """
+        if not events:
+            return 0
+
+        try:
+            rows = [
+                _event_row(machine_name, event_type, payload)
+                for machine_name, event_type, payload in events
+            ]
+            with self.db._get_connection() as conn:
+                conn.executemany(_INSERT_EVENT_SQL, rows)
+                conn.commit()
+                return len(rows)
+        except Exception as e:
+            logger.error(f"Failed to log {len(events)} realtime events: {e}")
+            return -1
+
     def get_unconsumed_events(
         self, since_id: int = 0, limit: int = 50
     ) -> list[dict[str, Any]]:
@@ -58,33 +178,57 @@ class RealtimeEventModel:
         Returns:
             List of events (may be empty if error or no events)
         """
+        events, _ = self.get_unconsumed_events_page(since_id, limit)
+        return events
+
+    def get_unconsumed_events_page(
+        self, since_id: int = 0, limit: int = 50
+    ) -> tuple[list[dict[str, Any]], int]:
+        """Get one page of unconsumed events plus the cursor for the next page
+
+        Pass the returned cursor back as since_id to continue. Rows whose
+        payload is not valid JSON are never returned.
+
+        Returns:
+            (events, next_since_id); on error ([], since_id)
+        """
         try:
             with self.db._get_connection() as conn:
                 rows = conn.execute(
-                    """
-                    SELECT id, machine_name, event_type, payload, created_at
-                    FROM realtime_events
-                    WHERE id > ? AND consumed = 0
-                    ORDER BY id
-                    LIMIT ?
-                """,
-                    (since_id, limit),
+                    _SELECT_UNCONSUMED_SQL, (since_id, limit)
                 ).fetchall()
 
-                events = []
-                for row in rows:
-                    try:
-                        event = dict(row)
-                        event["payload"] = json.loads(event["payload"])
-                        events.append(event)
-                    except json.JSONDecodeError as e:
-                        logger.warning(
-                            f"Failed to parse payload for event {row['id']}: {e}"
-                        )
-                        continue
-                return events
+            events = [
+                dict(row, payload=json_codec.loads(row["payload"])) for row in rows
+            ]
+            next_since_id = rows[-1]["id"] if rows else since_id
+            return events, next_since_id
         except Exception as e:
             logger.error(f"Failed to get unconsumed events: {e}")
+            return [], since_id
+
+    def get_events_by_payload_field(
+        self, event_type: str, field: str, value: Any, limit: int = 50
+    ) -> list[dict[str, Any]]:
+        """Get the newest events of a type whose payload has field == value
+
+        Hot fields (HOT_PAYLOAD_FIELDS) also have typed, indexed columns;
+        query those directly on hot paths. This covers any other payload key.
+
+        Returns:
+            List of events, newest first (may be empty if error or no match)
+        """
+        try:
+            with self.db._get_connection() as conn:
+                rows = conn.execute(
+                    _SELECT_BY_PAYLOAD_FIELD_SQL,
+                    (event_type, f"$.{field}", value, limit),
+                ).fetchall()
+
+            # json_valid in the query already excluded malformed payloads
+            return [dict(row, payload=json_codec.loads(row["payload"])) for row in rows]
+        except Exception as e:
+            logger.error(f"Failed to query {event_type} events by {field}: {e}")
             return []
 
     def mark_events_consumed(self, event_ids: list[int]) -> bool:
@@ -98,15 +242,7 @@ class RealtimeEventModel:
 
         try:
             with self.db._get_connection() as conn:
-                placeholders = ",".join(["?" for _ in event_ids])
-                conn.execute(
-                    f"""
-                    UPDATE realtime_events
-                    SET consumed = 1, consumed_at = CURRENT_TIMESTAMP
-                    WHERE id IN ({placeholders})
-                """,
-                    event_ids,
-                )
+                conn.execute(_MARK_CONSUMED_SQL, (json_codec.dumps(list(event_ids)),))
                 conn.commit()
                 return True
         except Exception as e:
@@ -121,15 +257,16 @@ class RealtimeEventModel:
         """
         try:
             with self.db._get_connection() as conn:
-                cursor = conn.execute(
-                    f"""
-                    DELETE FROM realtime_events
-                    WHERE consumed = 1
-                    AND consumed_at < datetime('now', '-{hours_old} hours')
-                """
-                )
+                cutoff = int(time.time()) - hours_old * 3600
+                cursor = conn.execute(_CLEANUP_CONSUMED_SQL, (cutoff,))
                 deleted_count = cursor.rowcount
                 conn.commit()
+                if deleted_count > 0:
+                    # Return freed pages to the OS (no-op unless the file
+                    # was created with auto_vacuum=INCREMENTAL). The pragma
+                    # frees one page per step; executescript steps it to
+                    # completion where execute() stops after the first.
+                    conn.executescript("PRAGMA incremental_vacuum")
                 logger.info(f"Cleaned up {deleted_count} old realtime events")
                 return deleted_count
         except Exception as e:
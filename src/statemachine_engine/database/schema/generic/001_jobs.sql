@@ -51,3 +51,6 @@ CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status);
 CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs (created_at);
 CREATE INDEX IF NOT EXISTS idx_jobs_machine_type ON jobs (machine_type, status);
 CREATE INDEX IF NOT EXISTS idx_jobs_priority ON jobs (priority DESC, created_at ASC);
+-- Queue polling: WHERE status = 'pending' AND job_type = ? ORDER BY priority, created_at
+-- Partial index holds pending rows only and returns them in dispatch order
+CREATE INDEX IF NOT EXISTS idx_jobs_pending ON jobs (job_type, priority, created_at) WHERE status = 'pending';
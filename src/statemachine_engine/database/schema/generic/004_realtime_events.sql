@@ -16,7 +16,7 @@
 --
 --   -- Mark events as consumed after broadcast
 --   UPDATE realtime_events
---   SET consumed = 1, consumed_at = CURRENT_TIMESTAMP
+--   SET consumed = 1, consumed_at = CAST(strftime('%s', 'now') AS INTEGER)
 --   WHERE id <= 12345;
 --
 --   -- List recent state changes for machine
@@ -31,11 +31,41 @@ CREATE TABLE IF NOT EXISTS realtime_events (
     machine_name TEXT NOT NULL,
     event_type TEXT NOT NULL,
     payload TEXT NOT NULL,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    -- Unix epoch seconds (created_at, consumed_at): integer range filters
+    -- and ordering, no text parsing
+    created_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
     consumed BOOLEAN DEFAULT 0,
-    consumed_at TIMESTAMP
+    consumed_at INTEGER,
+    -- Hot payload fields copied into typed columns so history queries
+    -- skip per-row JSON parsing (payload keeps the full event)
+    from_state TEXT,
+    to_state TEXT,
+    event_trigger TEXT,
+    error_message TEXT,
+    job_id TEXT
 );
 
+-- Timestamps written as CURRENT_TIMESTAMP text before the switch to epoch
+-- seconds; converted in place so range filters compare integers only
+UPDATE realtime_events SET created_at = CAST(strftime('%s', created_at) AS INTEGER)
+WHERE typeof(created_at) = 'text';
+UPDATE realtime_events SET consumed_at = CAST(strftime('%s', consumed_at) AS INTEGER)
+WHERE typeof(consumed_at) = 'text';
+
 -- Indexes for real-time event streaming
 CREATE INDEX IF NOT EXISTS idx_realtime_pending ON realtime_events (consumed, created_at);
 CREATE INDEX IF NOT EXISTS idx_realtime_machine ON realtime_events (machine_name, created_at);
+-- History queries: WHERE event_type = ? [AND machine_name = ?] ORDER BY created_at DESC
+-- The trailing machine_name, id columns make the type/time index covering for
+-- listings that skip payload (no table lookup per row). It replaces the
+-- narrower idx_realtime_type_time, which shares its leading columns.
+DROP INDEX IF EXISTS idx_realtime_type_time;
+CREATE INDEX IF NOT EXISTS idx_realtime_type_covering ON realtime_events (event_type, created_at DESC, machine_name, id);
+CREATE INDEX IF NOT EXISTS idx_realtime_type_machine_time ON realtime_events (event_type, machine_name, created_at DESC);
+-- Partial index over the unconsumed tail only; consumed rows drop out of it,
+-- so the fallback poller's cursor scan stays small as history accumulates
+CREATE INDEX IF NOT EXISTS idx_realtime_unconsumed ON realtime_events (id) WHERE consumed = 0;
+-- Error lookups by job: WHERE event_type = 'error' AND job_id = ?
+CREATE INDEX IF NOT EXISTS idx_realtime_type_job ON realtime_events (event_type, job_id);
+-- Cleanup of old consumed events: range scan over consumed rows only
+CREATE INDEX IF NOT EXISTS idx_realtime_consumed_at ON realtime_events (consumed_at) WHERE consumed = 1;
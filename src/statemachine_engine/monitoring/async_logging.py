@@ -86,7 +86,9 @@ BENEFITS:
 CAVEATS:
 --------
 - Logs may appear slightly delayed (queue processing time)
-- Very high log volume can fill queue memory (configurable size)
+- The queue is bounded (queue_size, default 10000 records). When the sink
+  falls that far behind, new records are dropped and counted rather than
+  blocking the caller or growing memory without limit
 - Shutdown must call queue_listener.stop() to flush remaining logs
 
 REFERENCES:
@@ -101,14 +103,47 @@ import queue
 from pathlib import Path
 from typing import Optional, Union
 
+DEFAULT_QUEUE_SIZE = 10000
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records when the queue is full
+
+    The stock handler reports a full queue through handleError, which
+    prints a traceback to stderr per record: blocking I/O on the very
+    thread the queue exists to protect. Dropped records are counted instead.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class BoundedQueueListener(logging.handlers.QueueListener):
+    """QueueListener whose stop() waits for room in a full queue
+
+    The stock listener enqueues its stop sentinel with put_nowait, which
+    raises queue.Full when a slow sink has let a bounded queue fill up.
+    """
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
 
 def setup_async_logging(
     log_file: Union[str, Path],
     log_level: int = logging.INFO,
     log_format: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     logger_name: Optional[str] = None,
-    queue_size: int = -1,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
     include_console: bool = True,
+    shared_listener: Optional[logging.handlers.QueueListener] = None,
 ) -> tuple[logging.Logger, logging.handlers.QueueListener]:
     """
     Configure non-blocking logging for async applications.
@@ -121,8 +156,13 @@ def setup_async_logging(
         log_level: Logging level (logging.DEBUG, INFO, WARNING, etc.)
         log_format: Format string for log messages
         logger_name: Name for logger (defaults to calling module)
-        queue_size: Max queue size (-1 for unlimited)
+        queue_size: Max queued records before new ones are dropped
+            (-1 for unlimited)
         include_console: Whether to also log to stdout
+        shared_listener: Listener returned by an earlier call to reuse. Its
+            queue and background thread are shared and this logger's handlers
+            are added to it, so N loggers cost one thread instead of N.
+            queue_size is ignored (the queue already exists).
 
     Returns:
         Tuple of (logger, queue_listener)
@@ -139,19 +179,21 @@ def setup_async_logging(
     log_path = Path(log_file)
     log_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Create thread-safe queue for log records
-    log_queue = queue.Queue(queue_size)
-
     # Create formatter
     formatter = logging.Formatter(log_format)
 
+    # The listener may serve several loggers, so each handler only takes
+    # records from its own logger (and its children)
+    name_filter = logging.Filter(logger_name or "")
+
     # Create actual I/O handlers (will run in background thread)
     handlers = []
 
-    # File handler
-    file_handler = logging.FileHandler(log_file, mode="a")
+    # File handler (UTF-8 whatever the locale, so any message can be written)
+    file_handler = logging.FileHandler(log_file, mode="a", encoding="utf-8")
     file_handler.setFormatter(formatter)
     file_handler.setLevel(log_level)
+    file_handler.addFilter(name_filter)
     handlers.append(file_handler)
 
     # Console handler (optional)
@@ -161,15 +203,26 @@ def setup_async_logging(
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setFormatter(formatter)
         console_handler.setLevel(log_level)
+        console_handler.addFilter(name_filter)
         handlers.append(console_handler)
 
-    # Create QueueListener to process queue in background thread
-    queue_listener = logging.handlers.QueueListener(
-        log_queue, *handlers, respect_handler_level=True
-    )
+    if shared_listener is not None:
+        # The listener thread reads .handlers per record; swapping in a new
+        # tuple is atomic, so the running thread picks the handlers up
+        queue_listener = shared_listener
+        queue_listener.handlers = (*queue_listener.handlers, *handlers)
+        log_queue = queue_listener.queue
+    else:
+        # Create thread-safe queue for log records
+        log_queue = queue.Queue(queue_size)
+
+        # Create QueueListener to process queue in background thread
+        queue_listener = BoundedQueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
 
-    # Create QueueHandler (non-blocking, just enqueues)
-    queue_handler = logging.handlers.QueueHandler(log_queue)
+    # Create QueueHandler (non-blocking, just enqueues; drops when full)
+    queue_handler = DroppingQueueHandler(log_queue)
 
     # Configure logger
     logger = logging.getLogger(logger_name)
@@ -177,7 +230,8 @@ def setup_async_logging(
     logger.setLevel(log_level)
 
     # Start background thread
-    queue_listener.start()
+    if shared_listener is None:
+        queue_listener.start()
 
     return logger, queue_listener
 
@@ -23,7 +23,7 @@ from pathlib import Path
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 
-from statemachine_engine.database.models import Database
+from statemachine_engine.database.models import get_database
 from statemachine_engine.monitoring.async_logging import setup_async_logging
 
 # Setup non-blocking logging (prevents I/O from blocking event loop)
@@ -40,6 +40,7 @@ logger.info("=" * 80)
 
 # Global socket path (configurable via CLI)
 unix_socket_path = "/tmp/statemachine-events.sock"
+UNIX_SOCKET_BUFFER_SIZE = 8 * 1024 * 1024
 
 # ============================================================================
 # SAFE JSON SERIALIZATION
@@ -143,7 +144,7 @@ class WatchdogThread(threading.Thread):
         """Monitor heartbeat and dump stack on hang"""
         logger.info(f"🐕 Watchdog started with {self.timeout}s timeout")
         while self.running:
-            time.sleep(2)  # Check every 2 seconds
+            time.sleep(WATCHDOG_CHECK_INTERVAL)
             time_since_heartbeat = time.time() - self.monitor.last_heartbeat
 
             if time_since_heartbeat > self.timeout:
@@ -218,8 +219,10 @@ class WatchdogThread(threading.Thread):
 
 
 # Global performance monitor and watchdog
+WATCHDOG_TIMEOUT = 15  # seconds without a heartbeat before a hang is reported
+WATCHDOG_CHECK_INTERVAL = 2  # seconds between watchdog heartbeat checks
 perf_monitor = PerformanceMonitor()
-watchdog = WatchdogThread(perf_monitor, timeout=15)
+watchdog = WatchdogThread(perf_monitor, timeout=WATCHDOG_TIMEOUT)
 watchdog.start()
 
 # ============================================================================
@@ -246,7 +249,9 @@ async def lifespan(app: FastAPI):
         app.state.background_tasks = tasks
 
         logger.info(f"WebSocket server started with {len(tasks)} background tasks")
-        logger.info("🐕 Watchdog thread monitoring for hangs (15s timeout)")
+        logger.info(
+            f"🐕 Watchdog thread monitoring for hangs ({WATCHDOG_TIMEOUT}s timeout)"
+        )
 
         # Log task status after brief delay
         await asyncio.sleep(0.5)
@@ -359,10 +364,31 @@ class EventBroadcaster:
 broadcaster = EventBroadcaster()
 
 
+# A burst of (re)connects within this window shares one snapshot query
+INITIAL_STATE_TTL = 0.1
+_initial_state_cache = {"at": 0.0, "state": None}
+
+
 @log_timing("get_initial_state", warn_threshold_ms=200)
 async def get_initial_state() -> dict:
-    """Get initial state snapshot with proper connection cleanup"""
-    db = Database()
+    """Get initial state snapshot, reusing one taken within INITIAL_STATE_TTL
+
+    Failed snapshots (with an "error" key) are never reused.
+    """
+    now = time.monotonic()
+    cached = _initial_state_cache["state"]
+    if cached is not None and now - _initial_state_cache["at"] < INITIAL_STATE_TTL:
+        return cached
+
+    state = _load_initial_state()
+    if "error" not in state:
+        _initial_state_cache.update(at=now, state=state)
+    return state
+
+
+def _load_initial_state() -> dict:
+    """Query the initial state snapshot with proper connection cleanup"""
+    db = get_database()
     try:
         # Get current machine states
         with db._get_connection() as conn:
@@ -534,6 +560,9 @@ async def unix_socket_listener():
 
     # Create Unix socket
     sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    # Room for bursts of events between reads (the kernel clamps this to
+    # net.core.rmem_max); senders mirror it with SO_SNDBUF
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, UNIX_SOCKET_BUFFER_SIZE)
     sock.bind(unix_socket_path)
     sock.setblocking(False)
 
@@ -66,14 +66,14 @@ import sys
 from pathlib import Path
 from typing import Any
 
-import yaml
+from statemachine_engine.utils import yaml_loader
 
 
 def load_yaml(file_path: str) -> dict[str, Any]:
     """Load YAML configuration file."""
     try:
         with open(file_path) as f:
-            return yaml.safe_load(f)
+            return yaml_loader.load_yaml(f)
     except Exception as e:
         print(f"Error loading YAML file {file_path}: {e}")
         sys.exit(1)
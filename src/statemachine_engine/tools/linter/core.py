@@ -4,20 +4,19 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import yaml
-
 from statemachine_engine.tools.linter.checks_actions import check_actions
 from statemachine_engine.tools.linter.checks_reachability import check_reachability
 from statemachine_engine.tools.linter.checks_semantic import check_semantic
 from statemachine_engine.tools.linter.checks_structural import check_structural
 from statemachine_engine.tools.linter.models import LintResult, Severity
+from statemachine_engine.utils import yaml_loader
 
 
 def run_linter(config_path: str, strict: bool = False) -> LintResult:
     """Load an FSM YAML config and run all lint checks."""
     path = Path(config_path)
     with open(path) as f:
-        config = yaml.safe_load(f)
+        config = yaml_loader.load_yaml(f)
 
     if not isinstance(config, dict):
         from statemachine_engine.tools.linter.models import LintIssue
@@ -41,6 +41,8 @@ from pathlib import Path
 
 import yaml
 
+from statemachine_engine.utils import yaml_loader
+
 
 @dataclass
 class ValidationIssue:
@@ -93,7 +95,7 @@ class StateMachineValidator:
 
         try:
             with open(config_path) as f:
-                config = yaml.safe_load(f)
+                config = yaml_loader.load_yaml(f)
         except FileNotFoundError:
             result.add_error(
                 ValidationIssue(
@@ -1,5 +1,5 @@
 """Utility modules for state machine engine."""
 
-from .interpolation import interpolate_config, interpolate_value
+from .interpolation import has_placeholders, interpolate_config, interpolate_value
 
-__all__ = ["interpolate_value", "interpolate_config"]
+__all__ = ["interpolate_value", "interpolate_config", "has_placeholders"]
@@ -16,6 +16,13 @@ Extracted from engine.py to eliminate code duplication across:
 - StartFSMAction._interpolate_variables()
 - SendEventAction (inline usage)
 
+Performance:
+    Templates are parsed once (cached) and rendered by one lookup plus a
+    concatenation, or by a single C-level %-format. Strings without "{" are
+    returned without parsing. What remains per call is a few dict lookups,
+    so the module stays pure Python: a compiled build (mypyc/Cython) would
+    add per-platform wheels for little left to gain.
+
 Usage:
     from statemachine_engine.utils.interpolation import interpolate_value, interpolate_config
 
@@ -30,7 +37,78 @@ Usage:
 """
 
 import re
-from typing import Any, Optional, Union
+import sys
+from functools import lru_cache
+from typing import Any, NamedTuple, Optional, Union
+
+# Pattern matches {variable_name} or {nested.path.name}
+# Variable names must start with letter or underscore, can contain alphanumeric and underscore
+_PLACEHOLDER_PATTERN = re.compile(r"\{([a-zA-Z_][a-zA-Z0-9_.]*)\}")
+
+# Sentinel for unresolved placeholders (None values count as unresolved)
+_MISSING = object()
+
+# Nesting depth walked by plain recursion; deeper subtrees are walked with an
+# explicit stack, so config depth is not bounded by the recursion limit
+_MAX_RECURSION_DEPTH = 100
+
+
+def _resolve(context: dict[str, Any], path: tuple[str, ...]) -> Any:
+    """
+    Resolve a placeholder's path segments against context without raising.
+
+    Returns _MISSING when any segment is absent, the value is None, or an
+    intermediate value cannot be indexed by key. Catching the failure is
+    cheaper on the hit path than a type check before every segment.
+    """
+    if len(path) == 1:
+        value = context.get(path[0])
+    else:
+        value = context
+        try:
+            for part in path:
+                value = value[part]
+        except (KeyError, TypeError):
+            return _MISSING
+    return _MISSING if value is None else value
+
+
+class _ParsedTemplate(NamedTuple):
+    """Cached shape of a template string."""
+
+    key: Optional[str]  # the placeholder key when there is exactly one
+    prefix: str  # literal text before that single placeholder
+    suffix: str  # literal text after that single placeholder
+    paths: tuple[tuple[str, ...], ...]  # each placeholder key's dot segments
+    percent_format: str  # template as a %-format with one %s per placeholder
+
+
+@lru_cache(maxsize=1024)
+def _parse_template(template: str) -> _ParsedTemplate:
+    """
+    Classify a template once so repeated renders skip the regex scan.
+
+    Single-placeholder templates resolve with one lookup plus concatenation.
+    Other templates are rendered by C-level %-formatting of a cached format
+    string. Unlike str.format_map, that leaves dotted paths and stray
+    braces (shell ${VAR} defaults, JSON, awk blocks) alone: only % is
+    special, and literal ones are escaped. Path segments are interned, so
+    looking them up in contexts keyed by literals compares by identity.
+    """
+    matches = list(_PLACEHOLDER_PATTERN.finditer(template))
+    paths = tuple(tuple(map(sys.intern, m.group(1).split("."))) for m in matches)
+    percent_format = _PLACEHOLDER_PATTERN.sub("%s", template.replace("%", "%%"))
+
+    if len(matches) == 1:
+        match = matches[0]
+        return _ParsedTemplate(
+            match.group(1),
+            template[: match.start()],
+            template[match.end() :],
+            paths,
+            percent_format,
+        )
+    return _ParsedTemplate(None, "", "", paths, percent_format)
 
 
 def interpolate_value(template: Any, context: Optional[dict[str, Any]]) -> Any:
@@ -67,75 +145,150 @@ def interpolate_value(template: Any, context: Optional[dict[str, Any]]) -> Any:
     if not isinstance(template, str):
         return template
 
+    # Most config strings are plain literals: skip the cache lookup, which
+    # hashes the whole string, for them
+    if "{" not in template:
+        return template
+
     if context is None:
         context = {}
 
-    # Pattern matches {variable_name} or {nested.path.name}
-    # Variable names must start with letter or underscore, can contain alphanumeric and underscore
-    pattern = r"\{([a-zA-Z_][a-zA-Z0-9_.]*)\}"
-
-    # Special case: If template is EXACTLY a single placeholder, preserve original type
-    single_match = re.fullmatch(pattern, template)
-    if single_match:
-        key = single_match.group(1)
-
-        # Handle nested keys with dot notation
-        if "." in key:
-            parts = key.split(".")
-            obj = context
-
-            for part in parts:
-                if isinstance(obj, dict):
-                    obj = obj.get(part)
-                    if obj is None:
-                        # Path not found - return original placeholder string
-                        return template
-                else:
-                    # Intermediate value is not a dict - return placeholder
-                    return template
-
-            # Successfully traversed entire path - return original type
-            return obj if obj is not None else template
-
-        # Handle simple keys - return original type
-        value = context.get(key)
-        if value is not None:
+    parsed = _parse_template(template)
+
+    if parsed.key is not None:
+        value = _resolve(context, parsed.paths[0])
+        if value is _MISSING:
+            return template
+        # Special case: If template is EXACTLY a single placeholder, preserve original type
+        if not parsed.prefix and not parsed.suffix:
             return value
+        return parsed.prefix + str(value) + parsed.suffix
 
-        # Key not found - return placeholder
+    # Multiple placeholders or mixed text - convert to strings
+    if not parsed.paths:
         return template
+    values = []
+    for path in parsed.paths:
+        value = _resolve(context, path)
+        values.append("{" + ".".join(path) + "}" if value is _MISSING else value)
+    return parsed.percent_format % tuple(values)
 
-    # Multiple placeholders or mixed text - convert to strings
-    def replace_match(match):
-        key = match.group(1)
 
-        # Handle nested keys with dot notation (e.g., event_data.payload.job_id)
-        if "." in key:
-            parts = key.split(".")
-            obj = context
+def has_placeholders(config: Any) -> bool:
+    """
+    Whether interpolating config could change any value in it.
+
+    True when some string in config (dict keys excluded, which are never
+    interpolated) contains a {placeholder}. Stray braces do not count:
+    interpolation leaves them alone. A config without placeholders comes
+    back from interpolate_config equal to itself under any context.
+    """
+    seen = set()
+    stack = [config]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            if "{" in node and _PLACEHOLDER_PATTERN.search(node):
+                return True
+        elif isinstance(node, (dict, list)) and id(node) not in seen:
+            seen.add(id(node))
+            stack.extend(node.values() if isinstance(node, dict) else node)
+    return False
+
+
+def _has_cycle(config: Union[dict[str, Any], list[Any]]) -> bool:
+    """Whether a dict/list tree contains one of its own ancestors."""
+    path = set()  # ids of the containers from the root to the current one
+    stack = [(config, False)]
+    while stack:
+        node, leaving = stack.pop()
+        if leaving:
+            path.discard(id(node))
+            continue
+        if id(node) in path:
+            return True
+        path.add(id(node))
+        stack.append((node, True))
+        children = node.values() if isinstance(node, dict) else node
+        stack.extend((c, False) for c in children if isinstance(c, (dict, list)))
+    return False
+
+
+def _interpolate_deep(
+    config: Union[dict[str, Any], list[Any]], context: dict[str, Any]
+) -> Union[dict[str, Any], list[Any]]:
+    """
+    Interpolate a subtree too deeply nested to recurse into.
+
+    Walks with an explicit stack. Each container is copied into a new one,
+    created when its parent is filled (which keeps dict order) and filled
+    when popped. Only a config that contains itself nests without end, so
+    that is ruled out first.
+    """
+    if _has_cycle(config):
+        raise ValueError("Cannot interpolate config with a circular reference")
+
+    result = {} if isinstance(config, dict) else [None] * len(config)
+    stack = [(config, result)]
+    while stack:
+        source, target = stack.pop()
+        items = source.items() if isinstance(source, dict) else enumerate(source)
+        for key, value in items:
+            if isinstance(value, str):
+                target[key] = (
+                    interpolate_value(value, context) if "{" in value else value
+                )
+            elif isinstance(value, (dict, list)):
+                child = {} if isinstance(value, dict) else [None] * len(value)
+                target[key] = child
+                stack.append((value, child))
+            else:
+                target[key] = value
+    return result
 
-            for part in parts:
-                if isinstance(obj, dict):
-                    obj = obj.get(part)
-                    if obj is None:
-                        # Path not found - keep original placeholder
-                        return match.group(0)
-                else:
-                    # Intermediate value is not a dict - keep placeholder
-                    return match.group(0)
 
-            # Successfully traversed entire path
-            return str(obj) if obj is not None else match.group(0)
+def _interpolate_container(
+    config: Union[dict[str, Any], list[Any]], context: dict[str, Any], depth: int
+) -> Union[dict[str, Any], list[Any]]:
+    """
+    Interpolate a dict or list into a new one, recursing into nested ones.
 
-        # Handle simple keys (e.g., job_id)
-        value = context.get(key)
-        if value is not None:
-            return str(value)
+    Recursion is cheaper per container than an explicit stack, and real
+    configs are shallow, so the stack walker only takes over past
+    _MAX_RECURSION_DEPTH.
+    """
+    if depth > _MAX_RECURSION_DEPTH:
+        return _interpolate_deep(config, context)
 
-        # Key not found - keep placeholder
-        return match.group(0)
+    if isinstance(config, dict):
+        interpolated = {}
+        for key, value in config.items():
+            if isinstance(value, str):
+                # Interpolate string values; literals are shared as they are
+                interpolated[key] = (
+                    interpolate_value(value, context) if "{" in value else value
+                )
+            elif isinstance(value, (dict, list)):
+                # Recursively process nested structures
+                interpolated[key] = _interpolate_container(value, context, depth + 1)
+            else:
+                # Pass through other types unchanged (int, bool, float, None, etc.)
+                interpolated[key] = value
+        return interpolated
 
-    return re.sub(pattern, replace_match, template)
+    # A plain loop measured faster here than a comprehension, or than first
+    # checking whether all items share one type, even for lists of strings
+    interpolated = []
+    for item in config:
+        if isinstance(item, str):
+            interpolated.append(
+                interpolate_value(item, context) if "{" in item else item
+            )
+        elif isinstance(item, (dict, list)):
+            interpolated.append(_interpolate_container(item, context, depth + 1))
+        else:
+            interpolated.append(item)
+    return interpolated
 
 
 def interpolate_config(
@@ -146,6 +299,8 @@ def interpolate_config(
 
     Traverses dictionaries and lists, interpolating string values while
     preserving non-string types (int, bool, float, None) unchanged.
+    Nesting depth is unlimited; a container that contains itself raises
+    ValueError.
 
     Args:
         config: Configuration to interpolate. Can be dict, list, or primitive.
@@ -153,6 +308,8 @@ def interpolate_config(
 
     Returns:
         New structure with interpolated values. Original config is not modified.
+        Every dict and list is new; other values, and strings without
+        placeholders, are shared with config.
 
     Examples:
         >>> config = {
@@ -166,43 +323,8 @@ def interpolate_config(
     if context is None:
         context = {}
 
-    # Handle None explicitly
-    if config is None:
-        return None
-
-    # Handle dictionaries recursively
-    if isinstance(config, dict):
-        interpolated = {}
-        for key, value in config.items():
-            if isinstance(value, str):
-                # Interpolate string values
-                interpolated[key] = interpolate_value(value, context)
-            elif isinstance(value, dict):
-                # Recursively process nested dicts
-                interpolated[key] = interpolate_config(value, context)
-            elif isinstance(value, list):
-                # Recursively process lists
-                interpolated[key] = interpolate_config(value, context)
-            else:
-                # Pass through other types unchanged (int, bool, float, None, etc.)
-                interpolated[key] = value
-        return interpolated
-
-    # Handle lists recursively
-    if isinstance(config, list):
-        interpolated = []
-        for item in config:
-            if isinstance(item, str):
-                # Interpolate string values
-                interpolated.append(interpolate_value(item, context))
-            elif isinstance(item, (dict, list)):
-                # Recursively process nested structures
-                interpolated.append(interpolate_config(item, context))
-            else:
-                # Pass through other types unchanged
-                interpolated.append(item)
-        return interpolated
+    # Non-containers (int, bool, float, None, objects, etc.) pass through
+    if not isinstance(config, (dict, list)):
+        return config
 
-    # For all other types (int, bool, float, None, objects, etc.)
-    # Pass through unchanged
-    return config
+    return _interpolate_container(config, context, 0)
@@ -0,0 +1,92 @@
+"""
+Compact JSON encoding for stored payloads.
+
+Event payloads and job data are serialized on every write and parsed on
+every read. When the optional orjson package is installed (the ``fast``
+extra) both directions run in its C implementation; otherwise the stdlib
+json module is used. Either way the output has compact separators, raw
+UTF-8 (no \\uXXXX escapes) and is strict JSON: NaN and Infinity become
+null, as orjson writes them, rather than the stdlib's bare NaN/Infinity
+tokens, so every stored payload passes SQLite's json_valid().
+
+The backends still differ in a few ways:
+- Float exponents are written as 1e16 by orjson and 1e+16 by the stdlib
+  (the same number either way).
+- orjson cannot encode integers wider than 64 bits; dumps falls back to
+  the stdlib encoder for values it rejects, so those still serialize.
+- orjson parses integers wider than 64 bits as floats (losing precision);
+  the stdlib parses them as int.
+
+Decode errors raise json.JSONDecodeError in both cases (orjson's error
+type subclasses it), so callers keep a single except clause.
+
+Usage:
+    from statemachine_engine.utils.json_codec import dumps, loads
+
+    text = dumps({"job_id": "123"})  # '{"job_id":"123"}'
+    datagram = dumps_bytes({"type": "wake_up"})  # b'{"type":"wake_up"}'
+    data = loads(text)
+"""
+
+import json
+import math
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # orjson is optional (pip install statemachine-engine[fast])
+    orjson = None
+
+
+def _finite(obj: Any) -> Any:
+    """Copy of obj with NaN and +/-Infinity floats replaced by None."""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {key: _finite(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(item) for item in obj]
+    return obj
+
+
+def _stdlib_dumps(obj: Any) -> str:
+    """Serialize obj with the stdlib encoder, NaN/Infinity written as null."""
+    try:
+        return json.dumps(
+            obj, separators=(",", ":"), ensure_ascii=False, allow_nan=False
+        )
+    except ValueError as e:
+        # NaN/Infinity are rare: copy them out only when one was found.
+        # Other errors (circular references) propagate as before.
+        if "not JSON compliant" not in str(e):
+            raise
+        return json.dumps(_finite(obj), separators=(",", ":"), ensure_ascii=False)
+
+
+def dumps(obj: Any) -> str:
+    """Serialize obj to a compact JSON string."""
+    if orjson is not None:
+        try:
+            # Non-str dict keys are stringified, as json.dumps does
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+        except orjson.JSONEncodeError:
+            pass  # e.g. an int wider than 64 bits: the stdlib can encode it
+    return _stdlib_dumps(obj)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Serialize obj to compact UTF-8 JSON bytes, e.g. for a socket."""
+    if orjson is not None:
+        try:
+            # orjson produces bytes already: no decode/encode round trip
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            pass  # see dumps
+    return _stdlib_dumps(obj).encode("utf-8")
+
+
+def loads(text: str | bytes) -> Any:
+    """Parse a JSON string or bytes."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
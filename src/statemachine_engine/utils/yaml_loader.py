@@ -0,0 +1,28 @@
+"""
+Safe YAML parsing for state machine configs.
+
+The engine and the config tools parse YAML through load_yaml, which uses
+PyYAML's libyaml C bindings (CSafeLoader) when PyYAML was built with them
+and the pure-Python SafeLoader otherwise. Both accept the same documents
+and build the same plain dicts, lists and scalars.
+
+Usage:
+    from statemachine_engine.utils.yaml_loader import load_yaml
+
+    with open("config/worker.yaml") as f:
+        config = load_yaml(f)
+"""
+
+from typing import IO, Any
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader  # libyaml C bindings
+except ImportError:  # pragma: no cover - PyYAML built without libyaml
+    from yaml import SafeLoader
+
+
+def load_yaml(stream: str | bytes | IO) -> Any:
+    """Parse a single YAML document with the fastest safe loader."""
+    return yaml.load(stream, Loader=SafeLoader)
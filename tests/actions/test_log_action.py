@@ -91,6 +91,23 @@ async def test_log_action_with_substitution(test_db, event_model):
     assert payload['message'] == 'Processing job job_456 in state analyzing'
 
 
+def test_log_action_payload_and_context_placeholders():
+    """Payload and context placeholders are filled; unknown ones are kept"""
+    action = LogAction({'message': 'unused'})
+    context = {
+        'step': 3,
+        'event_data': {'payload': {'file': 'a.png', 'size': 10}},
+    }
+
+    message = action._process_message(
+        '{event_data.payload.file} ({event_data.payload.size}) '
+        '{event_data.payload.missing} step {step}/{step} {unknown}',
+        context,
+    )
+
+    assert message == 'a.png (10) {event_data.payload.missing} step 3/3 {unknown}'
+
+
 @pytest.mark.asyncio
 async def test_log_action_error_level(test_db, event_model):
     """Test log action with error level"""
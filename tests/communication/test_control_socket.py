@@ -19,6 +19,9 @@ sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
 from statemachine_engine.core.engine import StateMachineEngine
 
+# Binds fixed /tmp socket paths: keep on one worker under pytest -n --dist loadgroup
+pytestmark = pytest.mark.xdist_group("fixed_socket_paths")
+
 
 class TestControlSocket:
     """Unit tests for control socket functionality"""
@@ -250,6 +253,30 @@ class TestControlSocket:
         # Cleanup
         engine._cleanup_sockets()
 
+    @pytest.mark.asyncio
+    async def test_wait_wakes_on_incoming_event(self):
+        """Test that the idle wait returns as soon as an event arrives"""
+        engine = StateMachineEngine(machine_name='test_wakeup_wait')
+        engine.config = {'metadata': {}, 'initial_state': 'waiting', 'actions': {}, 'transitions': []}
+        engine._create_control_socket()
+
+        async def send_later():
+            await asyncio.sleep(0.05)
+            client_sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            client_sock.sendto(b'{"type": "wake_up"}', '/tmp/statemachine-control-test_wakeup_wait.sock')
+            client_sock.close()
+
+        sender = asyncio.create_task(send_later())
+        start = time.monotonic()
+        await engine._wait_for_control_event(2.0)
+        elapsed = time.monotonic() - start
+        await sender
+
+        assert elapsed < 1.0
+
+        # Cleanup
+        engine._cleanup_sockets()
+
 
 class TestIntegration:
     """Integration tests for end-to-end socket communication"""
@@ -23,6 +23,9 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from statemachine_engine.core.engine import EventSocketManager, StateMachineEngine
 from statemachine_engine.database.models import Database, get_realtime_event_model
 
+# Binds fixed /tmp socket paths: keep on one worker under pytest -n --dist loadgroup
+pytestmark = pytest.mark.xdist_group("fixed_socket_paths")
+
 
 @pytest.mark.asyncio
 async def test_unix_socket_emission():
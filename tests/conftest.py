@@ -2,16 +2,23 @@
 Generic fixtures for engine tests.
 
 These fixtures provide common test infrastructure for engine components:
-- Temporary databases
+- Temporary databases (fresh_db clones a session-wide schema template)
+- A per-session default database behind get_database(), so parallel
+  pytest-xdist workers (pytest -n auto) never share a database file
 - Mock jobs and events
 - State machine configurations
 """
 
 import os
+import sqlite3
 import tempfile
+from pathlib import Path
 
 import pytest
 
+from statemachine_engine.database.models import Database
+from statemachine_engine.utils import yaml_loader
+
 
 @pytest.fixture
 def temp_db():
@@ -26,6 +33,58 @@ def temp_db():
         os.unlink(db_path)
 
 
+@pytest.fixture(scope="session", autouse=True)
+def worker_database(tmp_path_factory):
+    """Point the get_database() singleton at a per-session database.
+
+    Code under test that falls back to the default data/pipeline.db would
+    otherwise write into the checkout, shared by every xdist worker.
+    tmp_path_factory already gives each worker its own base directory.
+    """
+    from statemachine_engine.database import models
+
+    db = Database(str(tmp_path_factory.mktemp("worker") / "pipeline.db"), ephemeral=True)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(models, "_db_instance", db)
+        yield db
+
+
+@pytest.fixture(scope="session")
+def template_db_path(tmp_path_factory):
+    """Build the database schema once per session into a template file."""
+    db_path = tmp_path_factory.mktemp("template") / "template.db"
+    Database(str(db_path), ephemeral=True)
+    return db_path
+
+
+@pytest.fixture
+def fresh_db(template_db_path, tmp_path):
+    """Per-test ephemeral (no fsync) Database cloned from the template via backup()."""
+    db_path = tmp_path / "test.db"
+    src = sqlite3.connect(template_db_path)
+    dst = sqlite3.connect(db_path)
+    try:
+        src.backup(dst)
+    finally:
+        dst.close()
+        src.close()
+    return Database(str(db_path), ephemeral=True)
+
+
+@pytest.fixture(scope="session")
+def sdxl_config():
+    """config/sdxl_generator.yaml, parsed once for the whole session.
+
+    Engines take it with load_config_dict, which copies it, so tests can
+    share it. Skips the requesting test when the file is absent.
+    """
+    config_path = Path('config/sdxl_generator.yaml')
+    if not config_path.exists():
+        pytest.skip("SDXL generator config not found")
+    with open(config_path) as f:
+        return yaml_loader.load_yaml(f)
+
+
 @pytest.fixture
 def temp_working_dir():
     """Create a temporary working directory for tests."""
@@ -0,0 +1,107 @@
+"""
+Tests for string interning of loaded YAML configs.
+"""
+import sys
+
+import pytest
+import yaml
+
+from statemachine_engine.core.engine import (
+    StateMachineEngine,
+    _intern_strings,
+    _load_yaml_config,
+)
+
+
+def test_intern_strings_interns_keys_and_leaves():
+    """Dict keys and string leaves come back as interned strings."""
+    state = ''.join(['wait', 'ing'])  # built at runtime, not interned
+    config = {'initial_state': state, 'states': [state], 'timeout': 5}
+
+    result = _intern_strings(config)
+
+    assert result == config
+    assert result['initial_state'] is sys.intern('waiting')
+    assert result['states'][0] is result['initial_state']
+    assert result['timeout'] == 5
+
+
+def test_load_yaml_config_reuses_parse_until_file_changes(tmp_path, monkeypatch):
+    """One parse per file version; every caller gets its own containers."""
+    config_path = tmp_path / 'cached.yaml'
+    config_path.write_text(yaml.dump({'initial_state': 'waiting', 'states': ['waiting']}))
+    parses = []
+    real_load = yaml.load
+    monkeypatch.setattr(
+        yaml, 'load', lambda *args, **kwargs: parses.append(1) or real_load(*args, **kwargs)
+    )
+
+    first = _load_yaml_config(config_path)
+    second = _load_yaml_config(config_path)
+
+    assert len(parses) == 1
+    assert first == second
+    assert first['states'] is not second['states']
+    first['states'].append('mutated')
+    assert _load_yaml_config(config_path)['states'] == ['waiting']
+
+    config_path.write_text(yaml.dump({'initial_state': 'done'}))
+
+    assert _load_yaml_config(config_path) == {'initial_state': 'done'}
+    assert len(parses) == 2
+
+
+@pytest.mark.asyncio
+async def test_load_config_interns_state_names(tmp_path):
+    """Repeated state names in a loaded config share one object."""
+    config_path = tmp_path / 'interned.yaml'
+    config_path.write_text(yaml.dump({
+        'metadata': {'machine_name': 'intern_test'},
+        'initial_state': 'waiting',
+        'transitions': [
+            {'from': 'waiting', 'to': 'done', 'event': 'go'},
+            {'from': 'done', 'to': 'waiting', 'event': 'reset'},
+        ],
+    }))
+
+    engine = StateMachineEngine(
+        machine_name='intern_test', control_socket_prefix=str(tmp_path / 'ctl')
+    )
+    await engine.load_config(str(config_path))
+    try:
+        transitions = engine.config['transitions']
+        assert transitions[0]['from'] is transitions[1]['to']
+        assert engine.current_state is transitions[0]['from']
+    finally:
+        engine._cleanup_sockets()
+
+
+@pytest.mark.asyncio
+async def test_load_config_dict_uses_its_own_copy(tmp_path):
+    """Engines loaded from one parsed dict do not share its containers."""
+    config = {
+        'metadata': {'machine_name': 'shared'},
+        'initial_state': 'waiting',
+        'transitions': [{'from': 'waiting', 'to': 'done', 'event': 'go'}],
+    }
+
+    engines = [
+        StateMachineEngine(
+            machine_name=f'shared_{i}', control_socket_prefix=str(tmp_path / f'ctl{i}')
+        )
+        for i in range(2)
+    ]
+    try:
+        for engine in engines:
+            await engine.load_config_dict(config, 'shared')
+
+        first, second = engines
+        assert first.config == config
+        assert first.config_name == 'shared'
+        assert first.current_state == 'waiting'
+        first.config['transitions'].append({'from': 'done', 'to': 'waiting', 'event': 'reset'})
+        assert len(second.config['transitions']) == 1
+        assert len(config['transitions']) == 1
+    finally:
+        for engine in engines:
+            engine._cleanup_sockets()
@@ -315,3 +315,53 @@ def test_context_propagation_from_custom_action(engine):
     # Placeholders should NOT appear in the result
     assert '{id}' not in result['message']
     assert '{pony_prompt}' not in result['message']
+
+
+@pytest.mark.asyncio
+async def test_action_without_placeholders_skips_interpolation(engine, monkeypatch):
+    """Only actions with placeholders are walked by interpolate_config"""
+    from statemachine_engine.core import engine as engine_module
+
+    walked = []
+    real_interpolate = engine_module.interpolate_config
+    monkeypatch.setattr(
+        engine_module, 'interpolate_config',
+        lambda config, context: walked.append(config) or real_interpolate(config, context)
+    )
+    static = {'type': 'log', 'message': 'Waiting for {"queue": 1}'}
+    dynamic = {'type': 'log', 'message': 'Processing {job_id}'}
+    engine.context = {'job_id': 'test_123'}
+
+    for _ in range(2):
+        await engine._execute_action(static)
+        await engine._execute_action(dynamic)
+
+    assert walked == [dynamic, dynamic]
+    assert engine._log_count == {'Waiting for {"queue": 1}': 2, 'Processing test_123': 2}
+
+
+@pytest.mark.asyncio
+async def test_action_without_placeholders_gets_its_own_containers(engine, monkeypatch):
+    """A placeholder-free action can mutate nested config values without
+    that reaching the engine's config or later runs"""
+    from statemachine_engine.core import engine as engine_module
+
+    action = {'type': 'log', 'message': 'static', 'value': {'items': [{'k': 1}]}}
+    received = []
+    real_copy = engine_module._copy_containers
+
+    def recording_copy(config):
+        copied = real_copy(config)
+        if config is action:
+            received.append(copied)
+        return copied
+
+    monkeypatch.setattr(engine_module, '_copy_containers', recording_copy)
+
+    await engine._execute_action(action)
+    received[0]['value']['items'][0]['k'] = 99
+    received[0]['value']['items'].append('more')
+    await engine._execute_action(action)
+
+    assert action == {'type': 'log', 'message': 'static', 'value': {'items': [{'k': 1}]}}
+    assert received[1] == action
@@ -12,29 +12,45 @@ import pytest
 from statemachine_engine.core.engine import StateMachineEngine
 
 
-@pytest.mark.asyncio
-async def test_json_string_payload_auto_parsed():
-    """JSON string payloads are automatically parsed to dict"""
+def _encode(event):
+    """Wire format returned by the mocked control socket's recvfrom()."""
+    return (json.dumps(event).encode('utf-8'), None)
+
+
+@pytest.fixture(scope='module')
+def shared_engine():
+    """One engine per module; tests reset its mutable state via `engine`."""
     engine = StateMachineEngine('test_machine')
+    yield engine
+    if engine.event_socket.sock:
+        engine.event_socket.sock.close()
+
 
-    # Mock the config
-    engine.config = {
+@pytest.fixture
+def engine(shared_engine):
+    """Shared engine reset to a minimal config with a mocked control socket."""
+    shared_engine.config = {
         'initial_state': 'waiting',
         'transitions': [],
         'actions': {}
     }
-    engine.current_state = 'waiting'
+    shared_engine.current_state = 'waiting'
+    shared_engine.context.clear()
+    shared_engine.control_socket = MagicMock()
+    return shared_engine
+
 
-    # Create a socket mock
-    mock_socket = MagicMock()
-    engine.control_socket = mock_socket
+@pytest.mark.asyncio
+async def test_json_string_payload_auto_parsed(engine):
+    """JSON string payloads are automatically parsed to dict"""
+    mock_socket = engine.control_socket
 
     # Simulate receiving event with JSON string payload
     test_event = {
         'type': 'test_event',
         'payload': '{"key": "value", "number": 42, "nested": {"field": "data"}}'
     }
-    mock_socket.recvfrom.return_value = (json.dumps(test_event).encode('utf-8'), None)
+    mock_socket.recvfrom.return_value = _encode(test_event)
 
     # Call the method
     await engine._check_control_socket()
@@ -49,55 +65,33 @@ async def test_json_string_payload_auto_parsed():
 
 
 @pytest.mark.asyncio
-async def test_dict_payload_unchanged():
-    """Dict payloads pass through without modification"""
-    engine = StateMachineEngine('test_machine')
-
-    engine.config = {
-        'initial_state': 'waiting',
-        'transitions': [],
-        'actions': {}
-    }
-    engine.current_state = 'waiting'
-
-    mock_socket = MagicMock()
-    engine.control_socket = mock_socket
-
-    # Already a dict - should remain unchanged
-    test_event = {
-        'type': 'test_event',
-        'payload': {'key': 'value', 'number': 42}
-    }
-    mock_socket.recvfrom.return_value = (json.dumps(test_event).encode('utf-8'), None)
+@pytest.mark.parametrize('payload,expected', [
+    ({'key': 'value', 'number': 42}, {'key': 'value', 'number': 42}),  # dict unchanged
+    ('', {}),  # empty string becomes empty dict
+    ('   \n  ', {}),  # whitespace-only becomes empty dict
+])
+async def test_payload_shapes(engine, payload, expected):
+    """Dict payloads pass through; blank string payloads become empty dicts"""
+    engine.control_socket.recvfrom.return_value = _encode({'type': 'test_event', 'payload': payload})
 
     await engine._check_control_socket()
 
     stored_event = engine.context.get('event_data')
     assert isinstance(stored_event['payload'], dict)
-    assert stored_event['payload'] == {'key': 'value', 'number': 42}
+    assert stored_event['payload'] == expected
 
 
 @pytest.mark.asyncio
-async def test_invalid_json_fallback_to_empty_dict(caplog):
+async def test_invalid_json_fallback_to_empty_dict(engine, caplog):
     """Invalid JSON logs warning and uses empty dict"""
-    engine = StateMachineEngine('test_machine')
-
-    engine.config = {
-        'initial_state': 'waiting',
-        'transitions': [],
-        'actions': {}
-    }
-    engine.current_state = 'waiting'
-
-    mock_socket = MagicMock()
-    engine.control_socket = mock_socket
+    mock_socket = engine.control_socket
 
     # Invalid JSON string
     test_event = {
         'type': 'test_event',
         'payload': '{invalid json here}'
     }
-    mock_socket.recvfrom.return_value = (json.dumps(test_event).encode('utf-8'), None)
+    mock_socket.recvfrom.return_value = _encode(test_event)
 
     await engine._check_control_socket()
 
@@ -109,80 +103,16 @@ async def test_invalid_json_fallback_to_empty_dict(caplog):
 
 
 @pytest.mark.asyncio
-async def test_empty_string_payload():
-    """Empty string payload becomes empty dict"""
-    engine = StateMachineEngine('test_machine')
-
-    engine.config = {
-        'initial_state': 'waiting',
-        'transitions': [],
-        'actions': {}
-    }
-    engine.current_state = 'waiting'
-
-    mock_socket = MagicMock()
-    engine.control_socket = mock_socket
-
-    test_event = {
-        'type': 'test_event',
-        'payload': ''
-    }
-    mock_socket.recvfrom.return_value = (json.dumps(test_event).encode('utf-8'), None)
-
-    await engine._check_control_socket()
-
-    stored_event = engine.context.get('event_data')
-    assert stored_event['payload'] == {}
-
-
-@pytest.mark.asyncio
-async def test_whitespace_payload():
-    """Whitespace-only payload becomes empty dict"""
-    engine = StateMachineEngine('test_machine')
-
-    engine.config = {
-        'initial_state': 'waiting',
-        'transitions': [],
-        'actions': {}
-    }
-    engine.current_state = 'waiting'
-
-    mock_socket = MagicMock()
-    engine.control_socket = mock_socket
-
-    test_event = {
-        'type': 'test_event',
-        'payload': '   \n  '
-    }
-    mock_socket.recvfrom.return_value = (json.dumps(test_event).encode('utf-8'), None)
-
-    await engine._check_control_socket()
-
-    stored_event = engine.context.get('event_data')
-    assert stored_event['payload'] == {}
-
-
-@pytest.mark.asyncio
-async def test_nested_json_not_recursively_parsed():
+async def test_nested_json_not_recursively_parsed(engine):
     """Nested JSON strings are not recursively parsed"""
-    engine = StateMachineEngine('test_machine')
-
-    engine.config = {
-        'initial_state': 'waiting',
-        'transitions': [],
-        'actions': {}
-    }
-    engine.current_state = 'waiting'
-
-    mock_socket = MagicMock()
-    engine.control_socket = mock_socket
+    mock_socket = engine.control_socket
 
     # Outer JSON with inner JSON as escaped string
     test_event = {
         'type': 'test_event',
         'payload': '{"inner": "{\\"nested\\": \\"value\\"}"}'
     }
-    mock_socket.recvfrom.return_value = (json.dumps(test_event).encode('utf-8'), None)
+    mock_socket.recvfrom.return_value = _encode(test_event)
 
     await engine._check_control_socket()
 
@@ -193,25 +123,15 @@ async def test_nested_json_not_recursively_parsed():
 
 
 @pytest.mark.asyncio
-async def test_missing_payload_field():
+async def test_missing_payload_field(engine):
     """Events without payload field don't cause errors"""
-    engine = StateMachineEngine('test_machine')
-
-    engine.config = {
-        'initial_state': 'waiting',
-        'transitions': [],
-        'actions': {}
-    }
-    engine.current_state = 'waiting'
-
-    mock_socket = MagicMock()
-    engine.control_socket = mock_socket
+    mock_socket = engine.control_socket
 
     # No payload field
     test_event = {
         'type': 'test_event'
     }
-    mock_socket.recvfrom.return_value = (json.dumps(test_event).encode('utf-8'), None)
+    mock_socket.recvfrom.return_value = _encode(test_event)
 
     await engine._check_control_socket()
 
@@ -221,25 +141,15 @@ async def test_missing_payload_field():
 
 
 @pytest.mark.asyncio
-async def test_null_payload():
+async def test_null_payload(engine):
     """Null payload is handled gracefully"""
-    engine = StateMachineEngine('test_machine')
-
-    engine.config = {
-        'initial_state': 'waiting',
-        'transitions': [],
-        'actions': {}
-    }
-    engine.current_state = 'waiting'
-
-    mock_socket = MagicMock()
-    engine.control_socket = mock_socket
+    mock_socket = engine.control_socket
 
     test_event = {
         'type': 'test_event',
         'payload': None
     }
-    mock_socket.recvfrom.return_value = (json.dumps(test_event).encode('utf-8'), None)
+    mock_socket.recvfrom.return_value = _encode(test_event)
 
     await engine._check_control_socket()
 
@@ -249,19 +159,9 @@ async def test_null_payload():
 
 
 @pytest.mark.asyncio
-async def test_large_payload_parsing(caplog):
+async def test_large_payload_parsing(engine, caplog):
     """Large payloads (100KB) parse successfully"""
-    engine = StateMachineEngine('test_machine')
-
-    engine.config = {
-        'initial_state': 'waiting',
-        'transitions': [],
-        'actions': {}
-    }
-    engine.current_state = 'waiting'
-
-    mock_socket = MagicMock()
-    engine.control_socket = mock_socket
+    mock_socket = engine.control_socket
 
     # Create large payload
     large_data = 'x' * 100000
@@ -269,7 +169,7 @@ async def test_large_payload_parsing(caplog):
         'type': 'test_event',
         'payload': json.dumps({'data': large_data})
     }
-    mock_socket.recvfrom.return_value = (json.dumps(test_event).encode('utf-8'), None)
+    mock_socket.recvfrom.return_value = _encode(test_event)
 
     await engine._check_control_socket()
 
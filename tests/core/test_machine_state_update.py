@@ -0,0 +1,37 @@
+"""
+Tests for the engine's machine_state upkeep on state changes.
+"""
+from unittest.mock import patch
+
+from statemachine_engine.core.engine import StateMachineEngine
+from statemachine_engine.database.models.job import JobModel
+
+
+def _machine_state_row(db, machine_name):
+    with db._get_connection() as conn:
+        return conn.execute(
+            "SELECT current_state, config_type FROM machine_state WHERE machine_name = ?",
+            (machine_name,),
+        ).fetchone()
+
+
+def test_update_machine_state_registers_once(fresh_db, tmp_path):
+    """The first state write inserts the row and registers; later ones update it."""
+    engine = StateMachineEngine(
+        machine_name='state_writer', control_socket_prefix=str(tmp_path / 'ctl')
+    )
+    engine.config_name = 'writer'
+    engine.context['job_model'] = JobModel(fresh_db)
+
+    with patch.object(engine, '_emit_realtime_event') as emit:
+        try:
+            engine._update_machine_state('waiting')
+            engine._update_machine_state('processing')
+            engine._update_machine_state('done')
+        finally:
+            engine._cleanup_sockets()
+
+    registered = [c for c in emit.call_args_list if c.args[0] == 'machine_registered']
+    assert len(registered) == 1
+    assert registered[0].args[1]['current_state'] == 'waiting'
+    assert tuple(_machine_state_row(fresh_db, 'state_writer')) == ('done', 'writer')
@@ -6,15 +6,11 @@ import time
 
 import pytest
 
-from statemachine_engine.database.models.base import Database
-
 
 @pytest.fixture
-def test_db(tmp_path):
+def test_db(fresh_db):
     """Create a test database"""
-    db_path = tmp_path / "test.db"
-    db = Database(str(db_path))
-    return db
+    return fresh_db
 
 
 @pytest.fixture
@@ -28,69 +24,49 @@ def realtime_model(test_db):
 def setup_transition_data(realtime_model):
     """Setup test data for transition history"""
     # Log several state transitions
-    realtime_model.log_event(
-        'worker1',
-        'state_change',
-        {
+    realtime_model.log_events_bulk([
+        ('worker1', 'state_change', {
             'from_state': 'idle',
             'to_state': 'processing',
             'event_trigger': 'start_job',
             'timestamp': time.time()
-        }
-    )
-    realtime_model.log_event(
-        'worker1',
-        'state_change',
-        {
+        }),
+        ('worker1', 'state_change', {
             'from_state': 'processing',
             'to_state': 'completed',
             'event_trigger': 'job_done',
             'timestamp': time.time()
-        }
-    )
-    realtime_model.log_event(
-        'worker2',
-        'state_change',
-        {
+        }),
+        ('worker2', 'state_change', {
             'from_state': 'idle',
             'to_state': 'error',
             'event_trigger': 'error',
             'timestamp': time.time()
-        }
-    )
+        }),
+    ])
 
 
 @pytest.fixture
 def setup_error_data(realtime_model):
     """Setup test data for error history"""
     # Log several errors
-    realtime_model.log_event(
-        'worker1',
-        'error',
-        {
+    realtime_model.log_events_bulk([
+        ('worker1', 'error', {
             'error_message': 'Connection timeout',
             'job_id': 'job_123',
             'timestamp': time.time()
-        }
-    )
-    realtime_model.log_event(
-        'worker2',
-        'error',
-        {
+        }),
+        ('worker2', 'error', {
             'error_message': 'Action not found',
             'job_id': 'job_456',
             'timestamp': time.time()
-        }
-    )
-    realtime_model.log_event(
-        'worker1',
-        'error',
-        {
+        }),
+        ('worker1', 'error', {
             'error_message': 'Database error',
             'job_id': None,
             'timestamp': time.time()
-        }
-    )
+        }),
+    ])
 
 
 def test_transition_history_all_machines(test_db, setup_transition_data):
@@ -207,9 +183,9 @@ def test_transition_history_time_filter(test_db, realtime_model):
     with test_db._get_connection() as conn:
         conn.execute("""
             UPDATE realtime_events
-            SET created_at = strftime('%s', datetime('now', '-25 hours'))
+            SET created_at = ?
             WHERE id = ?
-        """, (event_id,))
+        """, (int(time.time()) - 25 * 3600, event_id))
         conn.commit()
 
     # Create recent transition
@@ -219,16 +195,38 @@ def test_transition_history_time_filter(test_db, realtime_model):
         {'from_state': 'x', 'to_state': 'y', 'event_trigger': 'e', 'timestamp': time.time()}
     )
 
-    # Query last 24 hours
+    # Query last 24 hours with an integer epoch cutoff
     with test_db._get_connection() as conn:
         rows = conn.execute("""
-            SELECT machine_name FROM realtime_events
+            SELECT machine_name, typeof(created_at) AS created_type FROM realtime_events
             WHERE event_type = 'state_change'
-            AND created_at > strftime('%s', datetime('now', '-24 hours'))
-        """).fetchall()
+            AND created_at > ?
+        """, (int(time.time()) - 24 * 3600,)).fetchall()
 
     assert len(rows) == 1
     assert rows[0]['machine_name'] == 'new_worker'
+    assert rows[0]['created_type'] == 'integer'
+
+
+def test_error_history_command_hours_filter(test_db, realtime_model, capsys):
+    """error-history --hours keeps only events newer than the cutoff"""
+    from unittest.mock import MagicMock, patch
+
+    from statemachine_engine.database.cli import cmd_error_history
+
+    old_id = realtime_model.log_event('w1', 'error', {'error_message': 'old'})
+    realtime_model.log_event('w1', 'error', {'error_message': 'new'})
+    with test_db._get_connection() as conn:
+        conn.execute("UPDATE realtime_events SET created_at = created_at - 2 * 3600 WHERE id = ?", (old_id,))
+        conn.commit()
+
+    args = MagicMock(machine=None, hours=1, limit=10, format='json')
+    with patch('statemachine_engine.database.cli.get_realtime_event_model', return_value=realtime_model):
+        cmd_error_history(args)
+
+    errors = json.loads(capsys.readouterr().out)
+    assert [e['error_message'] for e in errors] == ['new']
+    assert errors[0]['timestamp']  # epoch renders via datetime(..., 'unixepoch')
 
 
 def test_no_transitions_found(test_db):
@@ -256,10 +254,13 @@ def test_no_errors_found(test_db):
 def test_mixed_event_types(test_db, realtime_model):
     """Test that queries correctly filter by event_type"""
     # Log different event types
-    realtime_model.log_event('m1', 'state_change', {'from_state': 'a', 'to_state': 'b', 'event_trigger': 'e', 'timestamp': time.time()})
-    realtime_model.log_event('m1', 'error', {'error_message': 'test', 'timestamp': time.time()})
-    realtime_model.log_event('m1', 'job_started', {'job_id': '123', 'timestamp': time.time()})
-    realtime_model.log_event('m1', 'state_change', {'from_state': 'b', 'to_state': 'c', 'event_trigger': 'e2', 'timestamp': time.time()})
+    inserted = realtime_model.log_events_bulk([
+        ('m1', 'state_change', {'from_state': 'a', 'to_state': 'b', 'event_trigger': 'e', 'timestamp': time.time()}),
+        ('m1', 'error', {'error_message': 'test', 'timestamp': time.time()}),
+        ('m1', 'job_started', {'job_id': '123', 'timestamp': time.time()}),
+        ('m1', 'state_change', {'from_state': 'b', 'to_state': 'c', 'event_trigger': 'e2', 'timestamp': time.time()}),
+    ])
+    assert inserted == 4
 
     # Query only state_change
     with test_db._get_connection() as conn:
@@ -292,3 +293,113 @@ def test_transition_with_invalid_payload_structure(test_db):
     events = model.get_unconsumed_events()
     assert len(events) == 1
     assert events[0]['payload'].get('from_state') is None
+
+
+@pytest.mark.parametrize('query,params', [
+    ("WHERE event_type = 'state_change' ORDER BY created_at DESC LIMIT 10", ()),
+    ("WHERE event_type = 'error' AND machine_name = ? ORDER BY created_at DESC LIMIT 10", ('worker1',)),
+])
+def test_history_queries_use_index_without_sort(test_db, query, params):
+    """History queries are served by an index instead of a temp B-tree sort"""
+    with test_db._get_connection() as conn:
+        plan = conn.execute(
+            f"EXPLAIN QUERY PLAN SELECT id, machine_name, payload FROM realtime_events {query}",
+            params,
+        ).fetchall()
+
+    details = ' '.join(row['detail'] for row in plan)
+    assert 'USING INDEX idx_realtime_type_' in details
+    assert 'TEMP B-TREE' not in details
+
+
+def test_event_type_listing_uses_covering_index(test_db):
+    """Listings without payload are answered from the index alone"""
+    with test_db._get_connection() as conn:
+        plan = conn.execute("""
+            EXPLAIN QUERY PLAN
+            SELECT id, machine_name, created_at FROM realtime_events
+            WHERE event_type = ? ORDER BY created_at DESC
+        """, ('state_change',)).fetchall()
+
+    details = ' '.join(row['detail'] for row in plan)
+    assert 'USING COVERING INDEX idx_realtime_type_covering' in details
+    assert 'TEMP B-TREE' not in details
+
+
+def test_hot_payload_fields_stored_in_typed_columns(test_db, setup_transition_data, setup_error_data):
+    """Hot payload fields are mirrored into typed columns at insert time"""
+    with test_db._get_connection() as conn:
+        transition = conn.execute("""
+            SELECT from_state, to_state, event_trigger FROM realtime_events
+            WHERE event_type = 'state_change' AND machine_name = 'worker2'
+        """).fetchone()
+        error = conn.execute("""
+            SELECT error_message FROM realtime_events
+            WHERE event_type = 'error' AND job_id = ?
+        """, ('job_456',)).fetchone()
+
+    assert tuple(transition) == ('idle', 'error', 'error')
+    assert error['error_message'] == 'Action not found'
+
+
+def test_transition_history_command_reads_typed_and_legacy_rows(test_db, realtime_model, capsys):
+    """transition-history renders typed-column rows and pre-migration JSON-only rows"""
+    from unittest.mock import MagicMock, patch
+
+    from statemachine_engine.database.cli import cmd_transition_history
+
+    with test_db.transaction() as conn:
+        realtime_model.log_event('typed', 'state_change', {'from_state': 'a', 'to_state': 'b', 'event_trigger': 'go'}, conn=conn)
+        conn.execute("""
+            INSERT INTO realtime_events (machine_name, event_type, payload)
+            VALUES (?, ?, ?)
+        """, ('legacy', 'state_change', json.dumps({'from_state': 'x', 'to_state': 'y', 'event_trigger': 'old'})))
+
+    args = MagicMock(machine=None, hours=None, limit=10, format='json')
+    with patch('statemachine_engine.database.cli.get_realtime_event_model', return_value=realtime_model):
+        cmd_transition_history(args)
+
+    transitions = {t['machine']: t for t in json.loads(capsys.readouterr().out)}
+    assert (transitions['typed']['from_state'], transitions['typed']['event']) == ('a', 'go')
+    assert (transitions['legacy']['to_state'], transitions['legacy']['event']) == ('y', 'old')
+
+
+def test_error_history_command_streams_json_array(test_db, realtime_model, setup_error_data, capsys):
+    """error-history streams rows in batches with the same layout as json.dumps(indent=2)"""
+    from unittest.mock import MagicMock, patch
+
+    from statemachine_engine.database.cli import cmd_error_history
+
+    args = MagicMock(machine=None, hours=None, limit=10, format='json')
+    with patch('statemachine_engine.database.cli.HISTORY_FETCH_SIZE', 2), \
+            patch('statemachine_engine.database.cli.get_realtime_event_model', return_value=realtime_model):
+        cmd_error_history(args)
+
+    out = capsys.readouterr().out
+    errors = json.loads(out)
+    assert out == json.dumps(errors, indent=2) + '\n'
+    assert sorted(e['error_message'] for e in errors) == ['Action not found', 'Connection timeout', 'Database error']
+
+
+def test_error_history_json_keeps_payload_types(test_db, realtime_model, capsys):
+    """JSON output reports job_id as logged; only the table shows N/A"""
+    from unittest.mock import MagicMock, patch
+
+    from statemachine_engine.database.cli import cmd_error_history
+
+    realtime_model.log_events_bulk([
+        ('numeric', 'error', {'error_message': 'boom', 'job_id': 42}),
+        ('null', 'error', {'error_message': 'boom', 'job_id': None}),
+    ])
+
+    with patch('statemachine_engine.database.cli.get_realtime_event_model', return_value=realtime_model):
+        cmd_error_history(MagicMock(machine=None, hours=None, limit=10, format='json'))
+        errors = {e['machine']: e for e in json.loads(capsys.readouterr().out)}
+
+        cmd_error_history(MagicMock(machine=None, hours=None, limit=10, format='table'))
+        table = capsys.readouterr().out
+
+    assert errors['numeric']['job_id'] == 42
+    assert errors['null']['job_id'] is None
+    null_row = next(line for line in table.splitlines() if '| null' in line)
+    assert 'N/A' in null_row
@@ -4,7 +4,6 @@ Tests for send-event CLI command with real-time Unix socket delivery
 import json
 import socket
 import sys
-import tempfile
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -13,12 +12,22 @@ import pytest
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
 
+from statemachine_engine.database import cli
 from statemachine_engine.database.cli import cmd_send_event
 
 
 class TestSendEventRealtimeSocket:
     """Test send-event command's real-time Unix socket functionality"""
 
+    @pytest.fixture(autouse=True)
+    def reset_cached_socket(self):
+        """Drop the cached DGRAM socket so socket.socket patches apply per test"""
+        cli._dgram_sock = None
+        yield
+        if cli._dgram_sock is not None:
+            cli._dgram_sock.close()
+        cli._dgram_sock = None
+
     @pytest.fixture
     def mock_event_model(self):
         """Mock the machine event model"""
@@ -28,27 +37,39 @@ class TestSendEventRealtimeSocket:
             mock.return_value = model
             yield model
 
+    @pytest.fixture(autouse=True)
+    def socket_paths(self, tmp_path, monkeypatch):
+        """Point the CLI at socket paths under tmp_path instead of /tmp"""
+        ws_path = tmp_path / 'events.sock'
+        control_template = str(tmp_path / 'control-{machine}.sock')
+        monkeypatch.setattr(cli, 'WEBSOCKET_SOCKET_PATH', str(ws_path))
+        monkeypatch.setattr(cli, 'CONTROL_SOCKET_PATH', control_template)
+        return ws_path, control_template
+
     @pytest.fixture
-    def temp_socket(self):
-        """Create a temporary Unix socket to receive messages"""
-        # Use temp directory instead of /tmp for tests
-        with tempfile.TemporaryDirectory() as tmpdir:
-            socket_path = Path(tmpdir) / 'test-events.sock'
+    def bind_listener(self):
+        """Bind real Unix DGRAM listeners; returns a factory taking a path"""
+        listeners = []
 
-            # Create listening socket
+        def bind(path):
             sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
-            sock.bind(str(socket_path))
-            sock.settimeout(1.0)  # 1 second timeout
-
-            yield sock, socket_path
+            sock.bind(str(path))
+            sock.settimeout(1.0)
+            listeners.append(sock)
+            return sock
 
+        yield bind
+        for sock in listeners:
             sock.close()
-            if socket_path.exists():
-                socket_path.unlink()
 
-    def test_send_to_websocket_socket(self, mock_event_model, temp_socket, capsys):
+    @staticmethod
+    def _receive(listener):
+        """Read one datagram and decode the JSON envelope"""
+        return json.loads(listener.recv(65536).decode('utf-8'))
+
+    def test_send_to_websocket_socket(self, mock_event_model, socket_paths, bind_listener, capsys):
         """Test that send-event sends to WebSocket server's Unix socket"""
-        listener, socket_path = temp_socket
+        listener = bind_listener(socket_paths[0])
 
         # Create args
         args = MagicMock()
@@ -58,29 +79,21 @@ class TestSendEventRealtimeSocket:
         args.job_id = None
         args.payload = '{"message": "test message"}'
 
-        # Mock the socket operations to succeed
-        with patch('socket.socket') as mock_socket:
-            sock_instance = MagicMock()
-            mock_socket.return_value = sock_instance
-
-            # Mock WebSocket socket path exists
-            with patch('statemachine_engine.database.cli.Path') as mock_path:
-                mock_path_instance = MagicMock()
-                mock_path_instance.exists.return_value = True
-                mock_path.return_value = mock_path_instance
-
-                # Call the command
-                result = cmd_send_event(args)
+        # Call the command
+        result = cmd_send_event(args)
 
-                # Should succeed
-                assert result == 0
+        # Should succeed
+        assert result == 0
+        sent = self._receive(listener)
+        assert sent['machine_name'] == 'test_machine'
+        assert sent['type'] == 'activity_log'
 
-                # Check output
-                captured = capsys.readouterr()
-                assert '📡 Sent to WebSocket server for real-time UI update' in captured.out
-                assert '✅ Event sent successfully!' in captured.out
+        # Check output
+        captured = capsys.readouterr()
+        assert '📡 Sent to WebSocket server for real-time UI update' in captured.out
+        assert '✅ Event sent successfully!' in captured.out
 
-    def test_websocket_socket_not_available(self, mock_event_model, capsys):
+    def test_websocket_socket_not_available(self, mock_event_model, socket_paths, capsys):
         """Test graceful handling when WebSocket socket doesn't exist"""
         args = MagicMock()
         args.target = 'ui'
@@ -95,12 +108,18 @@ class TestSendEventRealtimeSocket:
         # Should succeed (database write still works)
         assert result == 0
 
-        # Check output
+        # Check output: a missing socket is skipped quietly
         captured = capsys.readouterr()
         assert '✅ Event sent successfully!' in captured.out
+        assert '📡' not in captured.out
+        assert '⚠️' not in captured.out
 
-    def test_sends_to_both_sockets_for_non_ui_target(self, mock_event_model, capsys):
+    def test_sends_to_both_sockets_for_non_ui_target(self, mock_event_model, socket_paths, bind_listener, capsys):
         """Test that non-UI targets get sent to both WebSocket and control sockets"""
+        ws_path, control_template = socket_paths
+        ws_listener = bind_listener(ws_path)
+        control_listener = bind_listener(control_template.format(machine='my_machine'))
+
         args = MagicMock()
         args.target = 'my_machine'
         args.type = 'custom_event'
@@ -108,25 +127,26 @@ class TestSendEventRealtimeSocket:
         args.job_id = 'job123'
         args.payload = '{"data": "value"}'
 
-        # Mock both socket paths existing
-        with patch('statemachine_engine.database.cli.Path') as mock_path:
-            mock_path_instance = MagicMock()
-            mock_path_instance.exists.return_value = True
-            mock_path.return_value = mock_path_instance
-
-            # Mock socket sends
-            with patch('socket.socket') as mock_socket:
-                sock_instance = MagicMock()
-                mock_socket.return_value = sock_instance
-
-                result = cmd_send_event(args)
+        result = cmd_send_event(args)
 
-                assert result == 0
+        assert result == 0
 
-                # Check output mentions both socket types
-                captured = capsys.readouterr()
-                assert '📡 Sent to WebSocket server for real-time UI update' in captured.out
-                assert '📡 Sent to my_machine control socket' in captured.out
+        # Check output mentions both socket types
+        captured = capsys.readouterr()
+        assert '📡 Sent to WebSocket server for real-time UI update' in captured.out
+        assert '📡 Sent to my_machine control socket' in captured.out
+
+        # Each socket receives exactly the keys its reader uses
+        assert self._receive(ws_listener) == {
+            'machine_name': 'cli',
+            'type': 'custom_event',
+            'payload': {'data': 'value'},
+        }
+        assert self._receive(control_listener) == {
+            'type': 'custom_event',
+            'payload': {'data': 'value'},
+            'job_id': 'job123',
+        }
 
     def test_ui_target_skips_control_socket(self, mock_event_model, capsys):
         """Test that UI target doesn't attempt control socket send"""
@@ -145,8 +165,10 @@ class TestSendEventRealtimeSocket:
         captured = capsys.readouterr()
         assert 'control socket' not in captured.out
 
-    def test_json_payload_parsing(self, mock_event_model, capsys):
+    def test_json_payload_parsing(self, mock_event_model, socket_paths, bind_listener, capsys):
         """Test that JSON payload is parsed correctly"""
+        listener = bind_listener(socket_paths[0])
+
         args = MagicMock()
         args.target = 'ui'
         args.type = 'activity_log'
@@ -154,27 +176,15 @@ class TestSendEventRealtimeSocket:
         args.job_id = None
         args.payload = '{"message": "test", "level": "INFO", "nested": {"key": "value"}}'
 
-        with patch('socket.socket') as mock_socket:
-            sock_instance = MagicMock()
-            mock_socket.return_value = sock_instance
-
-            # Mock WebSocket socket path exists
-            with patch('statemachine_engine.database.cli.Path') as mock_path:
-                mock_path_instance = MagicMock()
-                mock_path_instance.exists.return_value = True
-                mock_path.return_value = mock_path_instance
-
-                result = cmd_send_event(args)
+        result = cmd_send_event(args)
 
-                assert result == 0
+        assert result == 0
 
-                # Verify socket was called with parsed JSON
-                if sock_instance.sendto.called:
-                    call_args = sock_instance.sendto.call_args[0]
-                    sent_data = json.loads(call_args[0].decode('utf-8'))
-                    assert sent_data['payload']['message'] == 'test'
-                    assert sent_data['payload']['level'] == 'INFO'
-                    assert sent_data['payload']['nested']['key'] == 'value'
+        # Verify the datagram carries the parsed JSON
+        sent_data = self._receive(listener)
+        assert sent_data['payload']['message'] == 'test'
+        assert sent_data['payload']['level'] == 'INFO'
+        assert sent_data['payload']['nested']['key'] == 'value'
 
     def test_invalid_json_payload_handled_gracefully(self, mock_event_model, capsys):
         """Test that invalid JSON payload doesn't crash the command"""
@@ -190,8 +200,10 @@ class TestSendEventRealtimeSocket:
 
         assert result == 0
 
-    def test_source_defaults_to_cli(self, mock_event_model, capsys):
+    def test_source_defaults_to_cli(self, mock_event_model, socket_paths, bind_listener, capsys):
         """Test that source defaults to 'cli' when not provided"""
+        listener = bind_listener(socket_paths[0])
+
         args = MagicMock()
         args.target = 'ui'
         args.type = 'activity_log'
@@ -199,27 +211,18 @@ class TestSendEventRealtimeSocket:
         args.job_id = None
         args.payload = '{"message": "test"}'
 
-        with patch('socket.socket') as mock_socket:
-            sock_instance = MagicMock()
-            mock_socket.return_value = sock_instance
-
-            with patch('statemachine_engine.database.cli.Path') as mock_path:
-                mock_path_instance = MagicMock()
-                mock_path_instance.exists.return_value = True
-                mock_path.return_value = mock_path_instance
-
-                result = cmd_send_event(args)
+        result = cmd_send_event(args)
 
-                assert result == 0
+        assert result == 0
 
-                # Verify 'cli' was used as machine_name
-                if sock_instance.sendto.called:
-                    call_args = sock_instance.sendto.call_args[0]
-                    sent_data = json.loads(call_args[0].decode('utf-8'))
-                    assert sent_data['machine_name'] == 'cli'
+        # Verify 'cli' was used as machine_name
+        assert self._receive(listener)['machine_name'] == 'cli'
 
-    def test_socket_error_doesnt_fail_command(self, mock_event_model, capsys):
+    def test_socket_error_doesnt_fail_command(self, mock_event_model, socket_paths, bind_listener, capsys):
         """Test that socket errors are caught and don't fail the command"""
+        # Socket file left behind by a stopped server: sendto is refused
+        bind_listener(socket_paths[0]).close()
+
         args = MagicMock()
         args.target = 'ui'
         args.type = 'activity_log'
@@ -227,17 +230,95 @@ class TestSendEventRealtimeSocket:
         args.job_id = None
         args.payload = '{"message": "test"}'
 
-        with patch('socket.socket') as mock_socket:
-            # Socket raises error
-            mock_socket.side_effect = OSError("Socket error")
+        # Should still succeed (database write works)
+        result = cmd_send_event(args)
+
+        assert result == 0
 
-            # Should still succeed (database write works)
-            result = cmd_send_event(args)
+        captured = capsys.readouterr()
+        assert '⚠️  WebSocket socket unavailable' in captured.out
+        assert '✅ Event sent successfully!' in captured.out
 
-            assert result == 0
+    def test_sends_reuse_one_socket(self, mock_event_model, socket_paths, bind_listener):
+        """Test that repeated sends share the cached DGRAM socket"""
+        listener = bind_listener(socket_paths[0])
+
+        args = MagicMock()
+        args.target = 'ui'
+        args.type = 'activity_log'
+        args.source = 'cli'
+        args.job_id = None
+        args.payload = '{"message": "test"}'
 
-            captured = capsys.readouterr()
-            assert '✅ Event sent successfully!' in captured.out
+        assert cmd_send_event(args) == 0
+        sock = cli._dgram_sock
+        for _ in range(2):
+            assert cmd_send_event(args) == 0
+
+        assert cli._dgram_sock is sock
+        assert [self._receive(listener)['type'] for _ in range(3)] == ['activity_log'] * 3
+
+
+    def test_batch_stores_and_delivers_all_events(self, fresh_db, socket_paths, bind_listener,
+                                                  monkeypatch, capsys):
+        """send-event --batch inserts every event in one transaction, then delivers each"""
+        import io
+
+        from statemachine_engine.database.models import MachineEventModel
+
+        ws_path, control_template = socket_paths
+        ws_listener = bind_listener(ws_path)
+        control_listener = bind_listener(control_template.format(machine='worker1'))
+        model = MachineEventModel(fresh_db)
+        batch = [
+            {'target': 'ui', 'type': 'activity_log', 'payload': {'message': 'one'}},
+            {'target': 'ui', 'type': 'activity_log', 'source': 'manual_test',
+             'payload': '{"message": "two"}'},
+            {'target': 'worker1', 'type': 'custom_event', 'job_id': 'job_1'},
+        ]
+        monkeypatch.setattr('sys.stdin', io.StringIO(json.dumps(batch)))
+
+        with patch('statemachine_engine.database.cli.get_machine_event_model', return_value=model):
+            assert cli.main(['send-event', '--batch', '-']) == 0
+
+        stored = model.list_events(limit=10)
+        assert sorted((e['target_machine'], e['event_type']) for e in stored) == [
+            ('ui', 'activity_log'), ('ui', 'activity_log'), ('worker1', 'custom_event')
+        ]
+        received = [self._receive(ws_listener) for _ in range(3)]
+        assert [m['payload'] for m in received] == [{'message': 'one'}, {'message': 'two'}, {}]
+        assert received[1]['machine_name'] == 'manual_test'
+        assert self._receive(control_listener)['job_id'] == 'job_1'
+        assert '✅ 3 events sent successfully!' in capsys.readouterr().out
+
+    def test_batch_rejects_events_without_target(self, fresh_db, tmp_path, capsys):
+        """A malformed batch is refused before anything is stored"""
+        from statemachine_engine.database.models import MachineEventModel
+
+        model = MachineEventModel(fresh_db)
+        batch_file = tmp_path / 'batch.json'
+        batch_file.write_text(json.dumps([{'target': 'ui', 'type': 'a'}, {'type': 'b'}]))
+
+        with patch('statemachine_engine.database.cli.get_machine_event_model', return_value=model):
+            assert cli.main(['send-event', '--batch', str(batch_file)]) == 1
+
+        assert model.list_events() == []
+        assert 'Batch must be a JSON array' in capsys.readouterr().out
+
+    def test_target_and_type_required_without_batch(self):
+        """Without --batch, send-event still requires --target and --type"""
+        with pytest.raises(SystemExit) as exc_info:
+            cli.main(['send-event', '--target', 'ui'])
+        assert exc_info.value.code == 2
+
+    @pytest.mark.parametrize('flag', ['--target', '--type', '--source', '--job-id', '--payload'])
+    def test_batch_rejects_single_event_options(self, mock_event_model, flag, capsys):
+        """--batch refuses options it would otherwise ignore, before sending anything"""
+        with pytest.raises(SystemExit) as exc_info:
+            cli.main(['send-event', '--batch', '-', flag, 'x'])
+        assert exc_info.value.code == 2
+        assert f'--batch cannot be combined with {flag}' in capsys.readouterr().err
+        mock_event_model.send_event.assert_not_called()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,196 @@
+"""
+Tests for SQLite setup applied by Database (connection tuning, column migration)
+"""
+from statemachine_engine.database.models import Database
+
+
+def test_database_uses_wal_journal(tmp_path):
+    """New databases are switched to WAL journaling"""
+    db = Database(str(tmp_path / "test.db"))
+
+    with db._get_connection() as conn:
+        mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+
+    assert mode == "wal"
+
+
+def test_connections_use_normal_synchronous(tmp_path):
+    """Every connection runs with synchronous=NORMAL (1)"""
+    db = Database(str(tmp_path / "test.db"))
+
+    with db._get_connection() as conn:
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+
+
+def test_missing_columns_added_to_legacy_tables(tmp_path):
+    """Tables created before a column was added get it via ALTER TABLE"""
+    import sqlite3
+
+    db_path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE realtime_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            machine_name TEXT NOT NULL,
+            event_type TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            consumed BOOLEAN DEFAULT 0,
+            consumed_at TIMESTAMP
+        )
+    """)
+    conn.commit()
+    conn.close()
+
+    db = Database(str(db_path))
+
+    with db._get_connection() as conn:
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(realtime_events)")}
+    assert {"from_state", "to_state", "event_trigger", "error_message", "job_id"} <= columns
+
+
+def test_transaction_commits_joined_writes_once(tmp_path):
+    """Writes joined to Database.transaction() are committed together"""
+    from statemachine_engine.database.models.realtime_event import RealtimeEventModel
+
+    db = Database(str(tmp_path / "test.db"))
+    model = RealtimeEventModel(db)
+
+    with db.transaction() as conn:
+        ids = [model.log_event("m1", "test", {"n": n}, conn=conn) for n in range(3)]
+        assert conn.in_transaction
+
+    assert len(model.get_unconsumed_events()) == 3
+    assert ids == sorted(ids)
+
+
+def test_transaction_rolls_back_on_error(tmp_path):
+    """An exception inside Database.transaction() discards its writes"""
+    import pytest
+
+    from statemachine_engine.database.models.realtime_event import RealtimeEventModel
+
+    db = Database(str(tmp_path / "test.db"))
+    model = RealtimeEventModel(db)
+
+    with pytest.raises(RuntimeError), db.transaction() as conn:
+        model.log_event("m1", "test", {"n": 1}, conn=conn)
+        raise RuntimeError("boom")
+
+    assert model.get_unconsumed_events() == []
+
+
+def test_new_databases_use_incremental_auto_vacuum(tmp_path):
+    """auto_vacuum=INCREMENTAL (2) is set before the schema creates tables"""
+    db = Database(str(tmp_path / "test.db"))
+
+    with db._get_connection() as conn:
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+
+def test_schema_version_stamp_skips_reapplying(tmp_path, monkeypatch):
+    """Databases stamped with the current schema version skip the DDL"""
+    db = Database(str(tmp_path / "test.db"))
+    _, version = db._load_schema()
+
+    with db._get_connection() as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == version
+        conn.execute("DROP INDEX idx_realtime_unconsumed")
+        conn.commit()
+
+    # Same version: schema is not re-run, so the dropped index stays gone
+    Database(str(tmp_path / "test.db"))
+    with db._get_connection() as conn:
+        indexes = {row["name"] for row in conn.execute("PRAGMA index_list(realtime_events)")}
+    assert "idx_realtime_unconsumed" not in indexes
+
+    # Changed schema (new version): scripts run again and restore it
+    monkeypatch.setattr(Database, "_schemas", {})
+    monkeypatch.setattr("statemachine_engine.database.models.base.ADDED_COLUMNS", {})
+    Database(str(tmp_path / "test.db"))
+    with db._get_connection() as conn:
+        indexes = {row["name"] for row in conn.execute("PRAGMA index_list(realtime_events)")}
+        assert conn.execute("PRAGMA user_version").fetchone()[0] != version
+    assert "idx_realtime_unconsumed" in indexes
+
+
+def test_ephemeral_databases_skip_fsync(fresh_db, tmp_path):
+    """ephemeral=True connections run with synchronous=OFF (0); default stays NORMAL"""
+    with fresh_db._get_connection() as conn:
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 0
+
+    durable = Database(str(tmp_path / "durable.db"))
+    with durable._get_connection() as conn:
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+
+
+def test_readers_not_blocked_by_open_write_transaction(tmp_path):
+    """Under WAL a reader sees the last committed snapshot while a write is open"""
+    import threading
+
+    db = Database(str(tmp_path / "test.db"))
+    with db._get_connection() as conn:
+        conn.execute("INSERT INTO jobs (job_id, job_type) VALUES ('j1', 't')")
+        conn.commit()
+        assert conn.execute("PRAGMA wal_autocheckpoint").fetchone()[0] == 1000
+
+    counts = []
+
+    def read_jobs():
+        with db._get_connection() as reader:
+            counts.append(reader.execute("SELECT COUNT(*) FROM jobs").fetchone()[0])
+
+    with db.transaction() as conn:
+        conn.execute("INSERT INTO jobs (job_id, job_type) VALUES ('j2', 't')")
+        thread = threading.Thread(target=read_jobs)
+        thread.start()
+        thread.join(timeout=5)
+
+    assert counts == [1]
+
+
+def test_text_timestamps_converted_to_epoch(tmp_path):
+    """CURRENT_TIMESTAMP text in realtime_events is rewritten as epoch seconds"""
+    import sqlite3
+
+    db_path = tmp_path / "legacy.db"
+    Database(str(db_path))
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        INSERT INTO realtime_events (machine_name, event_type, payload, created_at, consumed, consumed_at)
+        VALUES ('m1', 'test', '{}', '2024-01-01 00:00:00', 1, '2024-01-02 00:00:00')
+    """)
+    conn.execute("PRAGMA user_version = 0")  # as if written by an older release
+    conn.commit()
+    conn.close()
+
+    db = Database(str(db_path))
+
+    with db._get_connection() as conn:
+        row = conn.execute("SELECT created_at, consumed_at FROM realtime_events").fetchone()
+    assert tuple(row) == (1704067200, 1704153600)
+
+
+def test_connections_wait_on_locked_database(fresh_db, tmp_path):
+    """Durable and ephemeral connections both wait BUSY_TIMEOUT on a lock"""
+    from statemachine_engine.database.models.base import BUSY_TIMEOUT
+
+    durable = Database(str(tmp_path / "durable.db"))
+    for db in (fresh_db, durable):
+        with db._get_connection() as conn:
+            assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == BUSY_TIMEOUT * 1000
+
+
+def test_old_sqlite_library_rejected(tmp_path, monkeypatch):
+    """SQLite without UPDATE ... RETURNING fails at init, not on first claim"""
+    import sqlite3
+
+    import pytest
+
+    monkeypatch.setattr(sqlite3, "sqlite_version_info", (3, 34, 1))
+    monkeypatch.setattr(sqlite3, "sqlite_version", "3.34.1")
+
+    with pytest.raises(RuntimeError, match=r"SQLite 3\.35\.0 or newer.*3\.34\.1"):
+        Database(str(tmp_path / "test.db"))
+
+    assert not (tmp_path / "test.db").exists()
@@ -4,22 +4,15 @@ Test machine-agnostic job queue polling for v2.0 controller architecture.
 Tests that check_database_queue can claim jobs regardless of machine_type
 when machine_type parameter is None (Option A implementation).
 """
-import tempfile
-from pathlib import Path
-
 import pytest
 
-from statemachine_engine.database import Database
 from statemachine_engine.database.models.job import JobModel
 
 
 @pytest.fixture
-def temp_db():
+def temp_db(fresh_db):
     """Create temporary database for testing"""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        db = Database(str(db_path))
-        yield db
+    return fresh_db
 
 
 @pytest.fixture
@@ -257,6 +250,19 @@ def test_get_pending_jobs_excludes_non_pending(job_model):
     assert jobs[0]['job_id'] == "pending"
 
 
+def test_get_next_job_returns_claimed_row(job_model, temp_db):
+    """Test get_next_job returns the row exactly as its single UPDATE left it"""
+    job_model.create_job(job_id="job_123", job_type="test", data={"k": "v"})
+
+    job = job_model.get_next_job(job_type="test")
+
+    assert job == job_model.get_job("job_123")
+    assert job['status'] == 'processing'
+    assert job['data'] == {"k": "v"}
+    # A second poller (separate model, same database) finds nothing left
+    assert JobModel(temp_db).get_next_job(job_type="test") is None
+
+
 def test_claim_job_marks_as_processing(job_model):
     """Test claim_job marks pending job as processing"""
     job_model.create_job(job_id="job_123", job_type="test")
@@ -290,29 +296,139 @@ def test_claim_job_nonexistent_returns_false(job_model):
     assert result is False
 
 
+def test_claim_job_concurrent_claimers_single_winner(job_model):
+    """Racing claimers on separate connections: exactly one claim succeeds"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    job_model.create_job("job_race", "work")
+
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        results = list(executor.map(lambda _: job_model.claim_job("job_race"), range(32)))
+
+    assert sum(results) == 1
+    assert job_model.get_job("job_race")['status'] == 'processing'
+
+
+def test_claim_jobs_batch_concurrent_claimers_disjoint(job_model):
+    """Concurrent batch claims never hand the same job to two workers"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    job_model.create_jobs([{"job_id": f"job_{i:03d}", "job_type": "work"} for i in range(100)])
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        batches = list(executor.map(
+            lambda _: job_model.claim_jobs_batch(job_type="work", limit=10), range(16)
+        ))
+
+    claimed = [job['job_id'] for batch in batches for job in batch]
+    assert len(claimed) == len(set(claimed)) == 100
+
+
 def test_batch_spawning_workflow(job_model):
-    """Test complete workflow: get pending jobs, claim each, spawn workers"""
-    # Create batch of jobs
-    for i in range(5):
-        job_model.create_job(
-            job_id=f"job_{i:03d}",
-            job_type="batch_work",
-            machine_type="worker"
-        )
-
-    # Step 1: Get all pending jobs (without claiming)
-    pending = job_model.get_pending_jobs(job_type="batch_work")
-    assert len(pending) == 5
-
-    # Step 2: Claim each job before spawning worker
-    claimed_count = 0
-    for job in pending:
-        if job_model.claim_job(job['job_id']):
-            claimed_count += 1
-            # Here we would spawn worker...
-
-    assert claimed_count == 5
+    """Test complete workflow: claim a batch of pending jobs, spawn workers"""
+    # Create batch of jobs in one transaction
+    created = job_model.create_jobs([
+        {"job_id": f"job_{i:03d}", "job_type": "batch_work", "machine_type": "worker"}
+        for i in range(5)
+    ])
+    assert created == 5
+
+    # Step 1: Claim the whole batch in one statement before spawning workers
+    claimed = job_model.claim_jobs_batch(job_type="batch_work", limit=5)
+    assert [job['job_id'] for job in claimed] == [f"job_{i:03d}" for i in range(5)]
+    # Here we would spawn a worker per claimed job...
 
     # Step 3: Verify no more pending jobs
     remaining = job_model.get_pending_jobs(job_type="batch_work")
     assert len(remaining) == 0
+
+
+def test_claim_jobs_batch_claims_in_queue_order(job_model):
+    """Test claim_jobs_batch claims up to limit jobs in priority order in one call"""
+    job_model.create_jobs([
+        {
+            "job_id": f"job_{i:03d}",
+            "job_type": "batch_work",
+            "machine_type": "worker",
+            "priority": 5 if i != 3 else 1,
+            "data": {"index": i},
+        }
+        for i in range(5)
+    ] + [{"job_id": "other", "job_type": "other_work"}])
+
+    claimed = job_model.claim_jobs_batch(job_type="batch_work", limit=3)
+
+    assert [job['job_id'] for job in claimed] == ["job_003", "job_000", "job_001"]
+    assert all(job['status'] == 'processing' for job in claimed)
+    assert claimed[0]['data'] == {"index": 3}
+
+    # Remaining jobs are still pending; already-claimed ones are not re-claimed
+    rest = job_model.claim_jobs_batch(job_type="batch_work", limit=10)
+    assert [job['job_id'] for job in rest] == ["job_002", "job_004"]
+    assert job_model.claim_jobs_batch(job_type="batch_work", limit=10) == []
+    assert job_model.get_job("other")['status'] == 'pending'
+
+
+def test_create_jobs_empty_list(job_model):
+    """Test create_jobs with no jobs is a no-op"""
+    assert job_model.create_jobs([]) == 0
+    assert job_model.get_pending_jobs() == []
+
+
+def test_count_jobs_matches_filters(job_model):
+    """count_jobs counts in SQL, past list_jobs' default limit of 50"""
+    job_model.create_jobs([
+        {"job_id": f"job_{i:03d}", "job_type": "bulk", "machine_type": "worker"}
+        for i in range(60)
+    ])
+    job_model.complete_job("job_000")
+
+    assert job_model.count_jobs(status='pending') == 59
+    assert job_model.count_jobs(status='completed', job_type='bulk') == 1
+    assert job_model.count_jobs(machine_type='other') == 0
+    assert len(job_model.list_jobs(status='pending')) == 50
+
+
+def test_job_exists(job_model):
+    """job_exists checks presence without fetching the job"""
+    job_model.create_job("job_001", "work")
+
+    assert job_model.job_exists("job_001") is True
+    assert job_model.job_exists("missing") is False
+
+
+def test_cli_cleanup_deletes_status_in_sql(job_model, capsys):
+    """cleanup --status deletes matching jobs without listing them first"""
+    from argparse import Namespace
+    from unittest.mock import patch
+
+    from statemachine_engine.database.cli import cmd_cleanup
+
+    job_model.create_jobs([{"job_id": f"job_{i}", "job_type": "work"} for i in range(3)])
+    job_model.complete_job("job_0")
+    job_model.complete_job("job_1")
+
+    with patch('statemachine_engine.database.cli.get_job_model', return_value=job_model):
+        cmd_cleanup(Namespace(status='completed'))
+        cmd_cleanup(Namespace(status='failed'))
+
+    output = capsys.readouterr().out
+    assert "Cleaned up 2 jobs with status 'completed'" in output
+    assert "No jobs found with status 'failed'" in output
+    assert [job['job_id'] for job in job_model.list_jobs()] == ["job_2"]
+
+
+@pytest.mark.parametrize("machine_filter", ["", " AND machine_type = ?"])
+def test_pending_job_queries_use_partial_index(temp_db, machine_filter):
+    """Pending-job lookups by type range-scan idx_jobs_pending without sorting"""
+    params = ("batch_work", "worker")[:1 + bool(machine_filter)]
+    with temp_db._get_connection() as conn:
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM jobs WHERE status = 'pending' AND job_type = ?"
+            f"{machine_filter} ORDER BY priority ASC, created_at ASC LIMIT 1",
+            params,
+        ).fetchall()
+
+    details = ' '.join(row['detail'] for row in plan)
+    assert 'USING INDEX idx_jobs_pending' in details
+    assert 'TEMP B-TREE' not in details
@@ -1,19 +1,16 @@
 """
 Tests for RealtimeEventModel exception handling
 """
-from pathlib import Path
+import sqlite3
+import time
 
 import pytest
 
-from statemachine_engine.database.models.base import Database
-
 
 @pytest.fixture
-def test_db(tmp_path):
+def test_db(fresh_db):
     """Create a test database"""
-    db_path = tmp_path / "test.db"
-    db = Database(str(db_path))
-    return db
+    return fresh_db
 
 
 @pytest.fixture
@@ -23,6 +20,16 @@ def realtime_model(test_db):
     return RealtimeEventModel(test_db)
 
 
+@pytest.fixture
+def broken_db(test_db, monkeypatch):
+    """Make every connection request on test_db fail like an unopenable file"""
+    def fail():
+        raise sqlite3.OperationalError("unable to open database file")
+
+    monkeypatch.setattr(test_db, "_get_connection", fail)
+    return test_db
+
+
 def test_log_event_success(realtime_model):
     """Test successful event logging"""
     event_id = realtime_model.log_event(
@@ -48,15 +55,28 @@ def test_log_event_with_complex_payload(realtime_model):
     assert event_id is not None
 
 
-def test_log_event_returns_none_on_db_error(realtime_model):
+def test_log_event_returns_none_on_db_error(realtime_model, broken_db):
     """Test that log_event returns None on database error"""
-    # Close the database connection to simulate error
-    realtime_model.db.db_path = Path("/invalid/path/that/does/not/exist.db")
-
     event_id = realtime_model.log_event('test_machine', 'error', {'msg': 'test'})
     assert event_id is None
 
 
+def test_log_events_bulk_inserts_all(realtime_model):
+    """Test bulk logging inserts every event in one call"""
+    inserted = realtime_model.log_events_bulk([
+        ('machine1', 'state_change', {'state': 'running'}),
+        ('machine2', 'error', {'error': 'failed'}),
+    ])
+    assert inserted == 2
+    assert len(realtime_model.get_unconsumed_events()) == 2
+    assert realtime_model.log_events_bulk([]) == 0
+
+
+def test_log_events_bulk_returns_negative_on_db_error(realtime_model, broken_db):
+    """Test that log_events_bulk returns -1 on database error"""
+    assert realtime_model.log_events_bulk([('m', 'error', {'msg': 'test'})]) == -1
+
+
 def test_get_unconsumed_events_success(realtime_model):
     """Test getting unconsumed events"""
     # Log some events
@@ -72,8 +92,7 @@ def test_get_unconsumed_events_success(realtime_model):
 def test_get_unconsumed_events_with_limit(realtime_model):
     """Test limit parameter"""
     # Log 5 events
-    for i in range(5):
-        realtime_model.log_event(f'machine{i}', 'test', {'index': i})
+    realtime_model.log_events_bulk([(f'machine{i}', 'test', {'index': i}) for i in range(5)])
 
     events = realtime_model.get_unconsumed_events(limit=3)
     assert len(events) == 3
@@ -93,6 +112,43 @@ def test_get_unconsumed_events_since_id(realtime_model):
     assert events[1]['payload']['num'] == 3
 
 
+def test_get_unconsumed_events_page_advances_cursor(realtime_model, test_db):
+    """Test cursor pagination walks every page, skipping past invalid rows"""
+    realtime_model.log_events_bulk([(f'machine{i}', 'test', {'num': i}) for i in range(3)])
+    with test_db._get_connection() as conn:
+        conn.execute("""
+            INSERT INTO realtime_events (machine_name, event_type, payload)
+            VALUES (?, ?, ?)
+        """, ('bad_machine', 'test', 'INVALID_JSON{'))
+        conn.commit()
+    realtime_model.log_event('machine4', 'test', {'num': 4})
+
+    seen = []
+    cursor = 0
+    while True:
+        events, next_cursor = realtime_model.get_unconsumed_events_page(since_id=cursor, limit=2)
+        if next_cursor == cursor:
+            break
+        seen.extend(e['payload']['num'] for e in events)
+        cursor = next_cursor
+
+    assert seen == [0, 1, 2, 4]
+
+
+def test_get_unconsumed_events_uses_partial_index(test_db):
+    """Test the unconsumed query range-scans the partial index without sorting"""
+    from statemachine_engine.database.models.realtime_event import (
+        _SELECT_UNCONSUMED_SQL,
+    )
+
+    with test_db._get_connection() as conn:
+        plan = conn.execute(f"EXPLAIN QUERY PLAN {_SELECT_UNCONSUMED_SQL}", (0, 50)).fetchall()
+
+    details = ' '.join(row['detail'] for row in plan)
+    assert 'USING INDEX idx_realtime_unconsumed' in details
+    assert 'TEMP B-TREE' not in details
+
+
 def test_get_unconsumed_events_handles_invalid_json(realtime_model, test_db):
     """Test that invalid JSON in payload is gracefully handled"""
     # Insert event with invalid JSON directly
@@ -112,14 +168,53 @@ def test_get_unconsumed_events_handles_invalid_json(realtime_model, test_db):
     assert events[0]['payload']['valid'] is True
 
 
-def test_get_unconsumed_events_returns_empty_on_db_error(realtime_model):
-    """Test that get_unconsumed_events returns empty list on database error"""
-    realtime_model.db.db_path = Path("/invalid/path.db")
+@pytest.mark.parametrize("backend", ["orjson", "stdlib"])
+def test_get_unconsumed_events_delivers_non_finite_floats(realtime_model, monkeypatch, backend):
+    """NaN/Infinity payload values are stored as null and still delivered"""
+    from statemachine_engine.utils import json_codec
+
+    if backend == "stdlib":
+        monkeypatch.setattr(json_codec, "orjson", None)
+    elif json_codec.orjson is None:
+        pytest.skip("orjson not installed")
 
+    realtime_model.log_event('test_machine', 'metrics', {'loss': float('nan'), 'eta': float('inf')})
+
+    events = realtime_model.get_unconsumed_events()
+    assert [e['payload'] for e in events] == [{'loss': None, 'eta': None}]
+
+
+def test_get_unconsumed_events_returns_empty_on_db_error(realtime_model, broken_db):
+    """Test that get_unconsumed_events returns empty list on database error"""
     events = realtime_model.get_unconsumed_events()
     assert events == []
 
 
+def test_get_events_by_payload_field_filters_in_sql(realtime_model, test_db):
+    """Payload key filters match in SQLite and skip malformed or keyless rows"""
+    with test_db._get_connection() as conn:
+        conn.execute("""
+            INSERT INTO realtime_events (machine_name, event_type, payload)
+            VALUES (?, ?, ?)
+        """, ('broken', 'job_started', 'INVALID_JSON{'))
+        conn.commit()
+    realtime_model.log_events_bulk([
+        ('m1', 'job_started', {'queue': 'gpu', 'n': 1}),
+        ('m2', 'job_started', {'queue': 'cpu', 'n': 2}),
+        ('m3', 'job_started', {'n': 3}),
+        ('m4', 'job_started', {'queue': 'gpu', 'n': 4}),
+        ('m5', 'state_change', {'queue': 'gpu', 'n': 5}),
+    ])
+
+    events = realtime_model.get_events_by_payload_field('job_started', 'queue', 'gpu')
+    assert [e['payload']['n'] for e in events] == [4, 1]
+
+
+def test_get_events_by_payload_field_returns_empty_on_db_error(realtime_model, broken_db):
+    """Test that get_events_by_payload_field returns empty list on database error"""
+    assert realtime_model.get_events_by_payload_field('error', 'job_id', 'x') == []
+
+
 def test_mark_events_consumed_success(realtime_model):
     """Test marking events as consumed"""
     id1 = realtime_model.log_event('machine1', 'test', {'n': 1})
@@ -133,20 +228,40 @@ def test_mark_events_consumed_success(realtime_model):
     assert len(unconsumed) == 0
 
 
+def test_mark_events_consumed_large_batch_keeps_first_consumed_at(realtime_model, test_db):
+    """Batches beyond SQLite's parameter limit are marked; re-marking keeps consumed_at"""
+    from statemachine_engine.database.models.realtime_event import _MARK_CONSUMED_SQL
+
+    realtime_model.log_events_bulk([('machine1', 'test', {'n': n}) for n in range(1500)])
+    ids = [e['id'] for e in realtime_model.get_unconsumed_events(limit=1500)]
+
+    assert realtime_model.mark_events_consumed(ids) is True
+    assert realtime_model.get_unconsumed_events() == []
+
+    with test_db._get_connection() as conn:
+        conn.execute("UPDATE realtime_events SET consumed_at = 946684800")
+        conn.commit()
+
+    realtime_model.mark_events_consumed(ids[:1])
+
+    with test_db._get_connection() as conn:
+        consumed_at = conn.execute(
+            "SELECT consumed_at FROM realtime_events WHERE id = ?", (ids[0],)
+        ).fetchone()[0]
+        plan = conn.execute(f"EXPLAIN QUERY PLAN {_MARK_CONSUMED_SQL}", ('[1]',)).fetchall()
+    assert consumed_at == 946684800
+    assert 'INTEGER PRIMARY KEY' in ' '.join(row['detail'] for row in plan)
+
+
 def test_mark_events_consumed_empty_list(realtime_model):
     """Test marking empty list returns True"""
     result = realtime_model.mark_events_consumed([])
     assert result is True
 
 
-def test_mark_events_consumed_returns_false_on_error(realtime_model):
+def test_mark_events_consumed_returns_false_on_error(realtime_model, broken_db):
     """Test that mark_events_consumed returns False on database error"""
-    id1 = realtime_model.log_event('machine1', 'test', {'n': 1})
-
-    # Break the database connection
-    realtime_model.db.db_path = Path("/invalid/path.db")
-
-    result = realtime_model.mark_events_consumed([id1])
+    result = realtime_model.mark_events_consumed([1])
     assert result is False
 
 
@@ -160,9 +275,9 @@ def test_cleanup_old_events_success(realtime_model, test_db):
     with test_db._get_connection() as conn:
         conn.execute("""
             UPDATE realtime_events
-            SET consumed_at = datetime('now', '-25 hours')
+            SET consumed_at = ?
             WHERE id = ?
-        """, (id1,))
+        """, (int(time.time()) - 25 * 3600, id1))
         conn.commit()
 
     # Cleanup events older than 24 hours
@@ -189,7 +304,7 @@ def test_cleanup_old_events_does_not_delete_unconsumed(realtime_model, test_db):
     with test_db._get_connection() as conn:
         conn.execute("""
             UPDATE realtime_events
-            SET created_at = strftime('%s', datetime('now', '-25 hours'))
+            SET created_at = CAST(strftime('%s', 'now', '-25 hours') AS INTEGER)
             WHERE id = ?
         """, (id1,))
         conn.commit()
@@ -199,10 +314,30 @@ def test_cleanup_old_events_does_not_delete_unconsumed(realtime_model, test_db):
     assert deleted_count == 0  # Should not delete unconsumed
 
 
-def test_cleanup_old_events_returns_negative_on_error(realtime_model):
-    """Test that cleanup returns -1 on database error"""
-    realtime_model.db.db_path = Path("/invalid/path.db")
+def test_cleanup_old_events_releases_freed_pages(realtime_model, test_db):
+    """Cleanup range-scans the consumed_at index and shrinks the free list"""
+    from statemachine_engine.database.models.realtime_event import _CLEANUP_CONSUMED_SQL
 
+    realtime_model.log_events_bulk([('machine1', 'test', {'blob': 'x' * 4000, 'n': n}) for n in range(50)])
+    with test_db._get_connection() as conn:
+        conn.execute(
+            "UPDATE realtime_events SET consumed = 1, consumed_at = ?",
+            (int(time.time()) - 25 * 3600,),
+        )
+        conn.commit()
+        plan = conn.execute(f"EXPLAIN QUERY PLAN {_CLEANUP_CONSUMED_SQL}", (0,)).fetchall()
+        pages_before = conn.execute("PRAGMA page_count").fetchone()[0]
+
+    assert 'USING INDEX idx_realtime_consumed_at' in ' '.join(row['detail'] for row in plan)
+    assert realtime_model.cleanup_old_events(hours_old=24) == 50
+
+    with test_db._get_connection() as conn:
+        assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+        assert conn.execute("PRAGMA page_count").fetchone()[0] < pages_before
+
+
+def test_cleanup_old_events_returns_negative_on_error(realtime_model, broken_db):
+    """Test that cleanup returns -1 on database error"""
     deleted_count = realtime_model.cleanup_old_events(hours_old=24)
     assert deleted_count == -1
 
@@ -249,3 +384,17 @@ def test_state_change_event_logging(realtime_model):
     assert events[0]['payload']['from_state'] == 'idle'
     assert events[0]['payload']['to_state'] == 'processing'
     assert events[0]['payload']['event_trigger'] == 'start_job'
+
+
+def test_log_event_stores_compact_payload(realtime_model, test_db):
+    """Payloads are stored without separator padding or \\u escapes"""
+    payload = {'message': 'Käsittely valmis ✓', 'nested': {'a': 1, 'b': [1, 2]}}
+    event_id = realtime_model.log_event('machine1', 'activity_log', payload)
+
+    with test_db._get_connection() as conn:
+        stored = conn.execute(
+            "SELECT payload FROM realtime_events WHERE id = ?", (event_id,)
+        ).fetchone()['payload']
+
+    assert stored == '{"message":"Käsittely valmis ✓","nested":{"a":1,"b":[1,2]}}'
+    assert realtime_model.get_unconsumed_events()[0]['payload'] == payload
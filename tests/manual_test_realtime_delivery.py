@@ -3,20 +3,36 @@
 Manual test for send-event real-time delivery
 Run this to verify that CLI events appear in the Web UI immediately
 """
-import subprocess
+import io
+import json
+import shlex
 import sys
+from contextlib import nullcontext, redirect_stderr, redirect_stdout
 from pathlib import Path
 
+from statemachine_engine.database import cli
 
-def run_command(cmd):
-    """Run a command and return the output"""
-    result = subprocess.run(
-        cmd,
-        shell=True,
-        capture_output=True,
-        text=True
-    )
-    return result.returncode, result.stdout, result.stderr
+
+def run_command(cmd, stdin="", capture=True):
+    """Run a database CLI command in-process and return the output
+
+    cmd holds the arguments after the program name, as typed in a shell;
+    stdin is what the command reads from standard input. Running cli.main()
+    here avoids an interpreter start and package import per command.
+    With capture=False the command prints straight to the console as it
+    runs, nothing is buffered, and the returned stdout is empty.
+    """
+    stdout, stderr = io.StringIO(), io.StringIO()
+    saved_stdin, sys.stdin = sys.stdin, io.StringIO(stdin)
+    out = redirect_stdout(stdout) if capture else nullcontext()
+    with out, redirect_stderr(stderr):
+        try:
+            code = cli.main(shlex.split(cmd)) or 0
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else 1
+        finally:
+            sys.stdin = saved_stdin
+    return code, stdout.getvalue(), stderr.getvalue()
 
 def main():
     print("=" * 70)
@@ -38,47 +54,26 @@ def main():
             return 1
     print()
 
-    # Test 1: Send activity_log to UI
-    print("2. Sending activity_log to UI...")
-    cmd = (
-        'python -m statemachine_engine.database.cli send-event '
-        '--target ui --type activity_log '
-        '--payload \'{"message": "Test from manual test script", "level": "INFO"}\''
-    )
-    code, stdout, stderr = run_command(cmd)
-    print(f"   Exit code: {code}")
-    print(f"   Output:\n{stdout}")
-    if stderr:
-        print(f"   Errors:\n{stderr}")
-
-    if "Sent to WebSocket server" in stdout:
-        print("   ✅ Real-time socket delivery confirmed")
-    else:
-        print("   ⚠️  No WebSocket socket delivery detected")
-    print()
-
-    # Test 2: Send with custom source
-    print("3. Sending activity_log with custom source...")
-    cmd = (
-        'python -m statemachine_engine.database.cli send-event '
-        '--target ui --type activity_log --source manual_test '
-        '--payload \'{"message": "From manual_test source", "level": "SUCCESS"}\''
-    )
-    code, stdout, stderr = run_command(cmd)
-    print(f"   Exit code: {code}")
-    print(f"   Output:\n{stdout}")
-    if stderr:
-        print(f"   Errors:\n{stderr}")
-    print()
-
-    # Test 3: Send to non-UI target
-    print("4. Sending event to non-UI target (worker1)...")
-    cmd = (
-        'python -m statemachine_engine.database.cli send-event '
-        '--target worker1 --type custom_event '
-        '--payload \'{"data": "test"}\''
-    )
-    code, stdout, stderr = run_command(cmd)
+    # Tests 1-3 go out as one batch: one transaction, one shared socket
+    print("2. Sending three events in one batch...")
+    print("   - activity_log to UI")
+    print("   - activity_log to UI with custom source")
+    print("   - custom_event to non-UI target (worker1)")
+    events = [
+        {
+            "target": "ui",
+            "type": "activity_log",
+            "payload": {"message": "Test from manual test script", "level": "INFO"},
+        },
+        {
+            "target": "ui",
+            "type": "activity_log",
+            "source": "manual_test",
+            "payload": {"message": "From manual_test source", "level": "SUCCESS"},
+        },
+        {"target": "worker1", "type": "custom_event", "payload": {"data": "test"}},
+    ]
+    code, stdout, stderr = run_command('send-event --batch -', json.dumps(events))
     print(f"   Exit code: {code}")
     print(f"   Output:\n{stdout}")
     if stderr:
@@ -87,17 +82,18 @@ def main():
     if "Sent to WebSocket server" in stdout and "Sent to worker1 control socket" in stdout:
         print("   ✅ Both sockets attempted (WebSocket + control)")
     elif "Sent to WebSocket server" in stdout:
-        print("   ✅ WebSocket delivery confirmed")
+        print("   ✅ Real-time socket delivery confirmed")
     else:
-        print("   ℹ️  Socket delivery status unclear")
+        print("   ⚠️  No WebSocket socket delivery detected")
     print()
 
-    # Test 4: Query recent events from database
-    print("5. Querying recent events from database...")
-    cmd = 'python -m statemachine_engine.database.cli list-events --target ui --limit 5'
-    code, stdout, stderr = run_command(cmd)
+    # Query recent events from database
+    print("3. Querying recent events from database...")
+    # Only shown, never inspected: stream it instead of buffering
+    cmd = 'list-events --target ui --limit 5'
+    print("   Output:")
+    code, _, stderr = run_command(cmd, capture=False)
     print(f"   Exit code: {code}")
-    print(f"   Output:\n{stdout}")
     if stderr:
         print(f"   Errors:\n{stderr}")
     print()
@@ -12,6 +12,7 @@ Verifies:
 import logging
 import logging.handlers
 import sys
+import threading
 import time
 from pathlib import Path
 
@@ -25,166 +26,252 @@ from statemachine_engine.monitoring.async_logging import (
     setup_async_logging,
 )
 
+UNICODE_MESSAGES = (
+    "emoji: 🚀 ✅ 📥 🔴",
+    "Chinese: 你好世界",
+    "Arabic: مرحبا بالعالم",
+)
+
+
+class _BlockingHandler(logging.Handler):
+    """Handler that holds the listener thread until released"""
+
+    def __init__(self, released: threading.Event):
+        super().__init__()
+        self.released = released
+
+    def emit(self, record):
+        self.released.wait(timeout=10)
+
+
+@pytest.fixture
+def async_logging():
+    """setup_async_logging that is torn down after the test
+
+    Stops listeners the test left running and detaches the QueueHandlers.
+    Without the detach every test leaves a handler on the root logger whose
+    queue has no consumer, and each later log record anywhere in the
+    session is enqueued there too. With nothing shared between tests but
+    their own tmp_path, the module runs unchanged under pytest -n auto.
+    """
+    created = []
+
+    def setup(*args, **kwargs):
+        logger, listener = setup_async_logging(*args, **kwargs)
+        created.append((logger, listener))
+        return logger, listener
+
+    yield setup
+
+    for logger, listener in created:
+        if listener._thread is not None:
+            listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+        for handler in logger.handlers[:]:
+            if (
+                isinstance(handler, logging.handlers.QueueHandler)
+                and handler.queue is listener.queue
+            ):
+                logger.removeHandler(handler)
+
 
 class TestAsyncLogging:
     """Test async-safe logging configuration"""
 
-    def test_setup_async_logging_creates_handlers(self, tmp_path):
+    def test_setup_async_logging_creates_handlers(self, tmp_path, async_logging):
         """Test that setup_async_logging creates proper handlers"""
         log_file = tmp_path / "test.log"
 
-        logger, listener = setup_async_logging(log_file)
-
-        try:
-            # Should have at least one handler (QueueHandler)
-            # Note: pytest may add its own handlers to root logger
-            assert len(logger.handlers) >= 1
+        logger, listener = async_logging(log_file)
 
-            # Find the QueueHandler we added
-            queue_handlers = [h for h in logger.handlers if isinstance(h, logging.handlers.QueueHandler)]
-            assert len(queue_handlers) >= 1, "Should have at least one QueueHandler"
+        # Should have at least one handler (QueueHandler)
+        # Note: pytest may add its own handlers to root logger
+        assert len(logger.handlers) >= 1
 
-            # Listener should be started
-            assert listener is not None
+        # Find the QueueHandler we added
+        queue_handlers = [h for h in logger.handlers if isinstance(h, logging.handlers.QueueHandler)]
+        assert len(queue_handlers) >= 1, "Should have at least one QueueHandler"
 
-        finally:
-            listener.stop()
+        # Listener should be started
+        assert listener is not None
 
-    def test_async_logging_writes_to_file(self, tmp_path):
+    def test_async_logging_writes_to_file(self, tmp_path, async_logging):
         """Test that async logging actually writes to file"""
         log_file = tmp_path / "test.log"
 
-        logger, listener = setup_async_logging(log_file, include_console=False)
+        logger, listener = async_logging(log_file, include_console=False)
 
-        try:
-            # Write some logs
-            logger.info("Test message 1")
-            logger.warning("Test message 2")
-            logger.error("Test message 3")
-
-            # Stop listener to flush
-            listener.stop()
+        # Write some logs
+        logger.info("Test message 1")
+        logger.warning("Test message 2")
+        logger.error("Test message 3")
 
-            # Check file contents
-            assert log_file.exists()
-            contents = log_file.read_text()
-            assert "Test message 1" in contents
-            assert "Test message 2" in contents
-            assert "Test message 3" in contents
+        # Stop listener to flush
+        listener.stop()
 
-        except Exception:
-            listener.stop()
-            raise
+        # Check file contents
+        assert log_file.exists()
+        contents = log_file.read_text()
+        assert "Test message 1" in contents
+        assert "Test message 2" in contents
+        assert "Test message 3" in contents
 
-    def test_async_logging_respects_log_level(self, tmp_path):
+    def test_async_logging_respects_log_level(self, tmp_path, async_logging):
         """Test that log level filtering works"""
         log_file = tmp_path / "test.log"
 
-        logger, listener = setup_async_logging(
+        logger, listener = async_logging(
             log_file,
             log_level=logging.WARNING,
             include_console=False
         )
 
-        try:
-            # Write logs at different levels
-            logger.debug("Debug message")
-            logger.info("Info message")
-            logger.warning("Warning message")
-            logger.error("Error message")
-
-            # Stop listener to flush
-            listener.stop()
+        # Write logs at different levels
+        logger.debug("Debug message")
+        logger.info("Info message")
+        logger.warning("Warning message")
+        logger.error("Error message")
 
-            # Check file contents
-            contents = log_file.read_text()
-            assert "Debug message" not in contents
-            assert "Info message" not in contents
-            assert "Warning message" in contents
-            assert "Error message" in contents
+        # Stop listener to flush
+        listener.stop()
 
-        except Exception:
-            listener.stop()
-            raise
+        # Check file contents
+        contents = log_file.read_text()
+        assert "Debug message" not in contents
+        assert "Info message" not in contents
+        assert "Warning message" in contents
+        assert "Error message" in contents
 
     @pytest.mark.asyncio
-    async def test_logging_doesnt_block_event_loop(self, tmp_path):
+    async def test_logging_doesnt_block_event_loop(self, tmp_path, async_logging):
         """Test that logging doesn't block async event loop"""
         log_file = tmp_path / "test.log"
 
-        logger, listener = setup_async_logging(log_file, include_console=False)
+        logger, listener = async_logging(log_file, include_console=False)
+
+        # Stall the listener thread on the first record it dequeues, as a
+        # hung disk would. If logging were synchronous the loop below would
+        # block here too; non-blocking logging leaves the rest in the queue.
+        sink_released = threading.Event()
+        listener.handlers = (_BlockingHandler(sink_released), *listener.handlers)
 
         try:
-            # Log many messages rapidly
-            start = time.time()
+            start = time.perf_counter_ns()
             for i in range(1000):
-                logger.info(f"Message {i}")
-            duration = time.time() - start
+                logger.info("Message %d", i)
+            per_call_ns = (time.perf_counter_ns() - start) / 1000
+
+            # The records are still waiting on the stalled sink, none was
+            # written on the calling thread
+            assert listener.queue.qsize() >= 999
+            # Enqueueing is microseconds per call; the bound leaves room for
+            # pytest's own capture handler, which formats every record
+            assert per_call_ns < 100_000, f"{per_call_ns / 1000:.1f}µs per log call"
+        finally:
+            sink_released.set()
 
-            # Logging should be fast (< 0.5s for 1000 messages with pytest overhead)
-            # Because it just enqueues, doesn't wait for disk I/O
-            # Note: pytest capture adds overhead, so this is more lenient
-            assert duration < 0.5, f"Logging took {duration}s - it's blocking!"
+        # Stop listener to flush
+        listener.stop()
 
-            # Stop listener to flush
-            listener.stop()
+        # Verify logs were written
+        contents = log_file.read_text()
+        assert "Message 0" in contents
+        assert "Message 999" in contents
 
-            # Verify logs were written
-            contents = log_file.read_text()
-            assert "Message 0" in contents
-            assert "Message 999" in contents
+    def test_filtered_records_are_never_formatted(self, tmp_path, async_logging):
+        """Test that lazy %-style arguments are not rendered below the level"""
+        log_file = tmp_path / "test.log"
+        rendered = []
 
-        except Exception:
-            listener.stop()
-            raise
+        class Probe:
+            def __str__(self):
+                rendered.append(True)
+                return "probe"
+
+        logger, listener = async_logging(
+            log_file, log_level=logging.WARNING, include_console=False
+        )
+
+        # The level check runs before a LogRecord is built or queued
+        logger.info("Skipped %s", Probe())
+        assert rendered == []
+        assert listener.queue.qsize() == 0
+
+        logger.warning("Kept %s", Probe())
+        listener.stop()
+
+        assert rendered
+        assert "Kept probe" in log_file.read_text()
 
-    def test_custom_log_format(self, tmp_path):
+    def test_bounded_queue_applies_backpressure(self, tmp_path, async_logging):
+        """Test that a slow sink drops records instead of growing the queue"""
+        log_file = tmp_path / "test.log"
+
+        class SlowSink(logging.Handler):
+            def emit(self, record):
+                time.sleep(0.02)
+
+        logger, listener = async_logging(
+            log_file, include_console=False, queue_size=50
+        )
+        listener.handlers = (SlowSink(), *listener.handlers)
+        queue_handler = next(
+            h for h in logger.handlers if getattr(h, "queue", None) is listener.queue
+        )
+
+        depths = []
+        start = time.perf_counter()
+        for i in range(500):
+            logger.info("Message %d", i)
+            depths.append(listener.queue.qsize())
+        duration = time.perf_counter() - start
+
+        assert max(depths) <= 50
+        assert queue_handler.dropped > 0
+        # Overflow neither blocks the caller on the slow sink...
+        assert duration < 1.0
+        # ...nor prevents a clean shutdown while the queue is full
+        listener.stop()
+        assert "Message 0" in log_file.read_text()
+
+    def test_custom_log_format(self, tmp_path, async_logging):
         """Test that custom log format is respected"""
         log_file = tmp_path / "test.log"
 
         custom_format = "%(levelname)s - %(message)s"
-        logger, listener = setup_async_logging(
+        logger, listener = async_logging(
             log_file,
             log_format=custom_format,
             include_console=False
         )
 
-        try:
-            logger.info("Test message")
-            listener.stop()
+        logger.info("Test message")
+        listener.stop()
 
-            contents = log_file.read_text()
-            # Should have custom format (no timestamp or logger name)
-            assert "INFO - Test message" in contents
-            # Should NOT have timestamp
-            assert "statemachine_engine" not in contents
-
-        except Exception:
-            listener.stop()
-            raise
+        contents = log_file.read_text()
+        # Should have custom format (no timestamp or logger name)
+        assert "INFO - Test message" in contents
+        # Should NOT have timestamp
+        assert "statemachine_engine" not in contents
 
-    def test_custom_logger_name(self, tmp_path):
+    def test_custom_logger_name(self, tmp_path, async_logging):
         """Test that custom logger name works"""
         log_file = tmp_path / "test.log"
 
-        logger, listener = setup_async_logging(
+        logger, listener = async_logging(
             log_file,
             logger_name="custom.logger",
             include_console=False
         )
 
-        try:
-            assert logger.name == "custom.logger"
+        assert logger.name == "custom.logger"
 
-            logger.info("Test message")
-            listener.stop()
+        logger.info("Test message")
+        listener.stop()
 
-            contents = log_file.read_text()
-            assert "custom.logger" in contents
-
-        except Exception:
-            listener.stop()
-            raise
+        contents = log_file.read_text()
+        assert "custom.logger" in contents
 
     def test_emergency_logger_works_independently(self, tmp_path):
         """Test that emergency logger works without queue"""
@@ -203,111 +290,116 @@ class TestAsyncLogging:
         assert "Emergency message 1" in contents
         assert "Emergency message 2" in contents
 
-    def test_console_logging_can_be_disabled(self, tmp_path):
+    def test_console_logging_can_be_disabled(self, tmp_path, async_logging):
         """Test that console logging is optional"""
         log_file = tmp_path / "test.log"
 
         # Without console
-        logger1, listener1 = setup_async_logging(
+        logger1, listener1 = async_logging(
             log_file,
             include_console=False
         )
 
-        try:
-            # Listener should have only 1 handler (file)
-            # Note: We can't directly inspect listener's handlers easily,
-            # but we can verify logging still works
-            logger1.info("Test")
-            listener1.stop()
-
-            assert log_file.exists()
+        # Listener should have only 1 handler (file)
+        # Note: We can't directly inspect listener's handlers easily,
+        # but we can verify logging still works
+        logger1.info("Test")
+        listener1.stop()
 
-        except Exception:
-            listener1.stop()
-            raise
+        assert log_file.exists()
 
-    def test_multiple_loggers_dont_interfere(self, tmp_path):
-        """Test that multiple async loggers can coexist"""
+    def test_multiple_loggers_dont_interfere(self, tmp_path, async_logging):
+        """Test that loggers sharing one listener still write to their own files"""
         log_file1 = tmp_path / "logger1.log"
         log_file2 = tmp_path / "logger2.log"
+        threads_before = threading.active_count()
 
-        logger1, listener1 = setup_async_logging(
+        logger1, listener1 = async_logging(
             log_file1,
             logger_name="logger1",
             include_console=False
         )
-        logger2, listener2 = setup_async_logging(
+        logger2, listener2 = async_logging(
             log_file2,
             logger_name="logger2",
-            include_console=False
+            include_console=False,
+            shared_listener=listener1,
         )
 
-        try:
-            logger1.info("Message from logger1")
-            logger2.info("Message from logger2")
+        # One background thread serves both loggers
+        assert listener2 is listener1
+        assert threading.active_count() == threads_before + 1
+
+        logger1.info("Message from logger1")
+        logger2.info("Message from logger2")
+
+        listener1.stop()
+
+        # Each file should have its own messages
+        contents1 = log_file1.read_text()
+        contents2 = log_file2.read_text()
 
-            listener1.stop()
-            listener2.stop()
+        assert "Message from logger1" in contents1
+        assert "Message from logger2" not in contents1
 
-            # Each file should have its own messages
-            contents1 = log_file1.read_text()
-            contents2 = log_file2.read_text()
+        assert "Message from logger2" in contents2
+        assert "Message from logger1" not in contents2
 
-            assert "Message from logger1" in contents1
-            assert "Message from logger2" not in contents1
+    def test_separate_listeners_dont_interfere(self, tmp_path, async_logging):
+        """Test that independently set up async loggers can coexist"""
+        log_file1 = tmp_path / "logger1.log"
+        log_file2 = tmp_path / "logger2.log"
+
+        logger1, listener1 = async_logging(
+            log_file1, logger_name="logger1", include_console=False
+        )
+        logger2, listener2 = async_logging(
+            log_file2, logger_name="logger2", include_console=False
+        )
 
-            assert "Message from logger2" in contents2
-            assert "Message from logger1" not in contents2
+        logger1.info("Message from logger1")
+        logger2.info("Message from logger2")
 
-        except Exception:
-            listener1.stop()
-            listener2.stop()
-            raise
+        listener1.stop()
+        listener2.stop()
+
+        assert "Message from logger2" not in log_file1.read_text()
+        assert "Message from logger1" not in log_file2.read_text()
 
 
 class TestAsyncLoggingEdgeCases:
     """Test edge cases and error handling"""
 
-    def test_logging_with_unicode_characters(self, tmp_path):
+    def test_logging_with_unicode_characters(self, tmp_path, async_logging):
         """Test that unicode characters are handled correctly"""
         log_file = tmp_path / "test.log"
 
-        logger, listener = setup_async_logging(log_file, include_console=False)
+        logger, listener = async_logging(log_file, include_console=False)
 
-        try:
-            # Log with various unicode characters
-            logger.info("Test with emoji: 🚀 ✅ 📥 🔴")
-            logger.info("Test with Chinese: 你好世界")
-            logger.info("Test with Arabic: مرحبا بالعالم")
+        # Log with various unicode characters, passed as lazy arguments
+        for message in UNICODE_MESSAGES:
+            logger.info("Test with %s", message)
 
-            listener.stop()
+        listener.stop()
 
-            contents = log_file.read_text()
-            assert "🚀" in contents
-            assert "你好世界" in contents
-            assert "مرحبا بالعالم" in contents
-
-        except Exception:
-            listener.stop()
-            raise
+        # Written as raw characters, encoded once by the file handler
+        contents = log_file.read_text(encoding="utf-8")
+        for message in UNICODE_MESSAGES:
+            assert f"Test with {message}" in contents
 
-    def test_logging_creates_missing_directories(self, tmp_path):
+    def test_logging_creates_missing_directories(self, tmp_path, async_logging):
         """Test that logging creates parent directories if missing"""
         log_file = tmp_path / "subdir" / "nested" / "test.log"
 
         # Directory doesn't exist yet
         assert not log_file.parent.exists()
 
-        logger, listener = setup_async_logging(log_file, include_console=False)
+        logger, listener = async_logging(log_file, include_console=False)
 
-        try:
-            logger.info("Test message")
-            listener.stop()
+        logger.info("Test message")
+        listener.stop()
 
-            # Directory should be created
-            assert log_file.parent.exists()
-            assert log_file.exists()
+        # Directory should be created
+        assert log_file.parent.exists()
+        assert log_file.exists()
 
-        except Exception:
-            listener.stop()
-            raise
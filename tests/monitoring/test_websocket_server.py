@@ -9,19 +9,75 @@ Verifies:
 """
 
 import asyncio
+import json
 
 import pytest
 from fastapi.testclient import TestClient
 
-from statemachine_engine.monitoring.websocket_server import app, get_initial_state
+from statemachine_engine.monitoring import websocket_server
+from statemachine_engine.monitoring.websocket_server import (
+    app,
+    broadcaster,
+    get_initial_state,
+)
+
+
+@pytest.fixture(scope="module")
+def client():
+    """One TestClient shared by the module's tests
+
+    Not entered as a context manager, as with the per-test clients it
+    replaces: the app lifespan (Unix socket listener on the fixed /tmp
+    path, logging-thread shutdown) stays out of these tests.
+    """
+    return TestClient(app)
+
+
+async def _websocket_session(messages):
+    """Drive one /ws/events connection by calling the ASGI app directly
+
+    Sends each text message after the server's previous reply and returns
+    the decoded replies, starting with the initial state. Nothing is
+    bridged through a thread the way TestClient's sync transport does.
+    """
+    scope = {
+        "type": "websocket",
+        "asgi": {"version": "3.0"},
+        "scheme": "ws",
+        "path": "/ws/events",
+        "raw_path": b"/ws/events",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [],
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+        "subprotocols": [],
+    }
+    inbound = asyncio.Queue()
+    outbound = asyncio.Queue()
+    await inbound.put({"type": "websocket.connect"})
+
+    server = asyncio.create_task(app(scope, inbound.get, outbound.put))
+    try:
+        assert (await asyncio.wait_for(outbound.get(), 5))["type"] == "websocket.accept"
+        replies = []
+        for text in [None, *messages]:
+            if text is not None:
+                await inbound.put({"type": "websocket.receive", "text": text})
+            sent = await asyncio.wait_for(outbound.get(), 5)
+            replies.append(json.loads(sent["text"]))
+        await inbound.put({"type": "websocket.disconnect", "code": 1000})
+        await asyncio.wait_for(server, 5)
+        return replies
+    finally:
+        server.cancel()
 
 
 class TestWebSocketServer:
     """Test WebSocket server connection handling"""
 
-    def test_health_endpoint(self):
+    def test_health_endpoint(self, client):
         """Test that health endpoint returns status"""
-        client = TestClient(app)
         response = client.get("/health")
 
         assert response.status_code == 200
@@ -32,9 +88,8 @@ class TestWebSocketServer:
         assert 'seconds_since_last_event' in data
         assert 'unix_socket_active' in data
 
-    def test_initial_endpoint(self):
+    def test_initial_endpoint(self, client):
         """Test that /initial endpoint returns initial state"""
-        client = TestClient(app)
         response = client.get("/initial")
 
         assert response.status_code == 200
@@ -81,10 +136,41 @@ class TestWebSocketServer:
         # If connections leaked, this would fail or hang
         # Success means connections were properly cleaned up
 
-    def test_websocket_sends_initial_state_on_connect(self):
-        """Test that WebSocket sends initial state immediately on connect"""
-        client = TestClient(app)
+    @pytest.mark.asyncio
+    async def test_initial_state_is_reused_within_ttl(self, monkeypatch):
+        """Test that a burst of calls shares one snapshot query"""
+        loads = []
+        real_load = websocket_server._load_initial_state
+
+        def counting_load():
+            loads.append(1)
+            return real_load()
+
+        monkeypatch.setattr(websocket_server, "_load_initial_state", counting_load)
+        monkeypatch.setitem(websocket_server._initial_state_cache, "state", None)
+        monkeypatch.setattr(websocket_server, "INITIAL_STATE_TTL", 60)
+
+        states = [await get_initial_state() for _ in range(50)]
+
+        assert len(loads) == 1
+        assert all(state is states[0] for state in states)
+
+        # Once the snapshot expires, the next call queries again
+        monkeypatch.setattr(websocket_server, "INITIAL_STATE_TTL", 0)
+        assert await get_initial_state() is not states[0]
+        assert len(loads) == 2
+
+    def test_initial_state_uses_shared_database(self, tmp_path, monkeypatch):
+        """The snapshot reads get_database(), never a default file in the cwd"""
+        monkeypatch.chdir(tmp_path)
+
+        state = websocket_server._load_initial_state()
 
+        assert 'error' not in state
+        assert not (tmp_path / 'data' / 'pipeline.db').exists()
+
+    def test_websocket_sends_initial_state_on_connect(self, client):
+        """Test that WebSocket sends initial state immediately on connect"""
         with client.websocket_connect("/ws/events") as websocket:
             # First message should be initial state
             data = websocket.receive_json()
@@ -93,10 +179,8 @@ class TestWebSocketServer:
             assert 'machines' in data
             assert 'timestamp' in data
 
-    def test_websocket_responds_to_ping(self):
+    def test_websocket_responds_to_ping(self, client):
         """Test that WebSocket responds to ping with pong"""
-        client = TestClient(app)
-
         with client.websocket_connect("/ws/events") as websocket:
             # Receive initial state
             websocket.receive_json()
@@ -108,10 +192,8 @@ class TestWebSocketServer:
             response = websocket.receive_json()
             assert response['type'] == 'pong'
 
-    def test_websocket_handles_refresh_command(self):
+    def test_websocket_handles_refresh_command(self, client):
         """Test that WebSocket handles refresh command"""
-        client = TestClient(app)
-
         with client.websocket_connect("/ws/events") as websocket:
             # Receive initial state
             initial = websocket.receive_json()
@@ -128,31 +210,26 @@ class TestWebSocketServer:
             # Timestamp should be newer
             assert refreshed['timestamp'] >= initial['timestamp']
 
-    def test_multiple_reconnections_work(self):
+    @pytest.mark.asyncio
+    async def test_multiple_reconnections_work(self):
         """Test that multiple reconnections don't exhaust resources"""
-        client = TestClient(app)
+        connections_before = len(broadcaster.connections)
 
-        # Simulate 20 reconnections
-        for i in range(20):
-            with client.websocket_connect("/ws/events") as websocket:
-                # Each connection should get initial state
-                data = websocket.receive_json()
-                assert data['type'] == 'initial'
+        # Simulate 20 concurrent connect-ping-close sessions
+        sessions = await asyncio.gather(
+            *(_websocket_session(["ping"]) for _ in range(20))
+        )
 
-                # Send a ping
-                websocket.send_text('ping')
-                pong = websocket.receive_json()
-                assert pong['type'] == 'pong'
-
-            # Connection closed, test next one
+        for initial, pong in sessions:
+            # Each connection should get initial state, then the pong
+            assert initial['type'] == 'initial'
+            assert pong['type'] == 'pong'
 
-        # If resources leaked, this would fail
-        # Success means proper cleanup happened
+        # If resources leaked, connections would still be registered
+        assert len(broadcaster.connections) == connections_before
 
-    def test_websocket_connection_closed_cleanly(self):
+    def test_websocket_connection_closed_cleanly(self, client):
         """Test that WebSocket connections close without errors"""
-        client = TestClient(app)
-
         with client.websocket_connect("/ws/events") as websocket:
             # Receive initial state
             websocket.receive_json()
@@ -164,10 +241,8 @@ class TestWebSocketServer:
 class TestWebSocketResilience:
     """Test WebSocket server resilience to errors"""
 
-    def test_health_check_shows_connection_count(self):
+    def test_health_check_shows_connection_count(self, client):
         """Test that health check tracks active connections"""
-        client = TestClient(app)
-
         # No connections
         response = client.get("/health")
         initial_count = response.json()['connections']
@@ -7,15 +7,26 @@ using the ActionLoader instead of hardcoded imports.
 
 import logging
 
+import pytest
+
 from statemachine_engine.core.action_loader import ActionLoader, get_action_loader
 
 
+@pytest.fixture(scope="module")
+def loader():
+    """One ActionLoader for the discovery and loading tests
+
+    Construction scans the actions tree; the tests below only read from
+    the loader, so they share one scan (and its class cache).
+    """
+    return ActionLoader()
+
+
 class TestActionLoader:
     """Tests for ActionLoader discovery and loading"""
 
-    def test_action_discovery(self):
+    def test_action_discovery(self, loader):
         """Test that ActionLoader can discover all actions"""
-        loader = ActionLoader()
         available_actions = loader.get_available_actions()
 
         # Should discover multiple actions
@@ -26,32 +37,48 @@ class TestActionLoader:
         for action in critical_actions:
             assert action in available_actions, f"Critical action '{action}' should be discoverable"
 
-    def test_load_bash_action(self):
+    def test_load_bash_action(self, loader):
         """Test loading bash action class"""
-        loader = ActionLoader()
         action_class = loader.load_action_class('bash')
 
         assert action_class is not None, "Bash action should be loadable"
         assert action_class.__name__ == 'BashAction', "Should load correct class"
 
-    def test_load_log_action(self):
+    def test_load_log_action(self, loader):
         """Test loading log action class"""
-        loader = ActionLoader()
         action_class = loader.load_action_class('log')
 
         assert action_class is not None, "Log action should be loadable"
         assert action_class.__name__ == 'LogAction', "Should load correct class"
 
-    def test_load_nonexistent_action(self):
+    def test_load_nonexistent_action(self, loader):
         """Test that loading nonexistent action returns None"""
-        loader = ActionLoader()
         action_class = loader.load_action_class('nonexistent_action_xyz')
 
         assert action_class is None, "Nonexistent action should return None"
 
-    def test_bash_action_instantiation(self):
+    def test_repeat_loads_do_not_reimport(self, monkeypatch, caplog):
+        """Test that a class is imported once and an unknown type warned once"""
+        import importlib
+
+        fresh = ActionLoader()
+        imports = []
+        real_import = importlib.import_module
+        monkeypatch.setattr(
+            importlib, "import_module", lambda name: imports.append(name) or real_import(name)
+        )
+
+        for _ in range(3):
+            assert fresh.load_action_class('bash') is fresh.load_action_class('bash')
+        assert len(imports) == 1
+
+        with caplog.at_level(logging.WARNING, logger="statemachine_engine.core.action_loader"):
+            for _ in range(3):
+                assert fresh.load_action_class('nonexistent_action_xyz') is None
+        assert len([r for r in caplog.records if "not discovered" in r.message]) == 1
+
+    def test_bash_action_instantiation(self, loader):
         """Test that loaded bash action can be instantiated"""
-        loader = ActionLoader()
         action_class = loader.load_action_class('bash')
 
         config = {'command': 'echo test', 'description': 'test command'}
@@ -60,9 +87,8 @@ class TestActionLoader:
         assert action_instance is not None, "Action should instantiate successfully"
         assert hasattr(action_instance, 'execute'), "Action should have execute method"
 
-    def test_log_action_instantiation(self):
+    def test_log_action_instantiation(self, loader):
         """Test that log action can be instantiated"""
-        loader = ActionLoader()
         action_class = loader.load_action_class('log')
 
         config = {'message': 'test message'}
@@ -71,10 +97,8 @@ class TestActionLoader:
         assert action_instance is not None, "Log action should instantiate"
         assert hasattr(action_instance, 'execute'), "Action should have execute method"
 
-    def test_critical_actions_loadable(self):
+    def test_critical_actions_loadable(self, loader):
         """Test that all critical actions can be loaded"""
-        loader = ActionLoader()
-
         critical_actions = [
             'bash',
             'log',
@@ -90,9 +114,8 @@ class TestActionLoader:
 class TestActionLoaderDomain:
     """Tests for domain-specific actions (may fail if domain actions not available)"""
 
-    def test_load_domain_actions_if_available(self):
+    def test_load_domain_actions_if_available(self, loader):
         """Test loading domain-specific actions if they exist"""
-        loader = ActionLoader()
         available_actions = loader.get_available_actions()
 
         domain_actions = ['generate_concepts', 'rank_concepts', 'generate_prompts', 'enhance_prompt']
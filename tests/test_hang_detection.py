@@ -7,6 +7,7 @@ to verify the watchdog detects and logs it.
 """
 
 import asyncio
+import faulthandler
 import sys
 import time
 from pathlib import Path
@@ -14,7 +15,20 @@ from pathlib import Path
 # Add project to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from statemachine_engine.monitoring.websocket_server import perf_monitor, watchdog
+from statemachine_engine.monitoring.websocket_server import (
+    WATCHDOG_CHECK_INTERVAL,
+    WATCHDOG_TIMEOUT,
+    perf_monitor,
+    watchdog,
+)
+
+# Long enough to trip the watchdog whatever the phase of its check loop,
+# which only notices a hang on the first check past the timeout
+HANG_SECONDS = WATCHDOG_TIMEOUT + 2 * WATCHDOG_CHECK_INTERVAL
+
+# Upper bound for the whole run (5s + hang + 5s): if the script is still
+# going after this, dump every thread's stack and exit rather than hang CI
+RUN_TIMEOUT = 60
 
 
 async def simulate_hang(duration_seconds: int):
@@ -37,7 +51,7 @@ async def simulate_hang(duration_seconds: int):
 async def main():
     """Test hang detection"""
     print("Starting hang detection test...")
-    print("Watchdog timeout: 15 seconds")
+    print(f"Watchdog timeout: {WATCHDOG_TIMEOUT} seconds")
     print(f"Watchdog thread: {'Running' if watchdog.is_alive() else 'NOT RUNNING'}")
 
     if not watchdog.is_alive():
@@ -56,10 +70,10 @@ async def main():
 
     # Test 2: Trigger hang (should trigger watchdog)
     print("\n" + "="*80)
-    print("TEST 2: Simulated hang (20s) - SHOULD trigger watchdog")
+    print(f"TEST 2: Simulated hang ({HANG_SECONDS}s) - SHOULD trigger watchdog")
     print("="*80)
-    print("Expected: Watchdog should dump stack traces after 15 seconds")
-    await simulate_hang(20)
+    print(f"Expected: Watchdog should dump stack traces after {WATCHDOG_TIMEOUT} seconds")
+    await simulate_hang(HANG_SECONDS)
     print("✅ TEST 2 COMPLETE: Check logs above for watchdog stack dump\n")
 
     # Test 3: Recovery (should not trigger again immediately)
@@ -76,16 +90,18 @@ async def main():
     print("TESTING COMPLETE")
     print("="*80)
     print("\nExpected results:")
-    print("  - TEST 1: No watchdog alerts (5s < 15s timeout)")
-    print("  - TEST 2: Watchdog stack dump during 20s hang")
+    print(f"  - TEST 1: No watchdog alerts (5s < {WATCHDOG_TIMEOUT}s timeout)")
+    print(f"  - TEST 2: Watchdog stack dump during {HANG_SECONDS}s hang")
     print("  - TEST 3: No watchdog alerts after recovery")
     print("\nCheck the output above for 🚨 SERVER HANG DETECTED message")
 
 if __name__ == "__main__":
+    faulthandler.dump_traceback_later(RUN_TIMEOUT, exit=True)
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
         print("\nTest interrupted by user")
     finally:
+        faulthandler.cancel_dump_traceback_later()
         watchdog.running = False
         print("Watchdog stopped")
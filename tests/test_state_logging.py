@@ -5,57 +5,54 @@ Verifies that state changes are properly logged to the database
 for UI support and monitoring.
 """
 
-from pathlib import Path
-
 import pytest
+import pytest_asyncio
 
 from statemachine_engine.core.engine import StateMachineEngine
 from statemachine_engine.database.models import get_job_model
 
 
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def sdxl_engine(sdxl_config):
+    """Engine loaded once for the tests that only read its initial state.
+
+    Those tests run on the module's event loop (loop_scope="module"), the
+    loop this fixture was set up on. Tests that process events build their
+    own engine.
+    """
+    engine = StateMachineEngine(machine_name='test_state_logging')
+    # Load a real config (parsed once per session)
+    await engine.load_config_dict(sdxl_config, 'sdxl_generator')
+    yield engine
+    engine._cleanup_sockets()
+
+
 class TestStateLogging:
     """Tests for state machine state logging to database"""
 
-    @pytest.mark.asyncio
-    async def test_state_machine_initialization(self):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_state_machine_initialization(self, sdxl_engine):
         """Test that state machine can be initialized with config"""
-        engine = StateMachineEngine(machine_name='test_state_logging')
-
-        # Load a real config file
-        config_path = Path('config/sdxl_generator.yaml')
-        if not config_path.exists():
-            pytest.skip("SDXL generator config not found")
-
-        await engine.load_config(str(config_path))
+        engine = sdxl_engine
 
         assert engine.current_state is not None, "Engine should have a current state"
         assert engine.machine_name == 'test_state_logging', "Machine name should be set"
 
-    @pytest.mark.asyncio
-    async def test_initial_state_set(self):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_initial_state_set(self, sdxl_engine):
         """Test that initial state is set correctly"""
-        engine = StateMachineEngine(machine_name='test_initial_state')
-
-        config_path = Path('config/sdxl_generator.yaml')
-        if not config_path.exists():
-            pytest.skip("SDXL generator config not found")
-
-        await engine.load_config(str(config_path))
+        engine = sdxl_engine
 
         # SDXL generator should start in 'initializing' state
         assert engine.current_state in ['initializing', 'waiting'], \
             f"Initial state should be valid, got: {engine.current_state}"
 
-    @pytest.mark.asyncio
-    async def test_event_processing(self):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_event_processing(self, sdxl_config):
         """Test that events can be processed"""
         engine = StateMachineEngine(machine_name='test_event_processing')
 
-        config_path = Path('config/sdxl_generator.yaml')
-        if not config_path.exists():
-            pytest.skip("SDXL generator config not found")
-
-        await engine.load_config(str(config_path))
+        await engine.load_config_dict(sdxl_config, 'sdxl_generator')
 
         # Add job model to context
         engine.context['job_model'] = get_job_model()
@@ -68,16 +65,12 @@ class TestStateLogging:
         # Event processing should return a boolean
         assert isinstance(success, bool), "process_event should return boolean"
 
-    @pytest.mark.asyncio
-    async def test_state_change_logging(self):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_state_change_logging(self, sdxl_config):
         """Test that state changes are logged to database"""
         engine = StateMachineEngine(machine_name='test_logging_db')
 
-        config_path = Path('config/sdxl_generator.yaml')
-        if not config_path.exists():
-            pytest.skip("SDXL generator config not found")
-
-        await engine.load_config(str(config_path))
+        await engine.load_config_dict(sdxl_config, 'sdxl_generator')
         engine.context['job_model'] = get_job_model()
 
         # Process some events
@@ -85,7 +78,7 @@ class TestStateLogging:
         await engine.process_event('no_jobs')
 
         # Check database for state change logs
-        job_model = get_job_model()
+        job_model = engine.context['job_model']
         with job_model.db._get_connection() as conn:
             rows = conn.execute("""
                 SELECT job_id, step_name, metadata, completed_at
@@ -100,17 +93,10 @@ class TestStateLogging:
         # Note: May be 0 if state didn't actually change
         assert isinstance(rows, list), "Should return list of rows"
 
-    @pytest.mark.asyncio
-    async def test_machine_state_persistence(self):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_machine_state_persistence(self, sdxl_engine):
         """Test that machine state is persisted in database"""
-        machine_name = 'test_state_persist'
-        engine = StateMachineEngine(machine_name=machine_name)
-
-        config_path = Path('config/sdxl_generator.yaml')
-        if not config_path.exists():
-            pytest.skip("SDXL generator config not found")
-
-        await engine.load_config(str(config_path))
+        engine = sdxl_engine
 
         # The state should be logged via _update_machine_state
         # We can verify the engine has the method
@@ -112,6 +112,16 @@ def test_interpolate_value_partial_nested_keeps_placeholder(nested_context):
     assert result == "Value: {event_data.payload.settings.nonexistent}"
 
 
+def test_interpolate_value_path_through_non_dict_keeps_placeholder(nested_context):
+    """Test that paths stepping into a string, list or None keep the placeholder"""
+    from statemachine_engine.utils.interpolation import interpolate_value
+
+    context = dict(nested_context, items=[1, 2], empty=None)
+
+    for template in ("{job_id.first}", "{items.0}", "{empty.key}", "A {event_data.event_name.x} B"):
+        assert interpolate_value(template, context) == template
+
+
 def test_interpolate_value_numeric_to_string(sample_context):
     """Test that numeric values in context are converted to strings when mixed with text"""
     from statemachine_engine.utils.interpolation import interpolate_value
@@ -227,37 +237,6 @@ def test_interpolate_value_special_characters(sample_context):
     assert result == 'cmd=echo "Hello World", path=/tmp/data with spaces/file.txt, regex=\\d+\\.\\d+, json={"key": "value"}'
 
 
-def test_interpolate_value_nested_type_preservation():
-    """Test that nested paths in single-placeholder templates preserve types"""
-    from statemachine_engine.utils.interpolation import interpolate_value
-
-    context = {
-        'event_data': {
-            'payload': {
-                'user': {
-                    'id': 123,
-                    'name': 'Alice'
-                },
-                'items': ['item1', 'item2'],
-                'count': 42
-            }
-        }
-    }
-
-    # Single nested placeholder preserves type
-    assert interpolate_value("{event_data.payload.user.id}", context) == 123
-    assert isinstance(interpolate_value("{event_data.payload.user.id}", context), int)
-
-    assert interpolate_value("{event_data.payload.items}", context) == ['item1', 'item2']
-    assert isinstance(interpolate_value("{event_data.payload.items}", context), list)
-
-    assert interpolate_value("{event_data.payload.count}", context) == 42
-
-    # Mixed text converts to string
-    assert interpolate_value("User {event_data.payload.user.id}", context) == "User 123"
-    assert isinstance(interpolate_value("User {event_data.payload.user.id}", context), str)
-
-
 def test_interpolate_value_unicode_characters():
     """Test that unicode characters in context values are preserved"""
     from statemachine_engine.utils.interpolation import interpolate_value
@@ -275,6 +254,40 @@ def test_interpolate_value_unicode_characters():
     assert result == "Emoji: 🎨✨, Chinese: 你好, Arabic: مرحبا, Special: Ñoño"
 
 
+def test_interpolate_value_literal_braces_untouched():
+    """Test that non-placeholder braces survive alongside real placeholders"""
+    from statemachine_engine.utils.interpolation import interpolate_value
+
+    context = {'file': 'data.csv', 'none_val': None}
+
+    assert interpolate_value("awk '{print $1}' {file}", context) == "awk '{print $1}' data.csv"
+    assert interpolate_value("echo ${HOME} {file}", context) == "echo ${HOME} data.csv"
+    assert interpolate_value('{"k": 1} {file}', context) == '{"k": 1} data.csv'
+    assert interpolate_value("{file} {none_val} {missing}", context) == "data.csv {none_val} {missing}"
+    assert interpolate_value("printf '%s' {file} {file} 100%", context) == "printf '%s' data.csv data.csv 100%"
+
+
+def test_interpolate_value_without_placeholders_returns_same_string(sample_context):
+    """Test that strings with no opening brace come back untouched"""
+    from statemachine_engine.utils.interpolation import interpolate_value
+
+    for template in ("info", "", "closing } only", "job_id"):
+        assert interpolate_value(template, sample_context) is template
+
+
+def test_interpolate_value_cached_template_renders_per_context(nested_context):
+    """Test that a template parsed once still renders against each new context"""
+    from statemachine_engine.utils.interpolation import interpolate_value
+
+    template = "{job_id}/{event_data.payload.job_id} {missing} ${HOME}"
+
+    first = interpolate_value(template, nested_context)
+    second = interpolate_value(template, {'job_id': 'other', 'missing': 1})
+
+    assert first == "nested_456/nested_job_789 {missing} ${HOME}"
+    assert second == "other/{event_data.payload.job_id} 1 ${HOME}"
+
+
 # ==============================================================================
 # Tests for interpolate_config() - Recursive structure interpolation
 # ==============================================================================
@@ -474,6 +487,43 @@ def test_interpolate_config_empty_structures():
     assert result['normal'] == 'test'
 
 
+def test_interpolate_config_nesting_deeper_than_recursion_limit():
+    """Test that nesting depth is not bounded by the recursion limit"""
+    import sys
+
+    from statemachine_engine.utils.interpolation import interpolate_config
+
+    depth = sys.getrecursionlimit() + 100
+    config = leaf = {}
+    for _ in range(depth):
+        leaf['next'] = [{}]
+        leaf = leaf['next'][0]
+    leaf['cmd'] = '{id}'
+
+    result = interpolate_config(config, {'id': 'deep'})
+
+    for _ in range(depth):
+        result = result['next'][0]
+    assert result == {'cmd': 'deep'}
+
+
+def test_interpolate_config_circular_reference_raises():
+    """Test that a config containing itself is rejected rather than walked forever"""
+    from statemachine_engine.utils.interpolation import interpolate_config
+
+    config = {'steps': []}
+    config['steps'].append(config)
+
+    with pytest.raises(ValueError, match="circular"):
+        interpolate_config(config, {})
+
+    # A subtree shared between two keys is not a cycle; each gets its own copy
+    shared = {'msg': '{id}'}
+    result = interpolate_config({'a': shared, 'b': shared}, {'id': 'x'})
+    assert result == {'a': {'msg': 'x'}, 'b': {'msg': 'x'}}
+    assert result['a'] is not result['b']
+
+
 def test_interpolate_config_with_nested_context(nested_context):
     """Test using nested context from event payload"""
     from statemachine_engine.utils.interpolation import interpolate_config
@@ -494,6 +544,22 @@ def test_interpolate_config_with_nested_context(nested_context):
     assert result['timestamp'] == '2025-11-10T10:00:00Z'
 
 
+def test_parse_template_interns_path_segments():
+    """Placeholder path segments are interned at parse time"""
+    import sys
+
+    from statemachine_engine.utils.interpolation import _parse_template
+
+    template = ''.join(['{event_data.', 'payload.job_id} ', '{status}'])  # not interned
+
+    parsed = _parse_template(template)
+
+    assert parsed.paths == (('event_data', 'payload', 'job_id'), ('status',))
+    for path in parsed.paths:
+        for segment in path:
+            assert segment is sys.intern(segment)
+
+
 def test_interpolate_config_immutable_original():
     """Test that original config is not modified"""
     from statemachine_engine.utils.interpolation import interpolate_config
@@ -520,6 +586,36 @@ def test_interpolate_config_immutable_original():
     assert original['nested']['value'] == '{id}'
 
 
+def test_interpolate_config_shares_literal_leaves():
+    """Containers are always new; strings without placeholders are reused"""
+    from statemachine_engine.utils.interpolation import interpolate_config
+
+    literal = ''.join(['echo ', 'done'])  # built at runtime, not interned
+    config = {'command': literal, 'args': [literal, '{id}'], 'timeout': 30}
+
+    result = interpolate_config(config, {'id': 'test'})
+
+    assert result == {'command': 'echo done', 'args': ['echo done', 'test'], 'timeout': 30}
+    assert result is not config
+    assert result['args'] is not config['args']
+    assert result['command'] is literal
+    assert result['args'][0] is literal
+
+
+def test_has_placeholders():
+    """Only {placeholder} strings in values count; keys and stray braces do not"""
+    from statemachine_engine.utils.interpolation import has_placeholders
+
+    assert has_placeholders({'a': [1, {'b': 'job {job_id}'}]})
+    assert has_placeholders('{event_data.payload.id}')
+    assert not has_placeholders({'{key}': 'literal', 'cmd': 'echo {} { x } {"a": 1}'})
+    assert not has_placeholders([1, None, 2.5, {'nested': ['plain']}])
+
+    looped = {'name': 'plain'}
+    looped['self'] = looped
+    assert not has_placeholders(looped)
+
+
 def test_interpolate_config_empty_context():
     """Test interpolation with empty context leaves placeholders"""
     from statemachine_engine.utils.interpolation import interpolate_config
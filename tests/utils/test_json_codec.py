@@ -0,0 +1,71 @@
+"""
+Tests for the compact JSON codec used for stored payloads.
+
+The orjson and stdlib paths must produce identical text for ordinary
+payloads so databases written with either backend read back the same way
+(float exponent formatting is the documented exception).
+"""
+import json
+
+import pytest
+
+from statemachine_engine.utils import json_codec
+
+PAYLOADS = [
+    {"job_id": "job_1", "from_state": "idle", "to_state": "busy"},
+    {"text": "päivää ✓", "nested": {"items": [1, 2.5, None, True]}},
+    {1: "int key"},
+    [],
+]
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def codec(request, monkeypatch):
+    """json_codec with each backend active"""
+    if request.param == "orjson":
+        if json_codec.orjson is None:
+            pytest.skip("orjson not installed")
+    else:
+        monkeypatch.setattr(json_codec, "orjson", None)
+    return json_codec
+
+
+@pytest.mark.parametrize("payload", PAYLOADS)
+def test_dumps_is_compact_utf8(codec, payload):
+    expected = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+    assert codec.dumps(payload) == expected
+
+
+@pytest.mark.parametrize("payload", PAYLOADS)
+def test_dumps_bytes_is_utf8_of_dumps(codec, payload):
+    assert codec.dumps_bytes(payload) == codec.dumps(payload).encode("utf-8")
+
+
+@pytest.mark.parametrize("payload", PAYLOADS[:2])
+def test_round_trip(codec, payload):
+    assert codec.loads(codec.dumps(payload)) == payload
+
+
+def test_invalid_json_raises_json_decode_error(codec):
+    with pytest.raises(json.JSONDecodeError):
+        codec.loads("{not json")
+
+
+def test_dumps_writes_non_finite_floats_as_null(codec):
+    payload = {"nan": float("nan"), "items": [float("inf"), (float("-inf"), 1.5)]}
+    assert codec.dumps(payload) == '{"nan":null,"items":[null,[null,1.5]]}'
+
+
+def test_stdlib_dumps_keeps_raising_on_circular_reference(monkeypatch):
+    monkeypatch.setattr(json_codec, "orjson", None)
+    looped = []
+    looped.append(looped)
+    with pytest.raises(ValueError, match="Circular reference"):
+        json_codec.dumps(looped)
+
+
+def test_dumps_encodes_integers_wider_than_64_bits(codec):
+    payload = {"big": 2**64, "small": -(2**63) - 1}
+    expected = '{"big":18446744073709551616,"small":-9223372036854775809}'
+    assert codec.dumps(payload) == expected
+    assert codec.dumps_bytes(payload) == expected.encode("utf-8")
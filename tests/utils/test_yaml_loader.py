@@ -0,0 +1,25 @@
+"""
+Tests for the shared safe YAML loader.
+"""
+import pytest
+import yaml
+
+from statemachine_engine.utils import yaml_loader
+
+
+def test_load_yaml_parses_config():
+    text = "initial_state: waiting\ntransitions:\n  - {from: waiting, to: done, event: go}\n"
+    assert yaml_loader.load_yaml(text) == {
+        'initial_state': 'waiting',
+        'transitions': [{'from': 'waiting', 'to': 'done', 'event': 'go'}],
+    }
+
+
+def test_load_yaml_uses_c_loader_when_available():
+    expected = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    assert yaml_loader.SafeLoader is expected
+
+
+def test_load_yaml_refuses_python_tags():
+    with pytest.raises(yaml.YAMLError):
+        yaml_loader.load_yaml("!!python/object/apply:os.getcwd []")